@@ -0,0 +1,3 @@
+"""
+Benchmarks - Startup, handler and load benchmarks run against fake data
+"""
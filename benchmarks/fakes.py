@@ -0,0 +1,65 @@
+"""
+Fake Data - Deterministic quote universe behind a provider with simulated upstream latency
+
+Run `python -m benchmarks.fakes --port 7861` to serve the full app on fake data,
+which is what the load test drives.
+"""
+
+import argparse
+import os
+import random
+import tempfile
+
+from stock_tracker.providers import DemoQuoteProvider
+from stock_tracker.quote_store import DEMO_QUOTES, Quote, QuoteStore
+
+UNIVERSE_SIZE = 5000
+UPSTREAM_LATENCY = 0.05
+HOT_SYMBOLS = tuple(quote.symbol for quote in DEMO_QUOTES)
+
+
+def fake_symbols(count=UNIVERSE_SIZE):
+    return [f"FK{index:04d}" for index in range(count)]
+
+
+def fake_store(count=UNIVERSE_SIZE, seed=0):
+    """The demo quotes plus count synthetic ones, identical on every run"""
+    rng = random.Random(seed)
+    quotes = list(DEMO_QUOTES)
+    for symbol in fake_symbols(count):
+        price = round(rng.uniform(5, 900), 2)
+        change_percent = round(rng.gauss(0, 2), 2)
+        quotes.append(Quote(symbol, f"{symbol} Holdings", price, round(price * change_percent / 100, 2),
+                            change_percent, rng.randrange(10_000, 90_000_000), rng.uniform(1e8, 3e12),
+                            rng.choice((rng.uniform(5, 90), float("nan"))), rng.choice(("BUY", "HOLD", "SELL"))))
+    return QuoteStore(quotes)
+
+
+def install_fake_data(latency=UPSTREAM_LATENCY, count=UNIVERSE_SIZE, history_dir=None):
+    """Point the process-wide quote cache and history store at fake data; call before first use"""
+    from stock_tracker.quote_cache import QuoteCache, set_quote_cache
+
+    os.environ["STOCK_HISTORY_DIR"] = history_dir or tempfile.mkdtemp(prefix="stock-bench-")
+    os.environ.setdefault("STOCK_PORTFOLIO_DB", os.path.join(os.environ["STOCK_HISTORY_DIR"], "portfolio.db"))
+    provider = DemoQuoteProvider(store=fake_store(count), latency=latency)
+    set_quote_cache(QuoteCache(provider))
+    return provider
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the app on fake data for load testing")
+    parser.add_argument("--port", type=int, default=7861)
+    parser.add_argument("--latency", type=float, default=UPSTREAM_LATENCY, help="Simulated upstream seconds")
+    args = parser.parse_args(argv)
+
+    install_fake_data(args.latency)
+
+    import app
+    from stock_tracker.server import serve
+
+    serve(app.create_interface(), port=args.port, warm_steps=[("status", app.status_broadcaster.refresh)],
+          css=app.custom_css, theme=app.create_theme())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Startup Benchmark - Import time, interface build time and time to first response of fresh processes
+
+Usage: python benchmarks/startup.py [--runs 3] [--json results.json]
+
+Every measurement runs in a new interpreter so nothing is already imported
+or cached; the median of --runs runs is reported.
+"""
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STARTUP_TIMEOUT = 120.0
+
+IMPORT_TARGETS = ("gradio", "app", "stock_tracker.api", "stock_tracker.mcp_server")
+
+TIMED_SNIPPET = """
+import time
+started = time.perf_counter()
+{setup}
+print(time.perf_counter() - started)
+"""
+
+
+def _env(**overrides):
+    env = dict(os.environ, PYTHONPATH=ROOT, PYTHONDONTWRITEBYTECODE="1", **overrides)
+    env.pop("PYTHONSTARTUP", None)
+    return env
+
+
+def time_snippet(setup, runs):
+    """Median seconds the setup code takes in a fresh interpreter"""
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, "-c", TIMED_SNIPPET.format(setup=setup)], cwd=ROOT, env=_env(),
+                                capture_output=True, text=True, check=True).stdout
+        samples.append(float(output.strip().splitlines()[-1]))
+    return statistics.median(samples)
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _get(url, data=None, timeout=5.0):
+    request = urllib.request.Request(url, data=None if data is None else json.dumps(data).encode(),
+                                     headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return response.read()
+
+
+def _wait_until_up(url, process, started):
+    while time.perf_counter() - started < STARTUP_TIMEOUT:
+        if process.poll() is not None:
+            raise RuntimeError(f"Server exited with status {process.returncode}")
+        try:
+            _get(url, timeout=1.0)
+            return time.perf_counter() - started
+        except (urllib.error.URLError, ConnectionError, OSError):
+            time.sleep(0.02)
+    raise TimeoutError(f"No response from {url} within {STARTUP_TIMEOUT}s")
+
+
+def _gradio_call(base_url, api_name, args):
+    """Run a Gradio event through its REST API and wait for the result"""
+    event = json.loads(_get(f"{base_url}/gradio_api/call/{api_name}", {"data": args}, timeout=30.0))
+    return _get(f"{base_url}/gradio_api/call/{api_name}/{event['event_id']}", timeout=30.0)
+
+
+def measure_server(command, port_env, ready_path, first_request, runs):
+    """Median (time to first response, first request latency, repeat request latency) of a fresh server"""
+    results = []
+    for _ in range(runs):
+        port = _free_port()
+        with tempfile.TemporaryDirectory() as data_dir:
+            env = _env(STOCK_HISTORY_DIR=os.path.join(data_dir, "history"),
+                       STOCK_PORTFOLIO_DB=os.path.join(data_dir, "portfolio.db"),
+                       **{key: value.format(port=port) for key, value in port_env.items()})
+            started = time.perf_counter()
+            process = subprocess.Popen([sys.executable, *[arg.format(port=port) for arg in command]], cwd=ROOT,
+                                       env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            try:
+                base_url = f"http://127.0.0.1:{port}"
+                first_response = _wait_until_up(base_url + ready_path, process, started)
+                request_started = time.perf_counter()
+                first_request(base_url)
+                first_latency = time.perf_counter() - request_started
+                request_started = time.perf_counter()
+                first_request(base_url)
+                results.append((first_response, first_latency, time.perf_counter() - request_started))
+            finally:
+                process.terminate()
+                process.wait(timeout=30)
+    return tuple(statistics.median(column) for column in zip(*results))
+
+
+def run(runs):
+    results = {}
+    for target in IMPORT_TARGETS:
+        results[f"import {target}"] = time_snippet(f"import {target}", runs)
+    results["create_interface()"] = time_snippet(
+        "import app\nstarted = time.perf_counter()\napp.create_interface()", runs)
+
+    ui = measure_server(["app.py"], {"GRADIO_SERVER_PORT": "{port}"}, "/",
+                        lambda base_url: _gradio_call(base_url, "fetch_stock", ["AAPL"]), runs)
+    results["ui: first response"], results["ui: first search"], results["ui: second search"] = ui
+
+    end = int(time.time())
+    api = measure_server(["modal_app.py", "--local", "--port", "{port}"], {}, "/health",
+                         lambda base_url: _get(f"{base_url}/history/AAPL?start={end - 365 * 86400}&end={end}"), runs)
+    results["api: first response"], results["api: first history"], results["api: second history"] = api
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--json", help="Also write the results (seconds) to this file")
+    args = parser.parse_args(argv)
+
+    results = run(args.runs)
+    width = max(map(len, results))
+    for name, seconds in results.items():
+        print(f"{name:<{width}}  {seconds * 1000:9.1f} ms")
+    if args.json:
+        with open(args.json, "w") as handle:
+            json.dump(results, handle, indent=2)
+
+
+if __name__ == "__main__":
+    main()
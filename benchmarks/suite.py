@@ -0,0 +1,310 @@
+"""
+Benchmark Suite - Handler microbenchmarks and an HTTP/queue load test, checked against a stored baseline
+
+Usage:
+    python -m benchmarks.suite                      # run both, compare with benchmarks/baseline.json
+    python -m benchmarks.suite --micro-only         # in-process handlers only
+    python -m benchmarks.suite --save-baseline      # record the current numbers as the baseline
+
+Exits with status 1 when any metric regresses past the tolerance. Baselines
+are machine specific: record one on the machine that runs the comparison.
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import os
+import platform
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BASELINE = os.path.join(ROOT, "benchmarks", "baseline.json")
+
+WARMUP_CALLS = 50
+MICRO_ITERATIONS = 2000
+# Best of several rounds, as timeit does: slower rounds measure the machine, not the code
+MICRO_ROUNDS = 5
+ALLOC_ITERATIONS = 200
+LOAD_CONCURRENCY = 32
+LOAD_DURATION = 10.0
+SERVER_TIMEOUT = 120.0
+
+# Relative slowdown allowed before a metric counts as a regression; p99 is noisier
+TOLERANCE = 0.5
+P99_TOLERANCE_FACTOR = 2
+# Absolute slack so sub-microsecond jitter on tiny numbers is not a regression
+ABSOLUTE_SLACK = {"p50_ms": 0.02, "p99_ms": 0.2, "alloc_kib": 1.0, "throughput": 0.0}
+
+
+def summarize(samples_ns, elapsed):
+    """calls, throughput (calls/s) and p50/p99 latency (ms) of per-call samples"""
+    ordered = sorted(samples_ns)
+
+    def percentile(fraction):
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] / 1e6
+
+    return {
+        "calls": len(ordered),
+        "throughput": round(len(ordered) / elapsed, 1),
+        "p50_ms": round(percentile(0.50), 4),
+        "p99_ms": round(percentile(0.99), 4),
+    }
+
+
+def measure(call, iterations=MICRO_ITERATIONS, alloc_iterations=ALLOC_ITERATIONS, rounds=MICRO_ROUNDS):
+    """Latency and throughput of call() in a tight loop (best round), then peak traced allocation per call"""
+    for _ in range(WARMUP_CALLS):
+        call()
+    result = None
+    for _ in range(rounds):
+        gc.collect()
+        samples = []
+        started = time.perf_counter()
+        for _ in range(max(1, iterations // rounds)):
+            call_started = time.perf_counter_ns()
+            call()
+            samples.append(time.perf_counter_ns() - call_started)
+        round_result = summarize(samples, time.perf_counter() - started)
+        if result is None or round_result["p50_ms"] < result["p50_ms"]:
+            result = round_result
+    result["calls"] = iterations
+
+    # Traced separately: tracemalloc slows every allocation down
+    tracemalloc.start()
+    peaks = []
+    try:
+        for _ in range(alloc_iterations):
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            call()
+            peaks.append(tracemalloc.get_traced_memory()[1] - before)
+    finally:
+        tracemalloc.stop()
+    result["alloc_kib"] = round(statistics.mean(peaks) / 1024, 2)
+    return result
+
+
+def run_micro(iterations=MICRO_ITERATIONS):
+    """Call the search and status handlers directly, in-process, on fake data"""
+    from benchmarks.fakes import install_fake_data
+
+    # No simulated latency: these measure handler cost, not the upstream
+    install_fake_data(latency=0.0)
+    import app
+
+    loop = asyncio.new_event_loop()
+    try:
+        benchmarks = {
+            "search_stock": lambda: app.search_stock("AAPL"),
+            "search_stock_enhanced": lambda: loop.run_until_complete(app.search_stock_enhanced("AAPL")),
+            "update_status_indicators": app.update_status_indicators,
+            "get_market_status": app.get_market_status,
+        }
+        return {name: measure(call, iterations) for name, call in benchmarks.items()}
+    finally:
+        loop.close()
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def _gradio_call(session, base_url, api_name, args):
+    """Submit an event through Gradio's queue API and wait for it to complete; True on success"""
+    async with session.post(f"{base_url}/gradio_api/call/{api_name}", json={"data": args}) as response:
+        response.raise_for_status()
+        event_id = (await response.json())["event_id"]
+    async with session.get(f"{base_url}/gradio_api/call/{api_name}/{event_id}") as response:
+        body = await response.text()
+    return "event: complete" in body
+
+
+def load_scenarios():
+    """(name, weight, api_name, args factory); cached searches dominate, as in real traffic"""
+    from benchmarks.fakes import HOT_SYMBOLS, fake_symbols
+
+    cold = fake_symbols()
+    return [
+        ("search (cached)", 6, "search_stock_enhanced", lambda rng: [rng.choice(HOT_SYMBOLS)]),
+        ("search (upstream)", 2, "fetch_stock", lambda rng: [rng.choice(cold)]),
+        ("status", 2, "push_status_indicators", lambda rng: []),
+    ]
+
+
+async def _drive(base_url, concurrency, duration, seed):
+    import aiohttp
+
+    scenarios = load_scenarios()
+    weights = [weight for _, weight, _, _ in scenarios]
+    samples = {name: [] for name, _, _, _ in scenarios}
+    errors = {name: 0 for name, _, _, _ in scenarios}
+    deadline = time.perf_counter() + duration
+
+    async def worker(index, session):
+        rng = random.Random(seed + index)
+        while time.perf_counter() < deadline:
+            name, _, api_name, make_args = rng.choices(scenarios, weights)[0]
+            started = time.perf_counter_ns()
+            try:
+                ok = await _gradio_call(session, base_url, api_name, make_args(rng))
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                ok = False
+            if ok:
+                samples[name].append(time.perf_counter_ns() - started)
+            else:
+                errors[name] += 1
+
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    timeout = aiohttp.ClientTimeout(total=60)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(index, session) for index in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    results = {}
+    for name, scenario_samples in samples.items():
+        if scenario_samples:
+            results[name] = {**summarize(scenario_samples, elapsed), "errors": errors[name]}
+    everything = [sample for scenario_samples in samples.values() for sample in scenario_samples]
+    if everything:
+        results["all"] = {**summarize(everything, elapsed), "errors": sum(errors.values())}
+    return results
+
+
+def _wait_until_up(url, process):
+    import urllib.error
+    import urllib.request
+
+    deadline = time.perf_counter() + SERVER_TIMEOUT
+    while time.perf_counter() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Benchmark server exited with status {process.returncode}")
+        try:
+            urllib.request.urlopen(url, timeout=1.0).read()
+            return
+        except (urllib.error.URLError, ConnectionError, OSError):
+            time.sleep(0.1)
+    raise TimeoutError(f"Benchmark server did not answer {url} within {SERVER_TIMEOUT}s")
+
+
+def run_load(concurrency=LOAD_CONCURRENCY, duration=LOAD_DURATION, seed=0):
+    """Drive the full HTTP -> Gradio queue -> handler path of a fake-data server with concurrent clients"""
+    port = _free_port()
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    process = subprocess.Popen([sys.executable, "-m", "benchmarks.fakes", "--port", str(port)], cwd=ROOT, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        base_url = f"http://127.0.0.1:{port}"
+        _wait_until_up(base_url + "/metrics", process)
+        # Let the background warm-up finish so it does not count against the first requests
+        time.sleep(2.0)
+        return asyncio.run(_drive(base_url, concurrency, duration, seed))
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+def compare(results, baseline, tolerance=TOLERANCE):
+    """Regression messages for every metric worse than baseline by more than the tolerance"""
+    checks = (
+        ("p50_ms", 1, tolerance),
+        ("p99_ms", 1, tolerance * P99_TOLERANCE_FACTOR),
+        ("alloc_kib", 1, tolerance),
+        ("throughput", -1, tolerance),
+    )
+    regressions = []
+    for section in ("micro", "load"):
+        for name, metrics in results.get(section, {}).items():
+            previous = baseline.get(section, {}).get(name)
+            if previous is None:
+                continue
+            for metric, direction, allowed in checks:
+                if metric not in metrics or metric not in previous:
+                    continue
+                new, old = metrics[metric], previous[metric]
+                if direction > 0:
+                    worse = new > old * (1 + allowed) + ABSOLUTE_SLACK[metric]
+                else:
+                    worse = new < old / (1 + allowed)
+                if worse:
+                    regressions.append(f"{section}/{name}: {metric} {old} -> {new}")
+    return regressions
+
+
+def format_results(results, baseline=None):
+    lines = []
+    header = f"{'benchmark':<36} {'calls':>7} {'calls/s':>10} {'p50 ms':>9} {'p99 ms':>9} {'KiB/call':>9} {'p50 vs base':>12}"
+    for section in ("micro", "load"):
+        if section not in results:
+            continue
+        lines += ["", header, "-" * len(header)]
+        for name, metrics in results[section].items():
+            previous = (baseline or {}).get(section, {}).get(name)
+            delta = ""
+            if previous and previous.get("p50_ms"):
+                delta = f"{(metrics['p50_ms'] / previous['p50_ms'] - 1) * 100:+.0f}%"
+            alloc = f"{metrics['alloc_kib']:.1f}" if "alloc_kib" in metrics else "-"
+            lines.append(f"{section + '/' + name:<36} {metrics['calls']:>7} {metrics['throughput']:>10.1f} "
+                         f"{metrics['p50_ms']:>9.3f} {metrics['p99_ms']:>9.3f} {alloc:>9} {delta:>12}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Handler microbenchmarks and HTTP/queue load test")
+    parser.add_argument("--micro-only", action="store_true")
+    parser.add_argument("--load-only", action="store_true")
+    parser.add_argument("--iterations", type=int, default=MICRO_ITERATIONS)
+    parser.add_argument("--concurrency", type=int, default=LOAD_CONCURRENCY)
+    parser.add_argument("--duration", type=float, default=LOAD_DURATION)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="Write these results to --baseline")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    parser.add_argument("--json", help="Also write the results to this file")
+    args = parser.parse_args(argv)
+
+    results = {"meta": {"python": platform.python_version(), "machine": platform.machine(),
+                        "cpus": os.cpu_count(), "concurrency": args.concurrency, "duration": args.duration}}
+    if not args.load_only:
+        results["micro"] = run_micro(args.iterations)
+    if not args.micro_only:
+        results["load"] = run_load(args.concurrency, args.duration)
+
+    baseline = None
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline) as handle:
+            baseline = json.load(handle)
+    print(format_results(results, baseline))
+
+    if args.json:
+        with open(args.json, "w") as handle:
+            json.dump(results, handle, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, "w") as handle:
+            json.dump(results, handle, indent=2)
+            handle.write("\n")
+        print(f"\nBaseline written to {args.baseline}")
+        return 0
+    if baseline is None:
+        print(f"\nNo baseline at {args.baseline}; run with --save-baseline to record one")
+        return 0
+
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print("\nRegressions against baseline:")
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1
+    print("\nNo regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,157 @@
+"""
+Modal App - Data API and MCP backend on Modal with warm, concurrent replicas sharing one cache
+
+Deploy with `modal deploy modal_app.py`, develop against Modal with
+`modal serve modal_app.py`, or run the same app locally (no Modal account)
+with `python modal_app.py --local`, which swaps the shared Dict and Volume
+for an in-process dict and a local directory.
+"""
+
+import argparse
+import os
+import threading
+
+import modal
+
+APP_NAME = "mcp-stock-tracker"
+HISTORY_MOUNT = "/cache/history"
+
+# Warm capacity: idle replicas kept up so requests never wait on a cold start
+MIN_CONTAINERS = 1
+BUFFER_CONTAINERS = 1
+SCALEDOWN_WINDOW = 300
+# Handlers are async or hand blocking work to threads, so one replica serves many inputs at once
+MAX_INPUTS = 100
+TARGET_INPUTS = 64
+VOLUME_SYNC_INTERVAL = 30.0
+# Shared Dict reads in flight at once for a batch of symbols (the Dict has no multi-key get)
+SHARED_READ_CONCURRENCY = 32
+
+app = modal.App(APP_NAME)
+
+quote_dict = modal.Dict.from_name("stock-tracker-quotes", create_if_missing=True)
+history_volume = modal.Volume.from_name("stock-tracker-history", create_if_missing=True)
+
+image = (
+    modal.Image.debian_slim(python_version="3.11")
+    .pip_install_from_requirements("requirements.txt")
+    .env({"STOCK_DATA_PROVIDER": "yfinance", "STOCK_HISTORY_DIR": HISTORY_MOUNT,
+          "STOCK_LISTINGS_FILE": "/root/data/listings.csv"})
+    .add_local_file("data/listings.csv", "/root/data/listings.csv")
+    .add_local_python_source("stock_tracker")
+)
+
+
+def install_shared_cache(store, read_concurrency=1):
+    """Replace the process-wide quote cache with one reading through store before going upstream"""
+    from stock_tracker.providers import create_provider
+    from stock_tracker.quote_cache import QuoteCache, set_quote_cache
+    from stock_tracker.shared_cache import SharedCacheProvider
+
+    cache = QuoteCache(SharedCacheProvider(create_provider(), store, read_concurrency=read_concurrency))
+    set_quote_cache(cache)
+    return cache
+
+
+class VolumeSync:
+    """Commits newly written history bars to the shared volume and picks up other replicas' writes"""
+
+    def __init__(self, volume, store, interval=VOLUME_SYNC_INTERVAL):
+        self.volume = volume
+        self.store = store
+        self.interval = interval
+        self._committed = store.fetches
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="volume-sync", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval)
+        self.sync()
+
+    def sync(self):
+        fetches = self.store.fetches
+        if fetches != self._committed:
+            self.volume.commit()
+            self._committed = fetches
+        # Reloading fails while history files are memory-mapped, so drop the store's maps first;
+        # a request still holding a slice makes it fail until the next sync
+        self.store.release()
+        self.volume.reload()
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            try:
+                self.sync()
+            except Exception:
+                pass
+
+
+@app.cls(
+    image=image,
+    volumes={HISTORY_MOUNT: history_volume},
+    min_containers=MIN_CONTAINERS,
+    buffer_containers=BUFFER_CONTAINERS,
+    scaledown_window=SCALEDOWN_WINDOW,
+    enable_memory_snapshot=True,
+)
+@modal.concurrent(max_inputs=MAX_INPUTS, target_inputs=TARGET_INPUTS)
+class Backend:
+    @modal.enter(snap=True)
+    def preload(self):
+        """Imports and immutable indexes, captured in the memory snapshot new replicas restore from"""
+        from stock_tracker import api, mcp_server, screener  # noqa: F401
+        from stock_tracker.market_calendar import get_calendar
+        from stock_tracker.symbol_index import get_symbol_index
+
+        get_calendar()
+        get_symbol_index()
+
+    @modal.enter(snap=False)
+    def connect(self):
+        from stock_tracker.history_store import get_history_store
+        from stock_tracker.warmup import start_warmup
+
+        install_shared_cache(quote_dict, read_concurrency=SHARED_READ_CONCURRENCY)
+        self.volume_sync = VolumeSync(history_volume, get_history_store())
+        self.volume_sync.start()
+        start_warmup()
+
+    @modal.exit()
+    def flush(self):
+        try:
+            self.volume_sync.stop()
+        except Exception:
+            pass
+
+    @modal.asgi_app()
+    def web(self):
+        from stock_tracker.api import create_api
+
+        return create_api()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the Modal backend locally with in-process stand-ins")
+    parser.add_argument("--local", action="store_true", required=True)
+    parser.add_argument("--host", default=os.environ.get("STOCK_API_HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(os.environ.get("STOCK_API_PORT", 8000)))
+    args = parser.parse_args(argv)
+
+    import uvicorn
+
+    from stock_tracker.api import create_api
+
+    # A plain dict is the shared store and STOCK_HISTORY_DIR (or data/history) the volume
+    install_shared_cache({})
+    uvicorn.run(create_api(), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,3 @@
+"""
+MCP Stock Tracking App - Data and analytics layer behind the Gradio frontend
+"""
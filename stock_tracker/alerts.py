@@ -0,0 +1,321 @@
+"""
+Alert Engine - Per-symbol threshold heaps matched against incoming ticks
+"""
+
+import heapq
+import itertools
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+
+# kind -> (tick field, direction); "above" fires at or over the threshold, "below" at or under it
+ALERT_KINDS = {
+    "price_above": ("price", "above"),
+    "price_below": ("price", "below"),
+    "percent_up": ("change_percent", "above"),
+    "percent_down": ("change_percent", "below"),
+    "volume_spike": ("volume", "above"),
+}
+
+ALERT_LABELS = {
+    "price_above": "Price above",
+    "price_below": "Price below",
+    "percent_up": "Up % today",
+    "percent_down": "Down % today",
+    "volume_spike": "Volume spike",
+}
+
+# Completed sessions averaged for a symbol's normal daily volume
+VOLUME_BASELINE_DAYS = 20
+
+
+@dataclass(frozen=True, slots=True)
+class Alert:
+    """One-shot threshold alert owned by one session
+
+    percent_down thresholds are stored as the (negative) move and volume_spike
+    thresholds as a multiple of normal volume; level is the tick value that
+    fires the alert.
+    """
+    id: int
+    symbol: str
+    kind: str
+    threshold: float
+    level: float
+    owner: object = None
+
+
+@dataclass(frozen=True, slots=True)
+class AlertEvent:
+    """A fired alert and the tick value that crossed its threshold"""
+    alert: Alert
+    value: float
+    fired_at: float
+
+
+class Notifier:
+    """Delivery channel for fired alerts"""
+
+    def notify(self, event):
+        raise NotImplementedError
+
+    def forget(self, owner):
+        """Drop anything kept for an owner whose session ended"""
+
+
+class QueueNotifier(Notifier):
+    """Buffers events on a local queue for pollers (and tests) to drain"""
+
+    def __init__(self, maxsize=0):
+        self.queue = queue.Queue(maxsize)
+
+    def notify(self, event):
+        self.queue.put_nowait(event)
+
+    def drain(self):
+        events = []
+        while True:
+            try:
+                events.append(self.queue.get_nowait())
+            except queue.Empty:
+                return events
+
+
+class _Inbox:
+    __slots__ = ("seq", "events")
+
+    def __init__(self, maxlen):
+        self.seq = 0
+        self.events = deque(maxlen=maxlen)
+
+
+class InboxNotifier(Notifier):
+    """Keeps each owner's latest fired events, numbered so pollers can tell when they changed"""
+
+    def __init__(self, maxlen=20):
+        self.maxlen = maxlen
+        self._inboxes = {}
+        self._lock = threading.Lock()
+
+    def notify(self, event):
+        with self._lock:
+            inbox = self._inboxes.get(event.alert.owner)
+            if inbox is None:
+                inbox = self._inboxes[event.alert.owner] = _Inbox(self.maxlen)
+            inbox.events.appendleft(event)
+            inbox.seq += 1
+
+    def recent(self, owner):
+        """(seq, events newest first) for an owner; seq grows with every event delivered"""
+        with self._lock:
+            inbox = self._inboxes.get(owner)
+            return (0, []) if inbox is None else (inbox.seq, list(inbox.events))
+
+    def forget(self, owner):
+        with self._lock:
+            self._inboxes.pop(owner, None)
+
+
+class LogNotifier(Notifier):
+    """Writes events to a logger"""
+
+    def __init__(self, logger=None):
+        self.logger = logger or logging.getLogger("stock_tracker.alerts")
+
+    def notify(self, event):
+        alert = event.alert
+        self.logger.info("Alert %d fired: %s %s %s (value %s)", alert.id, alert.symbol, alert.kind,
+                         alert.threshold, event.value)
+
+
+class _ThresholdIndex:
+    """Heap of (threshold, alert id) with the next threshold to be crossed on top
+
+    Cancelled alerts stay in the heap until they surface or make up half of
+    it, so inserts, cancels and each fired alert cost O(log n) amortized.
+    """
+
+    __slots__ = ("sign", "heap", "cancelled")
+
+    def __init__(self, direction):
+        # "below" thresholds are negated so the highest one surfaces first
+        self.sign = 1.0 if direction == "above" else -1.0
+        self.heap = []
+        self.cancelled = set()
+
+    def insert(self, threshold, alert_id):
+        heapq.heappush(self.heap, (self.sign * threshold, alert_id))
+
+    def remove(self, alert_id):
+        self.cancelled.add(alert_id)
+        if 2 * len(self.cancelled) > len(self.heap):
+            self.heap = [item for item in self.heap if item[1] not in self.cancelled]
+            heapq.heapify(self.heap)
+            self.cancelled.clear()
+
+    def pop_crossed(self, value):
+        """Remove and return the ids of every threshold crossed by value"""
+        key = self.sign * value
+        heap = self.heap
+        fired = []
+        while heap and heap[0][0] <= key:
+            _, alert_id = heapq.heappop(heap)
+            if alert_id in self.cancelled:
+                self.cancelled.discard(alert_id)
+            else:
+                fired.append(alert_id)
+        return fired
+
+    def __len__(self):
+        return len(self.heap) - len(self.cancelled)
+
+
+class AlertEngine:
+    """Registered alerts indexed by symbol and (field, direction)
+
+    Each tick peeks at the top of every heap of its symbol, so matching costs
+    O(1) plus O(log n) per fired alert however many alerts are registered.
+    Alerts are one-shot: they leave the index when they fire. Volume spikes
+    are resolved to a share count when added, from the symbol's average daily
+    volume in the history store.
+    """
+
+    def __init__(self, notifier=None, clock=time.time, history_store=None):
+        self.notifier = notifier or QueueNotifier()
+        self.clock = clock
+        self.history_store = history_store
+        self._alerts = {}
+        self._indexes = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self.ticks = 0
+        self.fired = 0
+
+    def add(self, symbol, kind, threshold, owner=None):
+        """Register an alert for an owner (e.g. a session)
+
+        percent_down takes the size of the drop (e.g. 5 for -5%) and
+        volume_spike a multiple of average daily volume (e.g. 2 for twice it).
+        """
+        if kind not in ALERT_KINDS:
+            raise ValueError(f"Unknown alert kind '{kind}' (expected one of: {', '.join(ALERT_KINDS)})")
+        threshold = float(threshold)
+        level = threshold
+        if kind == "percent_down":
+            threshold = level = -abs(threshold)
+        elif kind == "volume_spike":
+            if threshold <= 0:
+                raise ValueError("Volume spike multiple must be positive")
+            average = self.average_volume(symbol)
+            if not average:
+                raise ValueError(f"No volume history for {symbol}")
+            level = threshold * average
+        with self._lock:
+            alert = Alert(next(self._ids), symbol, kind, threshold, level, owner)
+            self._alerts[alert.id] = alert
+            self._index(symbol, ALERT_KINDS[kind]).insert(level, alert.id)
+        return alert
+
+    def remove(self, alert_id, owner=None):
+        """Cancel an owner's alert; returns False if it already fired or is not theirs"""
+        with self._lock:
+            alert = self._alerts.get(alert_id)
+            if alert is None or alert.owner != owner:
+                return False
+            self._cancel(alert)
+        return True
+
+    def remove_owner(self, owner):
+        """Cancel every alert of an owner whose session ended; returns how many"""
+        with self._lock:
+            alerts = [alert for alert in self._alerts.values() if alert.owner == owner]
+            for alert in alerts:
+                self._cancel(alert)
+        self.notifier.forget(owner)
+        return len(alerts)
+
+    def alerts(self, symbol=None, owner=None):
+        """An owner's active alerts, optionally for one symbol, in registration order"""
+        with self._lock:
+            return [alert for alert in self._alerts.values()
+                    if alert.owner == owner and (symbol is None or alert.symbol == symbol)]
+
+    def average_volume(self, symbol):
+        """Mean daily volume over the last VOLUME_BASELINE_DAYS completed sessions, or None"""
+        store = self._store()
+        end = store.clock()
+        # Calendar days enough to span the sessions, weekends and holidays included
+        bars = store.history(symbol, "1d", end - 2 * VOLUME_BASELINE_DAYS * 86400, end)
+        volumes = bars["volume"][-VOLUME_BASELINE_DAYS:]
+        return float(volumes.mean()) if len(volumes) else None
+
+    def symbols(self):
+        with self._lock:
+            return [symbol for symbol, indexes in self._indexes.items()
+                    if any(len(index) for index in indexes.values())]
+
+    def on_tick(self, tick):
+        """Match a tick (or quote) against its symbol's thresholds and notify what fired"""
+        indexes = self._indexes.get(tick.symbol)
+        if not indexes:
+            return []
+        events = []
+        now = self.clock()
+        with self._lock:
+            self.ticks += 1
+            for (field, _), index in indexes.items():
+                if not len(index):
+                    continue
+                value = getattr(tick, field)
+                for alert_id in index.pop_crossed(value):
+                    events.append(AlertEvent(self._alerts.pop(alert_id), value, now))
+            self.fired += len(events)
+        for event in events:
+            self.notifier.notify(event)
+        return events
+
+    def on_ticks(self, ticks):
+        events = []
+        for tick in ticks:
+            if tick is not None:
+                events.extend(self.on_tick(tick))
+        return events
+
+    def stats(self):
+        return {"active": len(self._alerts), "symbols": len(self._indexes), "ticks": self.ticks,
+                "fired": self.fired}
+
+    def _index(self, symbol, key):
+        indexes = self._indexes.setdefault(symbol, {})
+        index = indexes.get(key)
+        if index is None:
+            index = indexes[key] = _ThresholdIndex(key[1])
+        return index
+
+    def _cancel(self, alert):
+        del self._alerts[alert.id]
+        self._indexes[alert.symbol][ALERT_KINDS[alert.kind]].remove(alert.id)
+
+    def _store(self):
+        if self.history_store is None:
+            from stock_tracker.history_store import get_history_store
+
+            self.history_store = get_history_store()
+        return self.history_store
+
+
+_alert_engine = None
+_alert_engine_lock = threading.Lock()
+
+
+def get_alert_engine():
+    """Process-wide alert engine delivering to per-session inboxes"""
+    global _alert_engine
+    if _alert_engine is None:
+        with _alert_engine_lock:
+            if _alert_engine is None:
+                _alert_engine = AlertEngine(InboxNotifier())
+    return _alert_engine
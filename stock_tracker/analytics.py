@@ -0,0 +1,71 @@
+"""
+Analytics Engine - Vectorized volatility / trend / risk / growth classification
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+# Labels indexed by the codes computed in classify_codes
+VOLATILITY_LEVELS = ("Low", "Moderate", "High")
+VOLATILITY_EMOJI = ("😌", "📊", "⚡")
+TRENDS = ("Bearish", "Bullish")
+TREND_EMOJI = ("🐻", "🐂")
+RISK_LEVELS = ("Low", "Moderate", "High")
+GROWTH_POTENTIAL = ("Moderate", "High")
+
+
+@dataclass(frozen=True, slots=True)
+class Classification:
+    """Classification of a single quote, as shown by the search handlers"""
+    volatility: str
+    vol_emoji: str
+    trend: str
+    trend_emoji: str
+    risk_level: str
+    growth_potential: str
+
+
+def classify_codes(change, change_percent, pe_ratio):
+    """Category codes for scalars or arrays; NaN P/E counts as high risk"""
+    abs_change_percent = np.abs(change_percent)
+    volatility = (abs_change_percent > 1).astype(np.int8) + (abs_change_percent > 3)
+    trend = (np.asarray(change) > 0).astype(np.int8)
+    risk = 2 - (np.asarray(pe_ratio) < 40).astype(np.int8) - (np.asarray(pe_ratio) < 25)
+    growth = (np.asarray(change_percent) > 1).astype(np.int8)
+    return volatility, trend, risk, growth
+
+
+def classify(frame):
+    """Add volatility, trend, risk_level and growth_potential columns to a quotes DataFrame
+
+    Expects change, change_percent and pe_ratio columns and classifies every
+    row in one pass; the new columns are categoricals.
+    """
+    import pandas as pd
+
+    volatility, trend, risk, growth = classify_codes(
+        frame["change"].to_numpy(dtype=float),
+        frame["change_percent"].to_numpy(dtype=float),
+        frame["pe_ratio"].to_numpy(dtype=float),
+    )
+    return frame.assign(
+        volatility=pd.Categorical.from_codes(volatility, VOLATILITY_LEVELS),
+        trend=pd.Categorical.from_codes(trend, TRENDS),
+        risk_level=pd.Categorical.from_codes(risk, RISK_LEVELS),
+        growth_potential=pd.Categorical.from_codes(growth, GROWTH_POTENTIAL),
+    )
+
+
+def classify_quote(quote):
+    """Classify one quote with the same rules as classify()"""
+    volatility, trend, risk, growth = (int(code) for code in classify_codes(
+        quote.change, quote.change_percent, quote.pe_ratio))
+    return Classification(
+        volatility=VOLATILITY_LEVELS[volatility],
+        vol_emoji=VOLATILITY_EMOJI[volatility],
+        trend=TRENDS[trend],
+        trend_emoji=TREND_EMOJI[trend],
+        risk_level=RISK_LEVELS[risk],
+        growth_potential=GROWTH_POTENTIAL[growth],
+    )
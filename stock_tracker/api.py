@@ -0,0 +1,152 @@
+"""
+Data API - REST quote/history endpoints (the HttpQuoteProvider contract) plus the MCP server
+"""
+
+import asyncio
+import contextlib
+import json
+
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+from stock_tracker.history_store import INTERVAL_SECONDS, earliest_start, get_history_store
+from stock_tracker.metrics import PROMETHEUS_CONTENT_TYPE, render_metrics
+from stock_tracker.providers import ALL_GROUPS, FIELD_GROUPS
+from stock_tracker.quote_cache import get_quote_cache
+
+MAX_BATCH_SYMBOLS = 200
+MAX_HISTORY_BARS = 20000
+
+
+class QuoteJSONResponse(JSONResponse):
+    """JSON that keeps NaN (unknown market cap / P/E) as Python's json module reads it back"""
+
+    def render(self, content):
+        return json.dumps(content, separators=(",", ":")).encode("utf-8")
+
+
+def _parse_groups(groups):
+    groups = tuple(group for group in (groups or "").split(",") if group) or ALL_GROUPS
+    unknown = [group for group in groups if group not in FIELD_GROUPS]
+    if unknown:
+        raise HTTPException(400, f"Unknown field groups: {', '.join(unknown)}")
+    return groups
+
+
+def quote_fields(quote, groups):
+    """The fields of the requested groups, as HttpQuoteProvider.fetch() expects them"""
+    fields = {"name": quote.name}
+    for group in groups:
+        for field in FIELD_GROUPS[group]:
+            fields[field] = getattr(quote, field)
+    return fields
+
+
+def _parse_bound(params, key):
+    value = params.get(key)
+    if value in (None, ""):
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        raise HTTPException(400, f"{key} must be a number")
+
+
+def parse_screen(params):
+    """screen() arguments from ?min_<column>=&max_<column>=&<category>=a,b&sort=&order=&limit="""
+    from stock_tracker.screener import CATEGORY_COLUMNS, NUMERIC_COLUMNS
+
+    ranges = {}
+    for column in NUMERIC_COLUMNS:
+        bounds = (_parse_bound(params, f"min_{column}"), _parse_bound(params, f"max_{column}"))
+        if bounds != (None, None):
+            ranges[column] = bounds
+    categories = {column: params[column].split(",") for column in CATEGORY_COLUMNS if params.get(column)}
+    return {
+        "ranges": ranges,
+        "categories": categories,
+        "sort_by": params.get("sort", "market_cap"),
+        "descending": params.get("order", "desc") != "asc",
+        "limit": int(_parse_bound(params, "limit") or 50),
+    }
+
+
+def create_api(mcp=True):
+    """FastAPI app serving /quote, /quotes and /history from the process-wide caches
+
+    With mcp=True the MCP server is mounted at /mcp in stateless mode, so any
+    replica can answer any request.
+    """
+    lifespan = None
+    if mcp:
+        from stock_tracker.mcp_server import mcp_server
+
+        mcp_server.settings.stateless_http = True
+        mcp_app = mcp_server.streamable_http_app()
+
+        @contextlib.asynccontextmanager
+        async def lifespan(app):
+            async with mcp_server.session_manager.run():
+                yield
+
+    api = FastAPI(title="MCP Stock Tracker Data API", lifespan=lifespan, default_response_class=QuoteJSONResponse)
+
+    @api.get("/quote/{symbol}")
+    async def quote(symbol, groups=""):
+        groups = _parse_groups(groups)
+        found = await get_quote_cache().aget(symbol.upper())
+        if found is None:
+            raise HTTPException(404, f"Unknown symbol: {symbol}")
+        return quote_fields(found, groups)
+
+    @api.get("/quotes")
+    async def quotes(symbols, groups=""):
+        groups = _parse_groups(groups)
+        symbols = list(dict.fromkeys(symbol.upper() for symbol in symbols.split(",") if symbol))
+        if len(symbols) > MAX_BATCH_SYMBOLS:
+            raise HTTPException(400, f"At most {MAX_BATCH_SYMBOLS} symbols per request")
+        found = await get_quote_cache().aget_many(symbols)
+        return {symbol: quote_fields(quote, groups) for symbol, quote in found.items() if quote is not None}
+
+    @api.get("/history/{symbol}")
+    async def history(symbol, start: float, end: float, interval="1d"):
+        if interval not in INTERVAL_SECONDS:
+            raise HTTPException(400, f"Unknown interval: {interval}")
+        if not start < end:
+            raise HTTPException(400, "start must be before end")
+        store = get_history_store()
+        end = min(end, store.clock())
+        # Never fetch past what the interval serves, nor more than one response's worth of bars
+        start = max(start, end - MAX_HISTORY_BARS * INTERVAL_SECONDS[interval])
+        earliest = earliest_start(interval, store.clock())
+        if earliest is not None:
+            start = max(start, earliest)
+        try:
+            bars = await asyncio.to_thread(store.history, symbol.upper(), interval, start, end)
+        except ValueError as e:
+            raise HTTPException(400, str(e))
+        return {field: bars[field].tolist() for field in bars.dtype.names}
+
+    @api.get("/screen")
+    def screen(request: Request):
+        # Imported on first use: the screener pulls in pandas, which quote-only replicas never need
+        from stock_tracker.screener import get_screener
+
+        try:
+            result = get_screener().screen(**parse_screen(request.query_params))
+        except ValueError as e:
+            raise HTTPException(400, str(e))
+        return {"matched": result.matched, "universe": result.universe, "results": result.records()}
+
+    @api.get("/health")
+    def health():
+        return {"status": "ok", "cache": get_quote_cache().stats()}
+
+    @api.get("/metrics", include_in_schema=False)
+    def metrics():
+        return PlainTextResponse(render_metrics(cache=get_quote_cache()), media_type=PROMETHEUS_CONTENT_TYPE)
+
+    if mcp:
+        # Routes registered above take precedence over the catch-all MCP mount
+        api.mount("/", mcp_app)
+    return api
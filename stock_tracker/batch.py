@@ -0,0 +1,30 @@
+"""
+Batch Quotes - Resolve a whole watchlist of symbols in one pass
+"""
+
+from stock_tracker.quote_cache import get_quote_cache
+
+QUOTE_COLUMNS = ("name", "price", "change", "change_percent", "volume", "market_cap", "pe_ratio")
+
+
+def parse_symbols(text):
+    """Split comma/whitespace separated tickers into normalized, de-duplicated symbols"""
+    symbols = (part.upper().strip() for part in text.replace(",", " ").split())
+    return list(dict.fromkeys(symbol for symbol in symbols if symbol))
+
+
+def get_quotes(symbols, cache=None):
+    """Look up many normalized symbols at once and return a DataFrame indexed by symbol
+
+    Unknown symbols are left out of the frame; compare its index with the
+    input to find them.
+    """
+    import pandas as pd
+
+    cache = cache or get_quote_cache()
+    quotes = cache.get_many(symbols)
+    found = [quotes[symbol] for symbol in symbols if quotes.get(symbol) is not None]
+    columns = {column: [getattr(quote, column) for quote in found] for column in QUOTE_COLUMNS}
+    frame = pd.DataFrame(columns, index=pd.Index([quote.symbol for quote in found], name="symbol"))
+    return frame.astype({"price": "float64", "change": "float64", "change_percent": "float64",
+                         "volume": "int64", "market_cap": "float64", "pe_ratio": "float64"})
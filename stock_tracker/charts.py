@@ -0,0 +1,207 @@
+"""
+Charts - Price, volume and indicator series decimated server-side for the chart tab
+"""
+
+import math
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from stock_tracker.history_store import INTERVAL_SECONDS, MAX_HISTORY_DAYS
+from stock_tracker.indicators import SMA_SLOW, compute_indicators
+
+# Points in a whole chart payload (every series of the three panels), whatever
+# the range, interval and overlays; the volume bars come out of it first and
+# the line series share the rest equally
+MAX_CHART_POINTS = 6000
+MAX_VOLUME_BARS = 400
+# Bars read before the visible range so overlays are fully formed at its left edge
+WARMUP_BARS = 2 * SMA_SLOW
+
+CHART_RANGES = {
+    "5D": 5,
+    "1M": 30,
+    "3M": 91,
+    "6M": 182,
+    "1Y": 365,
+    "5Y": 1826,
+    "10Y": 3652,
+}
+
+OVERLAYS = {
+    "sma_20": "SMA 20",
+    "sma_50": "SMA 50",
+    "ema_12": "EMA 12",
+    "ema_26": "EMA 26",
+    "bb_upper": "Bollinger upper",
+    "bb_lower": "Bollinger lower",
+}
+DEFAULT_OVERLAYS = ("sma_20", "sma_50")
+
+
+@dataclass(frozen=True, slots=True)
+class Chart:
+    """Decimated long-form frames ready for gr.LinePlot / gr.BarPlot"""
+    symbol: str
+    interval: str
+    price: pd.DataFrame
+    volume: pd.DataFrame
+    rsi: pd.DataFrame
+    bars: int
+
+
+def lttb(x, y, threshold):
+    """Indices of the points Largest-Triangle-Three-Buckets keeps to draw y(x) with threshold points
+
+    The first and last points are always kept; from each of the threshold - 2
+    buckets in between, the point forming the largest triangle with the
+    previously kept point and the next bucket's average is kept.
+    """
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    sizes = np.diff(edges)
+    # Average of each bucket; the last bucket looks ahead to the final point
+    next_x = np.append(np.add.reduceat(x[:n - 1], edges[:-1])[1:] / sizes[1:], x[-1])
+    next_y = np.append(np.add.reduceat(y[:n - 1], edges[:-1])[1:] / sizes[1:], y[-1])
+
+    indices = np.empty(threshold, dtype=np.int64)
+    indices[0] = kept = 0
+    indices[-1] = n - 1
+    for bucket in range(threshold - 2):
+        lo, hi = edges[bucket], edges[bucket + 1]
+        ax, ay = x[kept], y[kept]
+        area = np.abs((ax - next_x[bucket]) * (y[lo:hi] - ay) - (ax - x[lo:hi]) * (next_y[bucket] - ay))
+        kept = lo + int(area.argmax())
+        indices[bucket + 1] = kept
+    return indices
+
+
+def minmax(y, buckets):
+    """Indices of each bucket's minimum and maximum in order, so every peak and trough survives"""
+    n = len(y)
+    if 2 * buckets >= n:
+        return np.arange(n)
+    size = -(-n // buckets)
+    rows = -(-n // size)
+    padded = np.full(rows * size, np.nan)
+    padded[:n] = y
+    padded = padded.reshape(rows, size)
+    offsets = np.arange(rows) * size
+    lows = offsets + np.where(np.isnan(padded), np.inf, padded).argmin(axis=1)
+    highs = offsets + np.where(np.isnan(padded), -np.inf, padded).argmax(axis=1)
+    return np.unique(np.concatenate([lows, highs]))
+
+
+def bucket_sums(ts, values, buckets):
+    """(first ts, total) per bucket of consecutive values"""
+    n = len(values)
+    if buckets >= n:
+        return np.asarray(ts), np.asarray(values)
+    starts = np.linspace(0, n, buckets, endpoint=False).astype(np.int64)
+    return np.asarray(ts)[starts], np.add.reduceat(np.asarray(values), starts)
+
+
+def chart_ranges(interval):
+    """Keys of the CHART_RANGES that the interval's history reaches back far enough for"""
+    limit = MAX_HISTORY_DAYS[interval]
+    return [key for key, days in CHART_RANGES.items() if limit is None or days <= limit]
+
+
+def _warmup_start(start, interval):
+    # Calendar time covering WARMUP_BARS of daily bars across weekends; intraday
+    # overlays may start a few bars into the range after an overnight gap
+    return start - WARMUP_BARS * INTERVAL_SECONDS[interval] * 2
+
+
+def _times(ts):
+    return pd.to_datetime(ts, unit="s", utc=True)
+
+
+def build_chart(symbol, interval, bars, start, overlays=DEFAULT_OVERLAYS, max_points=MAX_CHART_POINTS):
+    """Chart of bars from start on in at most max_points points; bars may begin earlier to warm up the indicators"""
+    indicators = compute_indicators(bars["close"])
+    visible = int(np.searchsorted(bars["ts"], start, side="left"))
+    ts = np.asarray(bars["ts"][visible:])
+    indicators = indicators.iloc[visible:]
+    close = indicators["close"].to_numpy()
+    volume_bars = min(MAX_VOLUME_BARS, max_points // (len(overlays) + 3))
+    # Close, each overlay and RSI
+    per_series = (max_points - volume_bars) // (len(overlays) + 2)
+
+    # Close picks the samples; overlays are smooth, so sampling them at the same bars keeps them aligned
+    keep = lttb(ts, close, per_series)
+    times = _times(ts[keep])
+    series = [("Close", close[keep])] + [(OVERLAYS[name], indicators[name].to_numpy()[keep]) for name in overlays]
+    price = pd.DataFrame({
+        "time": np.tile(times, len(series)),
+        "value": np.concatenate([values for _, values in series]),
+        "series": np.repeat([label for label, _ in series], len(keep)),
+    }).dropna(ignore_index=True)
+
+    # RSI oscillates, so keep the extremes that cross 30/70 instead of the overall shape
+    rsi = indicators["rsi_14"].to_numpy()
+    keep = minmax(rsi, per_series // 2)
+    rsi = pd.DataFrame({"time": _times(ts[keep]), "rsi": rsi[keep]}).dropna(ignore_index=True)
+
+    volume_ts, volume = bucket_sums(ts, np.asarray(bars["volume"][visible:]), volume_bars)
+    volume = pd.DataFrame({"time": _times(volume_ts), "volume": volume})
+    return Chart(symbol, interval, price, volume, rsi, len(ts))
+
+
+@lru_cache(maxsize=256)
+def _cached_chart(store, symbol, interval, start, last_ts, overlays, max_points):
+    # last_ts is part of the key only: a new bar on disk means a new chart
+    bars = store.read(symbol, interval, _warmup_start(start, interval), None)
+    return build_chart(symbol, interval, bars, start, overlays, max_points)
+
+
+class ChartService:
+    """Charts over the history store, memoized until a newer bar is stored"""
+
+    def __init__(self, history_store=None):
+        self.history_store = history_store
+
+    def chart(self, symbol, interval="1d", days=365, overlays=DEFAULT_OVERLAYS, max_points=MAX_CHART_POINTS):
+        limit = MAX_HISTORY_DAYS[interval]
+        if limit is not None and days > limit:
+            raise ValueError(f"{interval} bars only go back {limit} days")
+        store = self._store()
+        step = INTERVAL_SECONDS[interval]
+        end = store.clock()
+        # Aligned to the interval so repeated requests within a bar share one cache entry
+        start = int(end - days * 86400) // step * step
+        # Indicator warm-up bars are fetched only as far back as the interval allows
+        earliest = -math.inf if limit is None else end - limit * 86400
+        store.ensure(symbol, interval, max(_warmup_start(start, interval), earliest), end)
+        stored = store.read(symbol, interval, start, None)
+        if not len(stored):
+            return None
+        return _cached_chart(store, symbol, interval, start, int(stored["ts"][-1]), tuple(overlays), max_points)
+
+    def _store(self):
+        if self.history_store is None:
+            from stock_tracker.history_store import get_history_store
+
+            self.history_store = get_history_store()
+        return self.history_store
+
+
+_chart_service = None
+_chart_service_lock = threading.Lock()
+
+
+def get_chart_service():
+    """Process-wide chart service over the shared history store"""
+    global _chart_service
+    if _chart_service is None:
+        with _chart_service_lock:
+            if _chart_service is None:
+                _chart_service = ChartService()
+    return _chart_service
@@ -0,0 +1,59 @@
+"""
+System Health - Status card values computed from live telemetry and cache statistics
+"""
+
+from stock_tracker.telemetry import format_duration, format_uptime, telemetry
+
+# User-facing handlers whose latency makes up "Response"
+HANDLER_NAMES = ("search_stock", "search_stock_enhanced", "fetch_stock", "search_watchlist")
+PROVIDER_NAME = "provider"
+
+# Thresholds over the rolling telemetry window
+DEGRADED_HANDLER_P95 = 1.0
+DEGRADED_PROVIDER_P95 = 2.0
+DEGRADED_ERROR_RATE = 0.05
+DOWN_ERROR_RATE = 0.5
+
+
+def evaluate_system_health(registry=telemetry, cache_stats=None):
+    """Health dict for the System Status card (status, api_status, data_feed, response_time, ...)"""
+    handlers = registry.summary(HANDLER_NAMES)
+    provider = registry.window(PROVIDER_NAME).summary()
+
+    if handlers["error_rate"] >= DOWN_ERROR_RATE:
+        api_status = "Offline"
+    elif handlers["error_rate"] >= DEGRADED_ERROR_RATE or (handlers["p95"] or 0) > DEGRADED_HANDLER_P95:
+        api_status = "Limited"
+    else:
+        api_status = "Online"
+
+    if provider["error_rate"] >= DOWN_ERROR_RATE:
+        data_feed = "Disconnected"
+    elif provider["error_rate"] >= DEGRADED_ERROR_RATE or (provider["p95"] or 0) > DEGRADED_PROVIDER_P95:
+        data_feed = "Delayed"
+    else:
+        data_feed = "Connected"
+
+    if api_status == "Offline" or data_feed == "Disconnected":
+        status = "🔴 DOWN"
+    elif api_status == "Limited" or data_feed == "Delayed":
+        status = "🟡 DEGRADED"
+    else:
+        status = "🟢 HEALTHY"
+
+    if handlers["count"]:
+        response_time = f"{format_duration(handlers['p50'])} (p95 {format_duration(handlers['p95'])})"
+    else:
+        response_time = "N/A"
+
+    cache_stats = cache_stats or {}
+    return {
+        "status": status,
+        "api_status": api_status,
+        "data_feed": data_feed,
+        "response_time": response_time,
+        "uptime": format_uptime(registry.uptime()),
+        "cache_hit_ratio": f"{cache_stats.get('hit_ratio', 0.0):.0%}",
+        "handler_latency": handlers,
+        "provider_latency": provider,
+    }
@@ -0,0 +1,268 @@
+"""
+History Store - Append-only on-disk OHLCV bars with memory-mapped range reads
+"""
+
+import json
+import os
+import threading
+import time
+
+import numpy as np
+
+from stock_tracker.singleflight import SingleFlight
+
+# One record per bar; ts is the bar's open time in epoch seconds
+BAR_DTYPE = np.dtype([
+    ("ts", "<i8"),
+    ("open", "<f8"),
+    ("high", "<f8"),
+    ("low", "<f8"),
+    ("close", "<f8"),
+    ("volume", "<i8"),
+])
+BAR_FIELDS = BAR_DTYPE.names
+
+INTERVAL_SECONDS = {
+    "1m": 60,
+    "5m": 300,
+    "15m": 900,
+    "1h": 3600,
+    "1d": 86400,
+}
+
+# Days back each interval can be fetched (Yahoo's limits); daily bars go back to listing
+MAX_HISTORY_DAYS = {
+    "1m": 30,
+    "5m": 60,
+    "15m": 60,
+    "1h": 730,
+    "1d": None,
+}
+
+DEFAULT_HISTORY_DIR = os.path.join("data", "history")
+
+
+def earliest_start(interval, now):
+    """Oldest bar time that can be fetched for an interval as of now, or None if unlimited"""
+    days = MAX_HISTORY_DAYS[interval]
+    return None if days is None else now - days * 86400
+
+
+def empty_bars():
+    return np.empty(0, dtype=BAR_DTYPE)
+
+
+def bars_from_columns(columns):
+    """BAR_DTYPE array from {"ts": [...], "open": [...], ...} (e.g. a JSON payload)"""
+    bars = np.empty(len(columns.get("ts", ())), dtype=BAR_DTYPE)
+    for field in BAR_FIELDS:
+        bars[field] = columns[field] if len(bars) else []
+    return bars
+
+
+def bars_from_frame(frame):
+    """BAR_DTYPE array from a yfinance-style OHLCV DataFrame with a DatetimeIndex"""
+    if frame is None or frame.empty:
+        return empty_bars()
+    frame = frame.dropna(subset=["Close"])
+    bars = np.empty(len(frame), dtype=BAR_DTYPE)
+    bars["ts"] = frame.index.as_unit("s").asi8
+    bars["open"] = frame["Open"].to_numpy(dtype=float)
+    bars["high"] = frame["High"].to_numpy(dtype=float)
+    bars["low"] = frame["Low"].to_numpy(dtype=float)
+    bars["close"] = frame["Close"].to_numpy(dtype=float)
+    bars["volume"] = frame["Volume"].fillna(0).to_numpy(dtype=np.int64)
+    return bars
+
+
+def bars_to_frame(bars):
+    """DataFrame view of bars indexed by UTC timestamp (copies; for charts and analysis)"""
+    import pandas as pd
+
+    frame = pd.DataFrame({field: np.asarray(bars[field]) for field in BAR_FIELDS[1:]})
+    frame.index = pd.to_datetime(np.asarray(bars["ts"]), unit="s", utc=True)
+    frame.index.name = "ts"
+    return frame
+
+
+class HistoryStore:
+    """Per-symbol, per-interval bar files backfilled incrementally from a provider
+
+    Each <root>/<SYMBOL>/<interval>.bars file is a flat array of BAR_DTYPE
+    records sorted by ts, only ever appended to (extending history backwards
+    rewrites the file atomically). Reads memory-map the file and return
+    zero-copy slices. A small JSON sidecar records which time range the
+    provider has answered for, so gaps with no trading (or before listing) are
+    not refetched; an empty answer only counts if the provider confirms empty
+    ranges. The sidecar is read once per series and then kept in memory.
+    """
+
+    def __init__(self, root=DEFAULT_HISTORY_DIR, provider=None, clock=time.time):
+        self.root = root
+        self.provider = provider
+        self.clock = clock
+        self._maps = {}
+        self._coverage = {}
+        self._lock = threading.Lock()
+        self._flight = SingleFlight()
+        self.fetches = 0
+        self.bars_fetched = 0
+
+    def history(self, symbol, interval="1d", start=None, end=None):
+        """Bars in [start, end), fetching only the parts not already on disk"""
+        end = self.clock() if end is None else end
+        start = end - 365 * 86400 if start is None else start
+        self.ensure(symbol, interval, start, end)
+        return self.read(symbol, interval, start, end)
+
+    def read(self, symbol, interval="1d", start=None, end=None):
+        """Memory-mapped slice of stored bars in [start, end) without copying"""
+        bars = self._map(symbol, interval)
+        if not len(bars):
+            return bars
+        ts = bars["ts"]
+        lo = 0 if start is None else int(np.searchsorted(ts, start, side="left"))
+        hi = len(bars) if end is None else int(np.searchsorted(ts, end, side="left"))
+        return bars[lo:hi]
+
+    def coverage(self, symbol, interval="1d"):
+        """(fetched_from, fetched_to) epoch seconds, or None if nothing was fetched yet"""
+        key = (symbol, interval)
+        if key not in self._coverage:
+            try:
+                with open(self._meta_path(symbol, interval)) as handle:
+                    meta = json.load(handle)
+                self._coverage[key] = meta["from"], meta["to"]
+            except FileNotFoundError:
+                self._coverage[key] = None
+        return self._coverage[key]
+
+    def release(self):
+        """Drop open memory maps and cached coverage so the next access rereads the files"""
+        with self._lock:
+            self._maps.clear()
+            self._coverage.clear()
+
+    def ensure(self, symbol, interval, start, end):
+        """Backfill the missing head and tail of [start, end) from the provider"""
+        # Only completed bars are persisted, since files are append-only
+        end = min(end, self._last_complete(interval))
+        if start >= end:
+            return
+        self._flight.do((symbol, interval), self._backfill, symbol, interval, start, end)
+
+    def append(self, symbol, interval, bars):
+        """Append bars newer than the last stored one"""
+        bars = np.asarray(bars, dtype=BAR_DTYPE)
+        with self._lock:
+            stored = self._map(symbol, interval)
+            if len(stored):
+                bars = bars[bars["ts"] > stored["ts"][-1]]
+            if not len(bars):
+                return 0
+            os.makedirs(self._symbol_dir(symbol), exist_ok=True)
+            with open(self._data_path(symbol, interval), "ab") as handle:
+                handle.write(np.sort(bars, order="ts").tobytes())
+            self._maps.pop((symbol, interval), None)
+        return len(bars)
+
+    def _backfill(self, symbol, interval, start, end):
+        covered = self.coverage(symbol, interval)
+        if covered is None:
+            if self._fetch_span(symbol, interval, start, end, prepend=False):
+                self._write_coverage(symbol, interval, start, end)
+            return
+        fetched_from, fetched_to = covered
+        if start < fetched_from and self._fetch_span(symbol, interval, start, fetched_from, prepend=True):
+            fetched_from = start
+        if end > fetched_to and self._fetch_span(symbol, interval, fetched_to, end, prepend=False):
+            fetched_to = end
+        if (fetched_from, fetched_to) != covered:
+            self._write_coverage(symbol, interval, fetched_from, fetched_to)
+
+    def _fetch_span(self, symbol, interval, start, end, prepend):
+        """Fetch and store [start, end); True if the span now counts as covered"""
+        bars = self._fetch(symbol, interval, start, end)
+        self._store_fetched(symbol, interval, bars, prepend)
+        return len(bars) > 0 or self.provider.confirms_empty_history
+
+    def _fetch(self, symbol, interval, start, end):
+        self.fetches += 1
+        bars = self.provider.fetch_history(symbol, start, end, interval)
+        self.bars_fetched += len(bars)
+        return bars
+
+    def _store_fetched(self, symbol, interval, bars, prepend):
+        if not prepend:
+            self.append(symbol, interval, bars)
+            return
+        bars = np.asarray(bars, dtype=BAR_DTYPE)
+        with self._lock:
+            stored = self._map(symbol, interval)
+            if len(stored):
+                bars = bars[bars["ts"] < stored["ts"][0]]
+            if not len(bars):
+                return
+            os.makedirs(self._symbol_dir(symbol), exist_ok=True)
+            path = self._data_path(symbol, interval)
+            with open(path + ".tmp", "wb") as handle:
+                handle.write(np.sort(bars, order="ts").tobytes())
+                handle.write(np.asarray(stored).tobytes())
+            # Readers holding the old mapping keep a consistent view of the old file
+            os.replace(path + ".tmp", path)
+            self._maps.pop((symbol, interval), None)
+
+    def _map(self, symbol, interval):
+        key = (symbol, interval)
+        cached = self._maps.get(key)
+        path = self._data_path(symbol, interval)
+        try:
+            size = os.path.getsize(path)
+        except FileNotFoundError:
+            return empty_bars()
+        if cached is not None and cached[0] == size:
+            return cached[1]
+        count = size // BAR_DTYPE.itemsize
+        bars = np.memmap(path, dtype=BAR_DTYPE, mode="r", shape=(count,)) if count else empty_bars()
+        self._maps[key] = (size, bars)
+        return bars
+
+    def _write_coverage(self, symbol, interval, fetched_from, fetched_to):
+        os.makedirs(self._symbol_dir(symbol), exist_ok=True)
+        path = self._meta_path(symbol, interval)
+        with open(path + ".tmp", "w") as handle:
+            json.dump({"from": fetched_from, "to": fetched_to}, handle)
+        os.replace(path + ".tmp", path)
+        self._coverage[(symbol, interval)] = fetched_from, fetched_to
+
+    def _last_complete(self, interval):
+        step = INTERVAL_SECONDS[interval]
+        return (int(self.clock()) // step) * step
+
+    def _symbol_dir(self, symbol):
+        if not symbol or symbol.startswith(".") or os.path.basename(symbol) != symbol:
+            raise ValueError(f"Invalid symbol for history storage: {symbol!r}")
+        return os.path.join(self.root, symbol)
+
+    def _data_path(self, symbol, interval):
+        return os.path.join(self._symbol_dir(symbol), f"{interval}.bars")
+
+    def _meta_path(self, symbol, interval):
+        return os.path.join(self._symbol_dir(symbol), f"{interval}.json")
+
+
+_history_store = None
+_history_store_lock = threading.Lock()
+
+
+def get_history_store():
+    """Process-wide history store under STOCK_HISTORY_DIR, backed by the quote provider"""
+    global _history_store
+    if _history_store is None:
+        with _history_store_lock:
+            if _history_store is None:
+                from stock_tracker.quote_cache import get_quote_cache
+
+                root = os.environ.get("STOCK_HISTORY_DIR", DEFAULT_HISTORY_DIR)
+                _history_store = HistoryStore(root, get_quote_cache().provider)
+    return _history_store
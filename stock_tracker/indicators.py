@@ -0,0 +1,344 @@
+"""
+Indicator Engine - Vectorized technical indicators with O(1) per-bar incremental updates
+"""
+
+import math
+import threading
+from collections import deque
+from dataclasses import dataclass
+
+import numpy as np
+
+SMA_FAST = 20
+SMA_SLOW = 50
+EMA_FAST = 12
+EMA_SLOW = 26
+MACD_SIGNAL = 9
+RSI_PERIOD = 14
+BOLLINGER_PERIOD = 20
+BOLLINGER_WIDTH = 2.0
+
+# Bars of history loaded to seed a symbol's state (enough to warm up every indicator)
+WARMUP_DAYS = 365
+
+# Seconds between background passes folding newly completed bars into tracked series
+REFRESH_INTERVAL = 60.0
+
+
+@dataclass(frozen=True, slots=True)
+class IndicatorSnapshot:
+    """Indicator values as of one bar; NaN until enough bars have been seen"""
+    ts: int
+    close: float
+    sma_20: float
+    sma_50: float
+    ema_12: float
+    ema_26: float
+    rsi_14: float
+    macd: float
+    macd_signal: float
+    macd_hist: float
+    bb_upper: float
+    bb_middle: float
+    bb_lower: float
+
+
+def _alpha(span):
+    return 2.0 / (span + 1)
+
+
+def compute_indicators(close):
+    """Every indicator over a full close series, one vectorized pass per indicator
+
+    EMAs are seeded with the first close (pandas adjust=False) and RSI uses
+    Wilder smoothing, so values agree with IndicatorState.update().
+    """
+    import pandas as pd
+
+    close = pd.Series(np.asarray(close, dtype=float))
+    ema_fast = close.ewm(span=EMA_FAST, adjust=False).mean()
+    ema_slow = close.ewm(span=EMA_SLOW, adjust=False).mean()
+    macd = ema_fast - ema_slow
+    macd_signal = macd.ewm(span=MACD_SIGNAL, adjust=False).mean()
+
+    diff = close.diff()
+    avg_gain = diff.clip(lower=0).iloc[1:].ewm(alpha=1.0 / RSI_PERIOD, adjust=False).mean()
+    avg_loss = (-diff).clip(lower=0).iloc[1:].ewm(alpha=1.0 / RSI_PERIOD, adjust=False).mean()
+    rsi = _rsi(avg_gain, avg_loss).reindex(close.index)
+
+    window = close.rolling(BOLLINGER_PERIOD)
+    bb_middle = window.mean()
+    bb_std = window.std(ddof=0)
+    return pd.DataFrame({
+        "close": close,
+        "sma_20": close.rolling(SMA_FAST).mean(),
+        "sma_50": close.rolling(SMA_SLOW).mean(),
+        "ema_12": ema_fast,
+        "ema_26": ema_slow,
+        "rsi_14": rsi,
+        "macd": macd,
+        "macd_signal": macd_signal,
+        "macd_hist": macd - macd_signal,
+        "bb_upper": bb_middle + BOLLINGER_WIDTH * bb_std,
+        "bb_middle": bb_middle,
+        "bb_lower": bb_middle - BOLLINGER_WIDTH * bb_std,
+    })
+
+
+def _rsi(avg_gain, avg_loss):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    # No losses in the window reads as fully overbought, a flat window as neutral
+    return rsi.where(avg_loss != 0, np.where(avg_gain == 0, 50.0, 100.0))
+
+
+class IndicatorState:
+    """Rolling state for one series: EMA carries, Wilder averages and running window sums"""
+
+    __slots__ = ("ts", "count", "last_close", "window", "sum_fast", "sum_slow", "sum_bollinger",
+                 "sumsq_bollinger", "ema_fast", "ema_slow", "macd_signal", "avg_gain", "avg_loss")
+
+    def __init__(self):
+        self.ts = None
+        self.count = 0
+        self.last_close = math.nan
+        self.window = deque(maxlen=max(SMA_SLOW, SMA_FAST, BOLLINGER_PERIOD))
+        self.sum_fast = 0.0
+        self.sum_slow = 0.0
+        self.sum_bollinger = 0.0
+        self.sumsq_bollinger = 0.0
+        self.ema_fast = math.nan
+        self.ema_slow = math.nan
+        self.macd_signal = math.nan
+        self.avg_gain = math.nan
+        self.avg_loss = math.nan
+
+    @classmethod
+    def from_bars(cls, bars):
+        """Seed from full history with vectorized indicators instead of replaying every bar"""
+        import pandas as pd
+
+        state = cls()
+        if not len(bars):
+            return state
+        close = np.asarray(bars["close"], dtype=float)
+        frame = compute_indicators(close)
+        last = frame.iloc[-1]
+        state.ts = int(bars["ts"][-1])
+        state.count = len(close)
+        state.last_close = float(close[-1])
+        state.window.extend(close[-state.window.maxlen:].tolist())
+        state._resum()
+        state.ema_fast = float(last["ema_12"])
+        state.ema_slow = float(last["ema_26"])
+        state.macd_signal = float(last["macd_signal"])
+        if len(close) > 1:
+            gains = np.clip(np.diff(close), 0, None)
+            losses = np.clip(-np.diff(close), 0, None)
+            state.avg_gain = float(pd.Series(gains).ewm(alpha=1.0 / RSI_PERIOD, adjust=False).mean().iloc[-1])
+            state.avg_loss = float(pd.Series(losses).ewm(alpha=1.0 / RSI_PERIOD, adjust=False).mean().iloc[-1])
+        return state
+
+    def update(self, ts, close):
+        """Fold in one new bar in constant time and return the resulting snapshot"""
+        close = float(close)
+        window = self.window
+        full = len(window) == window.maxlen
+        # Values leaving each trailing window as the new close enters
+        leaving_fast = window[-SMA_FAST] if len(window) >= SMA_FAST else 0.0
+        leaving_slow = window[-SMA_SLOW] if len(window) >= SMA_SLOW else 0.0
+        leaving_bollinger = window[-BOLLINGER_PERIOD] if len(window) >= BOLLINGER_PERIOD else 0.0
+        window.append(close)
+        self.sum_fast += close - leaving_fast
+        self.sum_slow += close - leaving_slow
+        self.sum_bollinger += close - leaving_bollinger
+        self.sumsq_bollinger += close * close - leaving_bollinger * leaving_bollinger
+
+        if self.count == 0:
+            self.ema_fast = self.ema_slow = close
+            self.macd_signal = 0.0
+        else:
+            self.ema_fast += _alpha(EMA_FAST) * (close - self.ema_fast)
+            self.ema_slow += _alpha(EMA_SLOW) * (close - self.ema_slow)
+            self.macd_signal += _alpha(MACD_SIGNAL) * (self.ema_fast - self.ema_slow - self.macd_signal)
+            change = close - self.last_close
+            gain, loss = max(change, 0.0), max(-change, 0.0)
+            if self.count == 1:
+                self.avg_gain, self.avg_loss = gain, loss
+            else:
+                self.avg_gain += (gain - self.avg_gain) / RSI_PERIOD
+                self.avg_loss += (loss - self.avg_loss) / RSI_PERIOD
+
+        self.ts = int(ts)
+        self.count += 1
+        self.last_close = close
+        if full and self.count % 1024 == 0:
+            # Running sums drift slowly in floating point; re-add the window now and then
+            self._resum()
+        return self.snapshot()
+
+    def snapshot(self):
+        if self.count == 0:
+            return None
+        sma_fast = self.sum_fast / SMA_FAST if len(self.window) >= SMA_FAST else math.nan
+        sma_slow = self.sum_slow / SMA_SLOW if len(self.window) >= SMA_SLOW else math.nan
+        if len(self.window) >= BOLLINGER_PERIOD:
+            middle = self.sum_bollinger / BOLLINGER_PERIOD
+            std = math.sqrt(max(self.sumsq_bollinger / BOLLINGER_PERIOD - middle * middle, 0.0))
+        else:
+            middle = std = math.nan
+        macd = self.ema_fast - self.ema_slow
+        if self.count < 2:
+            rsi = math.nan
+        elif self.avg_loss == 0:
+            rsi = 50.0 if self.avg_gain == 0 else 100.0
+        else:
+            rsi = 100.0 - 100.0 / (1.0 + self.avg_gain / self.avg_loss)
+        return IndicatorSnapshot(
+            ts=self.ts,
+            close=self.last_close,
+            sma_20=sma_fast,
+            sma_50=sma_slow,
+            ema_12=self.ema_fast,
+            ema_26=self.ema_slow,
+            rsi_14=rsi,
+            macd=macd,
+            macd_signal=self.macd_signal,
+            macd_hist=macd - self.macd_signal,
+            bb_upper=middle + BOLLINGER_WIDTH * std,
+            bb_middle=middle,
+            bb_lower=middle - BOLLINGER_WIDTH * std,
+        )
+
+    def _resum(self):
+        values = list(self.window)
+        self.sum_fast = math.fsum(values[-SMA_FAST:])
+        self.sum_slow = math.fsum(values[-SMA_SLOW:])
+        self.sum_bollinger = math.fsum(values[-BOLLINGER_PERIOD:])
+        self.sumsq_bollinger = math.fsum(value * value for value in values[-BOLLINGER_PERIOD:])
+
+
+class IndicatorEngine:
+    """Per-(symbol, interval) indicator state kept current from the history store
+
+    The first lookup seeds the state from stored history in one vectorized
+    pass and later lookups are answered from memory. refresh(), run by the
+    engine's own background thread, folds in bars completed since, and push()
+    lets a live bar feed update a series without touching the store.
+    """
+
+    def __init__(self, history_store=None, warmup_days=WARMUP_DAYS, interval=REFRESH_INTERVAL):
+        self.history_store = history_store
+        self.warmup_days = warmup_days
+        self.interval = interval
+        self._states = {}
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+        self.seeded = 0
+        self.bars_applied = 0
+        self.refresh_errors = 0
+
+    def snapshot(self, symbol, interval="1d"):
+        """Latest IndicatorSnapshot for a symbol, or None if it has no history"""
+        key = (symbol, interval)
+        state = self._states.get(key)
+        if state is not None:
+            return state.snapshot()
+        if self._thread is None:
+            self.start()
+        store = self._store()
+        end = store.clock()
+        bars = store.history(symbol, interval, end - self.warmup_days * 86400, end)
+        with self._lock:
+            state = self._states.get(key)
+            if state is None:
+                state = IndicatorState.from_bars(bars)
+                self._states[key] = state
+                self.seeded += 1
+            return state.snapshot()
+
+    def refresh(self):
+        """Backfill and fold in newly completed bars for every tracked series; returns bars applied"""
+        store = self._store()
+        end = store.clock()
+        applied = 0
+        for (symbol, interval), state in list(self._states.items()):
+            try:
+                store.ensure(symbol, interval, end - self.warmup_days * 86400, end)
+            except Exception:
+                # Keep the series at its last bar; the next pass retries
+                self.refresh_errors += 1
+                continue
+            with self._lock:
+                start = None if state.ts is None else state.ts + 1
+                bars = store.read(symbol, interval, start, None)
+                self._apply(state, bars)
+            applied += len(bars)
+        return applied
+
+    def latest(self, symbol, interval="1d"):
+        """Snapshot of a series already being tracked, without any history I/O"""
+        state = self._states.get((symbol, interval))
+        return state.snapshot() if state is not None else None
+
+    def push(self, symbol, interval, bars):
+        """Apply newly completed bars (BAR_DTYPE records) to a tracked series"""
+        with self._lock:
+            state = self._states.setdefault((symbol, interval), IndicatorState())
+            start = -math.inf if state.ts is None else state.ts
+            self._apply(state, bars[bars["ts"] > start])
+            return state.snapshot()
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name="indicator-engine", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join()
+
+    def stats(self):
+        return {"series": len(self._states), "seeded": self.seeded, "bars_applied": self.bars_applied,
+                "refresh_errors": self.refresh_errors}
+
+    def _apply(self, state, bars):
+        for ts, close in zip(bars["ts"].tolist(), bars["close"].tolist()):
+            state.update(ts, close)
+        self.bars_applied += len(bars)
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            try:
+                self.refresh()
+            except Exception:
+                # Keep serving the current snapshots; try again next interval
+                pass
+
+    def _store(self):
+        if self.history_store is None:
+            from stock_tracker.history_store import get_history_store
+
+            self.history_store = get_history_store()
+        return self.history_store
+
+
+_indicator_engine = None
+_indicator_engine_lock = threading.Lock()
+
+
+def get_indicator_engine():
+    """Process-wide indicator engine over the shared history store"""
+    global _indicator_engine
+    if _indicator_engine is None:
+        with _indicator_engine_lock:
+            if _indicator_engine is None:
+                _indicator_engine = IndicatorEngine()
+    return _indicator_engine
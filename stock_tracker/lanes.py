@@ -0,0 +1,118 @@
+"""
+Queue Lanes - Gradio concurrency lanes with per-lane backpressure and queue-wait telemetry
+"""
+
+import os
+import threading
+import time
+from collections import Counter
+
+from stock_tracker.telemetry import Telemetry
+
+# Served from caches and shared snapshots: status cards, alert checks
+FAST_LANE = "fast"
+# May wait on the data provider: searches, charts, portfolio revaluation
+UPSTREAM_LANE = "upstream"
+# Work over many symbols at once: screens and watchlists
+BATCH_LANE = "batch"
+
+# concurrency_id: (events running at once, events allowed to wait); searches share the
+# event loop with everything else, so a low upstream limit keeps status refreshes quick
+LANES = {
+    FAST_LANE: (16, 256),
+    UPSTREAM_LANE: (2, 128),
+    BATCH_LANE: (2, 16),
+}
+DEFAULT_LANE_DEPTH = 64
+
+# Job slots beyond the lanes' workers for live price streams, which run outside
+# any lane. Every running Gradio event holds a slot for its whole life, but a
+# stream is an async generator on the event loop, so a slot costs a list entry
+# rather than a thread. The count is the most streams open at once per replica;
+# past it, new events of every lane wait for a stream to end. STOCK_STREAM_SLOTS
+# overrides it.
+STREAM_SLOTS = 1000
+
+# Seconds each event waited in its lane before a worker picked it up; execution
+# time is recorded separately by the handlers' own instrumentation
+queue_waits = Telemetry()
+queue_rejections = Counter()
+_rejections_lock = threading.Lock()
+
+
+def lane_config():
+    """{lane: (workers, max waiting)}, with overrides from STOCK_QUEUE_LANES ("upstream=16:256,batch=4")"""
+    lanes = dict(LANES)
+    for item in os.environ.get("STOCK_QUEUE_LANES", "").split(","):
+        name, _, value = item.partition("=")
+        name = name.strip()
+        if not name or not value:
+            continue
+        workers, _, depth = value.partition(":")
+        lanes[name] = (int(workers), int(depth) if depth else lanes.get(name, (0, DEFAULT_LANE_DEPTH))[1])
+    return lanes
+
+
+def stream_slots():
+    """Job slots reserved for live streams, from STOCK_STREAM_SLOTS or STREAM_SLOTS"""
+    return int(os.environ.get("STOCK_STREAM_SLOTS", STREAM_SLOTS))
+
+
+def lane(name, lanes=None):
+    """Event listener keyword arguments placing an event in the named lane"""
+    workers, _ = (lanes or lane_config())[name]
+    return {"concurrency_id": name, "concurrency_limit": workers}
+
+
+def install_lanes(blocks, lanes=None):
+    """Size blocks' queue for the lanes, reject per lane when it is full and record queue waits
+
+    Gradio only bounds the queue as a whole, so a burst of slow searches could
+    fill it and turn away status refreshes; here each lane has its own depth.
+    This wraps Gradio 6 Queue internals (push, send_message, get_events,
+    Event.enqueue_time), hence the <7 pin in requirements.txt and the tests
+    in tests/test_lanes.py.
+    """
+    lanes = lanes or lane_config()
+    # Enough workers for every lane at its limit, so a saturated lane never holds another lane's slots
+    blocks.max_threads = max(blocks.max_threads, sum(workers for workers, _ in lanes.values()))
+    blocks.queue(max_size=sum(depth for _, depth in lanes.values()))
+    queue = blocks._queue
+    # Every running event holds a job slot, so open streams must not use up the lanes' slots
+    queue.max_thread_count = blocks.max_threads + stream_slots()
+    push = queue.push
+    send_message = queue.send_message
+    get_events = queue.get_events
+
+    async def push_within_lane(body, *args, **kwargs):
+        fn = blocks.fns.get(body.fn_index)
+        concurrency_id = getattr(fn, "concurrency_id", None)
+        if concurrency_id in lanes:
+            event_queue = queue.event_queue_per_concurrency_id.get(concurrency_id)
+            waiting = len(event_queue.queue) if event_queue is not None else 0
+            if waiting >= lanes[concurrency_id][1]:
+                with _rejections_lock:
+                    queue_rejections[concurrency_id] += 1
+                message = f"The {concurrency_id} queue is full ({waiting} waiting), please retry shortly."
+                return False, message, "queue_full"
+        return await push(body, *args, **kwargs)
+
+    def send_message_timed(event, message):
+        concurrency_id = event.fn.concurrency_id
+        if getattr(message, "msg", None) == "process_starts" and concurrency_id in lanes:
+            queue_waits.record(concurrency_id, time.monotonic() - event.enqueue_time)
+        send_message(event, message)
+
+    def get_events_fast_first():
+        # Gradio picks among runnable lanes at random; fast-lane events never wait for that draw
+        event_queue = queue.event_queue_per_concurrency_id.get(FAST_LANE)
+        if event_queue is not None and event_queue.queue and (
+                event_queue.concurrency_limit is None
+                or event_queue.current_concurrency < event_queue.concurrency_limit):
+            return [event_queue.queue.pop(0)], False, FAST_LANE
+        return get_events()
+
+    queue.push = push_within_lane
+    queue.send_message = send_message_timed
+    queue.get_events = get_events_fast_first
+    return blocks
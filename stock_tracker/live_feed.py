@@ -0,0 +1,172 @@
+"""
+Live Feed - Shared per-symbol price subscriptions multiplexed across viewers
+"""
+
+import asyncio
+import math
+import random
+from dataclasses import dataclass
+
+from stock_tracker.alerts import get_alert_engine
+from stock_tracker.quote_cache import get_quote_cache
+
+# Seconds between polls of a symbol's tick source
+TICK_INTERVAL = 1.0
+
+
+@dataclass(frozen=True, slots=True)
+class Tick:
+    """Incremental price update for one symbol"""
+    symbol: str
+    price: float
+    change: float
+    change_percent: float
+    volume: int
+
+
+class SimulatedTickSource:
+    """Random-walk ticks around the cached quote, for demo data and local testing"""
+
+    def __init__(self, cache=None, volatility=0.0008, seed=None):
+        self.cache = cache
+        self.volatility = volatility
+        self._random = random.Random(seed)
+        self._last = {}
+
+    async def next_tick(self, symbol):
+        last = self._last.get(symbol)
+        if last is None:
+            quote = await (self.cache or get_quote_cache()).aget(symbol)
+            if quote is None:
+                return None
+            last = Tick(symbol, quote.price, quote.change, quote.change_percent, quote.volume)
+        previous_close = last.price - last.change
+        price = round(last.price * math.exp(self._random.gauss(0.0, self.volatility)), 2)
+        change = price - previous_close
+        tick = Tick(symbol, price, change, change / previous_close * 100 if previous_close else 0.0,
+                    last.volume + self._random.randint(0, 25_000))
+        self._last[symbol] = tick
+        return tick
+
+    def release(self, symbol):
+        """Forget a symbol's random walk once nobody is streaming it"""
+        self._last.pop(symbol, None)
+
+
+class CacheTickSource:
+    """Ticks from the shared quote cache, so live viewers never add upstream calls of their own"""
+
+    def __init__(self, cache=None):
+        self.cache = cache
+
+    async def next_tick(self, symbol):
+        quote = await (self.cache or get_quote_cache()).aget(symbol)
+        if quote is None:
+            return None
+        return Tick(symbol, quote.price, quote.change, quote.change_percent, quote.volume)
+
+    def release(self, symbol):
+        pass
+
+
+class _Subscription:
+    __slots__ = ("symbol", "viewers", "seq", "latest", "changed", "task")
+
+    def __init__(self, symbol):
+        self.symbol = symbol
+        self.viewers = 0
+        self.seq = 0
+        self.latest = None
+        self.changed = asyncio.Condition()
+        self.task = None
+
+
+class TickHub:
+    """One polling task per symbol, fanned out to every viewer of that symbol
+
+    Viewers only receive a tick when the price or volume actually moved; the
+    producer stops and the source releases the symbol when the last viewer
+    disconnects. Listeners (such as the alert engine) are called with every
+    published tick.
+    """
+
+    def __init__(self, source, interval=TICK_INTERVAL, listeners=()):
+        self.source = source
+        self.interval = interval
+        self.listeners = list(listeners)
+        self._subscriptions = {}
+        self.ticks_published = 0
+
+    async def stream(self, symbol):
+        """Async iterator of Ticks for a normalized symbol; ends if the symbol is unknown"""
+        subscription = self._subscriptions.get(symbol)
+        if subscription is None:
+            subscription = _Subscription(symbol)
+            self._subscriptions[symbol] = subscription
+            subscription.task = asyncio.create_task(self._produce(subscription))
+        subscription.viewers += 1
+        seen = 0
+        try:
+            while True:
+                async with subscription.changed:
+                    await subscription.changed.wait_for(lambda: subscription.seq != seen)
+                    seen = subscription.seq
+                    tick = subscription.latest
+                if tick is None:
+                    return
+                yield tick
+        finally:
+            subscription.viewers -= 1
+            if subscription.viewers == 0 and self._subscriptions.get(symbol) is subscription:
+                del self._subscriptions[symbol]
+                subscription.task.cancel()
+                self.source.release(symbol)
+
+    def stats(self):
+        return {
+            "symbols": len(self._subscriptions),
+            "viewers": sum(subscription.viewers for subscription in self._subscriptions.values()),
+            "ticks_published": self.ticks_published,
+        }
+
+    async def _produce(self, subscription):
+        while True:
+            try:
+                tick = await self.source.next_tick(subscription.symbol)
+            except Exception:
+                # Upstream hiccup: keep the last tick and retry next interval
+                await asyncio.sleep(self.interval)
+                continue
+            latest = subscription.latest
+            if tick is None or latest is None or (tick.price, tick.volume) != (latest.price, latest.volume):
+                async with subscription.changed:
+                    subscription.latest = tick
+                    subscription.seq += 1
+                    subscription.changed.notify_all()
+                self.ticks_published += 1
+                if tick is not None:
+                    self._notify_listeners(tick)
+            if tick is None:
+                return
+            await asyncio.sleep(self.interval)
+
+    def _notify_listeners(self, tick):
+        for listener in self.listeners:
+            try:
+                listener(tick)
+            except Exception:
+                # A failing listener must not stall the feed for viewers
+                pass
+
+
+_tick_hub = None
+
+
+def get_tick_hub():
+    """Process-wide hub; demo data gets simulated ticks, live providers poll the cache"""
+    global _tick_hub
+    if _tick_hub is None:
+        cache = get_quote_cache()
+        source = SimulatedTickSource() if cache.provider.name == "demo" else CacheTickSource()
+        _tick_hub = TickHub(source, listeners=[get_alert_engine().on_tick])
+    return _tick_hub
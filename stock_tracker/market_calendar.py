@@ -0,0 +1,210 @@
+"""
+Market Calendar - Precomputed NYSE sessions with binary-search status lookups
+"""
+
+import bisect
+import calendar
+import threading
+import time
+from datetime import date, datetime, timedelta
+
+import pytz
+
+ET = pytz.timezone("US/Eastern")
+
+# Regular and extended trading hours (ET) as (hour, minute)
+PRE_MARKET_OPEN = (4, 0)
+REGULAR_OPEN = (9, 30)
+REGULAR_CLOSE = (16, 0)
+EARLY_CLOSE = (13, 0)
+AFTER_HOURS_CLOSE = (20, 0)
+EARLY_AFTER_HOURS_CLOSE = (17, 0)
+
+# One-off closures not covered by the holiday rules
+SPECIAL_CLOSURES = {
+    date(2025, 1, 9): "National Day of Mourning",
+}
+
+
+def _nth_weekday(year, month, weekday, n):
+    first = date(year, month, 1)
+    return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+
+
+def _last_weekday(year, month, weekday):
+    last = date(year + month // 12, month % 12 + 1, 1) - timedelta(days=1)
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def _easter(year):
+    # Anonymous Gregorian algorithm
+    a, b, c = year % 19, year // 100, year % 100
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+def _observed(day):
+    """Saturday holidays move to Friday, Sunday holidays to Monday"""
+    if day.weekday() == 5:
+        return day - timedelta(days=1)
+    if day.weekday() == 6:
+        return day + timedelta(days=1)
+    return day
+
+
+def nyse_holidays(year):
+    """{date: name} of full-day NYSE closures in a year"""
+    holidays = {
+        _nth_weekday(year, 1, 0, 3): "Martin Luther King Jr. Day",
+        _nth_weekday(year, 2, 0, 3): "Washington's Birthday",
+        _easter(year) - timedelta(days=2): "Good Friday",
+        _last_weekday(year, 5, 0): "Memorial Day",
+        _observed(date(year, 7, 4)): "Independence Day",
+        _nth_weekday(year, 9, 0, 1): "Labor Day",
+        _nth_weekday(year, 11, 3, 4): "Thanksgiving Day",
+        _observed(date(year, 12, 25)): "Christmas Day",
+    }
+    # NYSE does not observe New Year's Day on the preceding Friday
+    new_year = date(year, 1, 1)
+    if new_year.weekday() != 5:
+        holidays[_observed(new_year)] = "New Year's Day"
+    if year >= 2022:
+        holidays[_observed(date(year, 6, 19))] = "Juneteenth"
+    holidays.update({day: name for day, name in SPECIAL_CLOSURES.items() if day.year == year})
+    return holidays
+
+
+def nyse_early_closes(year, holidays):
+    """Trading days that close at 1:00 PM ET"""
+    candidates = (
+        date(year, 7, 3),
+        _nth_weekday(year, 11, 3, 4) + timedelta(days=1),
+        date(year, 12, 24),
+    )
+    return {day for day in candidates if day.weekday() < 5 and day not in holidays}
+
+
+class MarketCalendar:
+    """Sorted session timestamps for a range of years, queried with bisect"""
+
+    def __init__(self, first_year, last_year):
+        self.first_year = first_year
+        self.last_year = last_year
+        self.holidays = {}
+        self.pre_opens = []
+        self.opens = []
+        self.closes = []
+        self.post_closes = []
+        self.early_close = []
+        for year in range(first_year, last_year + 1):
+            holidays = nyse_holidays(year)
+            early_closes = nyse_early_closes(year, holidays)
+            self.holidays.update(holidays)
+            day = date(year, 1, 1)
+            while day.year == year:
+                if day.weekday() < 5 and day not in holidays:
+                    early = day in early_closes
+                    # DST switches at 2 AM, so one UTC offset covers the whole session day
+                    midnight = calendar.timegm(day.timetuple()) - ET.utcoffset(
+                        datetime(day.year, day.month, day.day, 12)).total_seconds()
+                    self.pre_opens.append(midnight + _seconds(PRE_MARKET_OPEN))
+                    self.opens.append(midnight + _seconds(REGULAR_OPEN))
+                    self.closes.append(midnight + _seconds(EARLY_CLOSE if early else REGULAR_CLOSE))
+                    self.post_closes.append(midnight + _seconds(
+                        EARLY_AFTER_HOURS_CLOSE if early else AFTER_HOURS_CLOSE))
+                    self.early_close.append(early)
+                day += timedelta(days=1)
+        self.start = self.pre_opens[0]
+        self.end = self.post_closes[-1]
+
+    def session_index(self, ts):
+        """Index of the last session whose pre-market has started at ts"""
+        if not self.start <= ts < self.end:
+            raise LookupError("timestamp outside the precomputed market calendar")
+        return bisect.bisect_right(self.pre_opens, ts) - 1
+
+    def status(self, ts=None):
+        """Market status dict (status, is_open, phase, current_time, next_session) at ts"""
+        ts = time.time() if ts is None else ts
+        index = self.session_index(ts)
+        now = datetime.fromtimestamp(ts, ET)
+        holiday = self.holidays.get(now.date())
+
+        if index >= 0 and self.opens[index] <= ts < self.closes[index]:
+            phase = "open"
+        elif index >= 0 and self.pre_opens[index] <= ts < self.opens[index]:
+            phase = "pre-market"
+        elif index >= 0 and self.closes[index] <= ts < self.post_closes[index]:
+            phase = "after-hours"
+        else:
+            phase = "closed"
+
+        if phase == "open":
+            close = datetime.fromtimestamp(self.closes[index], ET)
+            next_session = f"Closes {_clock(close)} ET" + (" (early close)" if self.early_close[index] else "")
+        else:
+            next_open_index = bisect.bisect_right(self.opens, ts)
+            if next_open_index >= len(self.opens):
+                raise LookupError("no upcoming session in the precomputed market calendar")
+            next_open = datetime.fromtimestamp(self.opens[next_open_index], ET)
+            next_session = f"{_relative_day(now.date(), next_open.date())} {_clock(next_open)} ET"
+            if holiday:
+                next_session = f"Closed for {holiday} • Opens {next_session}"
+
+        return {
+            "status": PHASE_LABELS[phase],
+            "is_open": phase == "open",
+            "phase": phase,
+            "holiday": holiday,
+            "current_time": now.strftime("%I:%M %p ET"),
+            "next_session": next_session,
+        }
+
+
+PHASE_LABELS = {
+    "open": "🟢 OPEN",
+    "pre-market": "🟡 PRE-MARKET",
+    "after-hours": "🟡 AFTER-HOURS",
+    "closed": "🔴 CLOSED",
+}
+
+
+def _seconds(hour_minute):
+    return hour_minute[0] * 3600 + hour_minute[1] * 60
+
+
+def _clock(moment):
+    return moment.strftime("%I:%M %p").lstrip("0")
+
+
+def _relative_day(today, day):
+    days = (day - today).days
+    if days == 0:
+        return "Today"
+    if days == 1:
+        return "Tomorrow"
+    if days < 7:
+        return day.strftime("%A")
+    return day.strftime("%a, %b ") + str(day.day)
+
+
+_calendar = None
+_calendar_lock = threading.Lock()
+
+
+def get_calendar():
+    """Calendar covering last year through five years ahead, built once on first use"""
+    global _calendar
+    if _calendar is None:
+        with _calendar_lock:
+            if _calendar is None:
+                year = datetime.now(ET).year
+                _calendar = MarketCalendar(year - 1, year + 5)
+    return _calendar
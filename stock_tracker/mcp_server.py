@@ -0,0 +1,169 @@
+"""
+MCP Server - Model Context Protocol tools on the shared cached quote, history and indicator layers
+
+Run with `python -m stock_tracker.mcp_server` (stdio) or
+`python -m stock_tracker.mcp_server --transport streamable-http --port 8001`.
+"""
+
+import argparse
+import asyncio
+import math
+import os
+from dataclasses import asdict
+
+from mcp.server.fastmcp import FastMCP
+
+from stock_tracker.batch import parse_symbols
+from stock_tracker.history_store import INTERVAL_SECONDS, MAX_HISTORY_DAYS, get_history_store
+from stock_tracker.indicators import get_indicator_engine
+from stock_tracker.market_calendar import get_calendar
+from stock_tracker.quote_cache import get_quote_cache
+from stock_tracker.recommendations import get_recommendation_engine
+
+# Bounds on a single call so one agent cannot pin the server
+MAX_BATCH_SYMBOLS = 200
+MAX_HISTORY_BARS = 5000
+
+mcp_server = FastMCP(
+    "stock-tracker",
+    instructions="Stock quotes, OHLCV history, technical indicators and NYSE market status. "
+                 "Quotes are served from a shared cache; prefer get_quotes for several symbols.",
+    # Per-call INFO logging is measurable when agents call tools in tight loops
+    log_level="WARNING",
+)
+
+
+def _clean(value):
+    """JSON-safe value: NaN becomes None"""
+    return None if isinstance(value, float) and math.isnan(value) else value
+
+
+def quote_payload(quote):
+    """Quote fields with the engine's recommendation in place of the provider's"""
+    payload = {field: _clean(value) for field, value in asdict(quote).items() if field != "version"}
+    payload["recommendation"] = get_recommendation_engine().recommend(
+        quote, get_indicator_engine().latest(quote.symbol)).action
+    return payload
+
+
+def _symbol(symbol):
+    symbol = symbol.upper().strip()
+    if not symbol:
+        raise ValueError("symbol must not be empty")
+    return symbol
+
+
+def _interval(interval):
+    if interval not in INTERVAL_SECONDS:
+        raise ValueError(f"interval must be one of: {', '.join(INTERVAL_SECONDS)}")
+    return interval
+
+
+def _history_days(interval, days):
+    """days capped to how far back the interval goes (daily bars: MAX_HISTORY_BARS days)"""
+    if days < 1:
+        raise ValueError("days must be at least 1")
+    return min(days, MAX_HISTORY_DAYS[interval] or MAX_HISTORY_BARS)
+
+
+@mcp_server.tool()
+async def get_quote(symbol: str) -> dict:
+    """Latest quote for one ticker symbol (price, change, volume, market cap, P/E, recommendation)."""
+    symbol = _symbol(symbol)
+    quote = await get_quote_cache().aget(symbol)
+    if quote is None:
+        raise ValueError(f"Unknown symbol: {symbol}")
+    return quote_payload(quote)
+
+
+@mcp_server.tool()
+async def get_quotes(symbols: list[str]) -> dict:
+    """Quotes for many ticker symbols in one call; unknown symbols are listed under "not_found"."""
+    symbols = parse_symbols(" ".join(symbols))
+    if len(symbols) > MAX_BATCH_SYMBOLS:
+        raise ValueError(f"At most {MAX_BATCH_SYMBOLS} symbols per call")
+    quotes = await get_quote_cache().aget_many(symbols)
+    return {
+        "quotes": {symbol: quote_payload(quote) for symbol, quote in quotes.items() if quote is not None},
+        "not_found": [symbol for symbol in symbols if quotes.get(symbol) is None],
+    }
+
+
+@mcp_server.tool()
+async def get_history(symbol: str, interval: str = "1d", days: int = 90) -> dict:
+    """OHLCV bars for the last `days` days as columns (ts in epoch seconds). interval: 1m, 5m, 15m, 1h or 1d.
+    days is capped per interval (30 for 1m, 60 for 5m and 15m, 730 for 1h, 5,000 for 1d) and at most the
+    latest 5,000 bars are returned."""
+    symbol = _symbol(symbol)
+    interval = _interval(interval)
+    days = _history_days(interval, days)
+    store = get_history_store()
+    end = store.clock()
+    # Stored ranges are read from disk; only missing ranges reach the provider
+    bars = await asyncio.to_thread(store.history, symbol, interval, end - days * 86400, end)
+    bars = bars[-MAX_HISTORY_BARS:]
+    return {
+        "symbol": symbol,
+        "interval": interval,
+        "days": days,
+        "count": len(bars),
+        **{field: bars[field].tolist() for field in bars.dtype.names},
+    }
+
+
+@mcp_server.tool()
+async def get_indicators(symbol: str, interval: str = "1d") -> dict:
+    """Latest SMA 20/50, EMA 12/26, RSI 14, MACD 12/26/9 and Bollinger 20/2 values for a symbol."""
+    symbol = _symbol(symbol)
+    interval = _interval(interval)
+    # Tracked series are kept current by the indicator engine's background pass
+    snapshot = await asyncio.to_thread(get_indicator_engine().snapshot, symbol, interval)
+    if snapshot is None:
+        raise ValueError(f"No price history for {symbol}")
+    return {"symbol": symbol, "interval": interval,
+            **{field: _clean(value) for field, value in asdict(snapshot).items()}}
+
+
+@mcp_server.tool()
+async def screen_stocks(ranges: dict[str, list[float | None]] | None = None,
+                        categories: dict[str, list[str]] | None = None,
+                        sort_by: str = "market_cap", descending: bool = True, limit: int = 25) -> dict:
+    """Filter and rank all tracked stocks. ranges maps price, change, change_percent, volume, market_cap,
+    pe_ratio, rsi_14, sma_20, sma_50 or macd_hist to [min, max] (null for open-ended); categories maps
+    volatility (Low/Moderate/High), trend (Bearish/Bullish), risk_level, growth_potential or action
+    (SELL/HOLD/BUY) to the values to keep."""
+    from stock_tracker.screener import get_screener
+
+    result = await asyncio.to_thread(
+        get_screener().screen,
+        {column: tuple(bounds) for column, bounds in (ranges or {}).items()},
+        categories, sort_by, descending, min(limit, MAX_BATCH_SYMBOLS),
+    )
+    return {
+        "matched": result.matched,
+        "universe": result.universe,
+        "results": result.records(),
+    }
+
+
+@mcp_server.tool()
+async def market_status() -> dict:
+    """Current NYSE session (open, pre-market, after-hours or closed) and the next open/close."""
+    return get_calendar().status()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stock tracker MCP server")
+    parser.add_argument("--transport", choices=("stdio", "sse", "streamable-http"),
+                        default=os.environ.get("MCP_TRANSPORT", "stdio"))
+    parser.add_argument("--host", default=os.environ.get("MCP_HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(os.environ.get("MCP_PORT", 8001)))
+    args = parser.parse_args(argv)
+    mcp_server.settings.host = args.host
+    mcp_server.settings.port = args.port
+    # All sessions share one event loop and the process-wide caches
+    mcp_server.run(transport=args.transport)
+
+
+if __name__ == "__main__":
+    main()
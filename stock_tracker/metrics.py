@@ -0,0 +1,124 @@
+"""
+Metrics - Prometheus text exposition of handler, cache, upstream and queue statistics
+"""
+
+from stock_tracker.lanes import queue_rejections, queue_waits
+from stock_tracker.telemetry import LATENCY_BUCKETS, telemetry
+
+PREFIX = "stock_tracker"
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+PROVIDER_NAME = "provider"
+
+# Always reported, even before their first call
+REPORTED_HANDLERS = ("search_stock", "search_stock_enhanced", "fetch_stock", "search_watchlist",
+                     "update_status_indicators")
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class MetricsWriter:
+    """Accumulates metric families and renders them in the Prometheus text format"""
+
+    def __init__(self):
+        self._lines = []
+
+    def family(self, name, kind, help_text):
+        self._lines.append(f"# HELP {PREFIX}_{name} {help_text}")
+        self._lines.append(f"# TYPE {PREFIX}_{name} {kind}")
+
+    def sample(self, name, value, **labels):
+        self._lines.append(f"{PREFIX}_{name}{_labels(**labels)} {_format_value(value)}")
+
+    def histogram(self, name, window, **labels):
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS + (float("inf"),), window.bucket_counts):
+            cumulative += count
+            self.sample(f"{name}_bucket", cumulative, le=_format_value(bound), **labels)
+        self.sample(f"{name}_sum", window.total_seconds, **labels)
+        self.sample(f"{name}_count", window.count, **labels)
+
+    def render(self):
+        return "\n".join(self._lines) + "\n"
+
+
+def queue_depths(blocks):
+    """{concurrency_id: (waiting, running)} from a Gradio Blocks queue, if one is running"""
+    queue = getattr(blocks, "_queue", None) if blocks is not None else None
+    event_queues = getattr(queue, "event_queue_per_concurrency_id", None) or {}
+    return {concurrency_id: (len(event_queue.queue), event_queue.current_concurrency)
+            for concurrency_id, event_queue in list(event_queues.items())}
+
+
+def render_metrics(registry=telemetry, cache=None, blocks=None, waits=queue_waits, rejections=queue_rejections):
+    """Prometheus exposition text for the whole process"""
+    writer = MetricsWriter()
+    handler_names = list(dict.fromkeys(
+        REPORTED_HANDLERS + tuple(name for name in registry.names() if name != PROVIDER_NAME)))
+
+    writer.family("requests_total", "counter", "Handler calls by outcome")
+    for name in handler_names:
+        window = registry.window(name)
+        writer.sample("requests_total", window.count - window.errors, handler=name, outcome="success")
+        writer.sample("requests_total", window.errors, handler=name, outcome="error")
+
+    writer.family("request_duration_seconds", "histogram", "Handler latency")
+    for name in handler_names:
+        writer.histogram("request_duration_seconds", registry.window(name), handler=name)
+
+    provider_window = registry.window(PROVIDER_NAME)
+    provider_name = getattr(getattr(cache, "provider", None), "name", "unknown")
+    writer.family("upstream_requests_total", "counter", "Calls to the upstream data provider by outcome")
+    writer.sample("upstream_requests_total", provider_window.count - provider_window.errors,
+                  provider=provider_name, outcome="success")
+    writer.sample("upstream_requests_total", provider_window.errors, provider=provider_name, outcome="error")
+    writer.family("upstream_duration_seconds", "histogram", "Upstream data provider latency")
+    writer.histogram("upstream_duration_seconds", provider_window, provider=provider_name)
+
+    if cache is not None:
+        stats = cache.stats()
+        for key, help_text in (
+            ("hits", "Fresh cache hits"),
+            ("stale_hits", "Cache hits served stale while refreshing"),
+            ("misses", "Cache misses"),
+            ("evictions", "LRU evictions"),
+            ("coalesced", "Lookups coalesced onto an in-flight fetch"),
+            ("refreshes", "Background refreshes completed"),
+            ("refresh_errors", "Background refreshes that failed"),
+        ):
+            writer.family(f"cache_{key}_total", "counter", help_text)
+            writer.sample(f"cache_{key}_total", stats[key])
+        writer.family("cache_entries", "gauge", "Symbols currently cached")
+        writer.sample("cache_entries", stats["size"])
+
+    depths = queue_depths(blocks)
+    writer.family("queue_depth", "gauge", "Events waiting in the Gradio queue")
+    for concurrency_id, (waiting, _) in depths.items():
+        writer.sample("queue_depth", waiting, concurrency_id=concurrency_id)
+    writer.family("queue_active", "gauge", "Events currently executing")
+    for concurrency_id, (_, running) in depths.items():
+        writer.sample("queue_active", running, concurrency_id=concurrency_id)
+    # Queue wait is reported apart from request_duration_seconds, which only covers execution
+    writer.family("queue_wait_seconds", "histogram", "Time events waited in their lane before starting")
+    for concurrency_id in waits.names():
+        writer.histogram("queue_wait_seconds", waits.window(concurrency_id), concurrency_id=concurrency_id)
+    writer.family("queue_rejected_total", "counter", "Events turned away because their lane was full")
+    for concurrency_id, count in list(rejections.items()):
+        writer.sample("queue_rejected_total", count, concurrency_id=concurrency_id)
+
+    writer.family("uptime_seconds", "gauge", "Seconds since the process started")
+    writer.sample("uptime_seconds", round(registry.uptime(), 3))
+    return writer.render()
@@ -0,0 +1,297 @@
+"""
+Portfolio - SQLite-backed positions with incrementally maintained mark-to-market P&L
+"""
+
+import math
+import os
+import sqlite3
+import threading
+from dataclasses import dataclass
+
+DEFAULT_PORTFOLIO_DB = os.path.join("data", "portfolio.db")
+DEFAULT_PORTFOLIO = "default"
+
+# Holding updates between recomputing the running totals from scratch
+RETOTAL_UPDATES = 1024
+
+PORTFOLIO_COLUMNS = ("symbol", "quantity", "avg_cost", "price", "market_value", "unrealized",
+                     "unrealized_percent", "day_change", "weight")
+
+
+@dataclass(slots=True)
+class Position:
+    """Shares held in one symbol and their average cost; realized P&L survives closing it out"""
+    symbol: str
+    quantity: float
+    avg_cost: float
+    realized: float = 0.0
+
+
+class PortfolioStore:
+    """Positions of every portfolio in one SQLite database"""
+
+    def __init__(self, path=DEFAULT_PORTFOLIO_DB):
+        self.path = path
+        if path != ":memory:" and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS positions ("
+                " portfolio TEXT NOT NULL,"
+                " symbol TEXT NOT NULL,"
+                " quantity REAL NOT NULL,"
+                " avg_cost REAL NOT NULL,"
+                " realized REAL NOT NULL DEFAULT 0,"
+                " PRIMARY KEY (portfolio, symbol))"
+            )
+
+    def load(self, portfolio):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT symbol, quantity, avg_cost, realized FROM positions WHERE portfolio = ? ORDER BY symbol",
+                (portfolio,),
+            ).fetchall()
+        return [Position(*row) for row in rows]
+
+    def save(self, portfolio, position):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO positions (portfolio, symbol, quantity, avg_cost, realized) VALUES (?, ?, ?, ?, ?)"
+                " ON CONFLICT (portfolio, symbol) DO UPDATE SET"
+                " quantity = excluded.quantity, avg_cost = excluded.avg_cost, realized = excluded.realized",
+                (portfolio, position.symbol, position.quantity, position.avg_cost, position.realized),
+            )
+
+    def delete(self, portfolio):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM positions WHERE portfolio = ?", (portfolio,))
+
+    def portfolios(self):
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT DISTINCT portfolio FROM positions ORDER BY 1")]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class _Holding:
+    __slots__ = ("position", "version", "price", "change", "market_value", "cost", "unrealized", "day_change")
+
+    def __init__(self, position):
+        self.position = position
+        self.version = None
+        self.price = math.nan
+        self.change = 0.0
+        self.reprice()
+
+    def reprice(self):
+        quantity = self.position.quantity
+        self.cost = quantity * self.position.avg_cost
+        if math.isnan(self.price):
+            self.market_value = self.unrealized = self.day_change = 0.0
+        else:
+            self.market_value = quantity * self.price
+            self.unrealized = self.market_value - self.cost
+            self.day_change = quantity * self.change
+
+
+class Portfolio:
+    """In-memory position index with running P&L totals
+
+    Totals are adjusted by the difference a single holding contributes, so a
+    quote update or a trade costs O(1) and revalue() only touches holdings
+    whose quote version changed. Quotes come from the shared quote cache in
+    one batched lookup. Totals are summed afresh from the holdings on load
+    and every RETOTAL_UPDATES adjustments, so floating-point error in the
+    running sums cannot build up.
+    """
+
+    def __init__(self, name, store, cache=None):
+        self.name = name
+        self.store = store
+        self.cache = cache
+        self._lock = threading.Lock()
+        self._holdings = {}
+        self.market_value = 0.0
+        self.cost = 0.0
+        self.unrealized = 0.0
+        self.day_change = 0.0
+        self.realized = 0.0
+        self.open_positions = 0
+        self.revision = 0
+        self.marks = 0
+        self._adjustments = 0
+        self._table = (None, None)
+        for position in store.load(name):
+            self._holdings[position.symbol] = _Holding(position)
+        self._retotal()
+
+    def symbols(self):
+        return list(self._holdings)
+
+    def trade(self, symbol, quantity, price=None):
+        """Record a buy (positive quantity) or sell (negative) at price, defaulting to the last quote"""
+        if not quantity:
+            raise ValueError("Trade quantity must be non-zero")
+        quote = self._cache().get(symbol)
+        if price is None:
+            if quote is None:
+                raise ValueError(f"No quote for {symbol}; enter a trade price")
+            price = quote.price
+        if price <= 0:
+            raise ValueError("Trade price must be positive")
+        with self._lock:
+            holding = self._holdings.get(symbol)
+            held = 0.0 if holding is None else holding.position.quantity
+            if quantity < 0 and -quantity > held + 1e-9:
+                raise ValueError(f"Cannot sell {-quantity:g} {symbol}; only {held:g} held")
+            if holding is None:
+                holding = _Holding(Position(symbol, 0.0, 0.0))
+                self._holdings[symbol] = holding
+            position = holding.position
+            self._add(holding, -1)
+            if quantity > 0:
+                position.avg_cost = (position.quantity * position.avg_cost + quantity * price) / (
+                    position.quantity + quantity)
+            else:
+                position.realized += -quantity * (price - position.avg_cost)
+            position.quantity += quantity
+            if abs(position.quantity) < 1e-9:
+                position.quantity = 0.0
+            self._mark(holding, quote)
+            holding.reprice()
+            self._add(holding, 1)
+            self.revision += 1
+            self._adjusted(1)
+        self.store.save(self.name, position)
+        return position
+
+    def revalue(self):
+        """Mark every holding to the cached quotes; returns how many holdings changed"""
+        quotes = self._cache().get_many(self.symbols())
+        changed = 0
+        with self._lock:
+            for symbol, quote in quotes.items():
+                holding = self._holdings.get(symbol)
+                if holding is None or quote is None or quote.version == holding.version:
+                    continue
+                self._add(holding, -1)
+                self._mark(holding, quote)
+                holding.reprice()
+                self._add(holding, 1)
+                changed += 1
+            if changed:
+                self.revision += 1
+                self.marks += changed
+                self._adjusted(changed)
+        return changed
+
+    def summary(self):
+        with self._lock:
+            previous_value = self.market_value - self.day_change
+            return {
+                "positions": self.open_positions,
+                "market_value": self.market_value,
+                "cost_basis": self.cost,
+                "unrealized": self.unrealized,
+                "unrealized_percent": self.unrealized / self.cost * 100 if self.cost else 0.0,
+                "day_change": self.day_change,
+                "day_change_percent": self.day_change / previous_value * 100 if previous_value else 0.0,
+                "realized": self.realized,
+            }
+
+    def table(self):
+        """Open positions as a DataFrame, rebuilt only when something changed since the last call"""
+        revision, frame = self._table
+        if revision == self.revision and frame is not None:
+            return frame
+        import pandas as pd
+
+        with self._lock:
+            revision = self.revision
+            total = self.market_value
+            rows = [
+                (holding.position.symbol, holding.position.quantity, holding.position.avg_cost, holding.price,
+                 holding.market_value, holding.unrealized,
+                 holding.unrealized / holding.cost * 100 if holding.cost else 0.0,
+                 holding.day_change, holding.market_value / total * 100 if total else 0.0)
+                for holding in self._holdings.values() if holding.position.quantity
+            ]
+        frame = pd.DataFrame(rows, columns=PORTFOLIO_COLUMNS).sort_values("market_value", ascending=False,
+                                                                         ignore_index=True)
+        self._table = (revision, frame)
+        return frame
+
+    def _mark(self, holding, quote):
+        if quote is not None:
+            holding.version = quote.version
+            holding.price = quote.price
+            holding.change = quote.change
+
+    def _add(self, holding, sign):
+        self.market_value += sign * holding.market_value
+        self.cost += sign * holding.cost
+        self.unrealized += sign * holding.unrealized
+        self.day_change += sign * holding.day_change
+        self.realized += sign * holding.position.realized
+        self.open_positions += sign * (holding.position.quantity != 0)
+
+    def _adjusted(self, count):
+        self._adjustments += count
+        if self._adjustments >= RETOTAL_UPDATES:
+            self._retotal()
+
+    def _retotal(self):
+        holdings = self._holdings.values()
+        self.market_value = math.fsum(holding.market_value for holding in holdings)
+        self.cost = math.fsum(holding.cost for holding in holdings)
+        self.unrealized = math.fsum(holding.unrealized for holding in holdings)
+        self.day_change = math.fsum(holding.day_change for holding in holdings)
+        self.realized = math.fsum(holding.position.realized for holding in holdings)
+        self.open_positions = sum(holding.position.quantity != 0 for holding in holdings)
+        self._adjustments = 0
+
+    def _cache(self):
+        if self.cache is None:
+            from stock_tracker.quote_cache import get_quote_cache
+
+            self.cache = get_quote_cache()
+        return self.cache
+
+
+_store = None
+_portfolios = {}
+_portfolios_lock = threading.Lock()
+
+
+def get_portfolio(name=DEFAULT_PORTFOLIO, create=True):
+    """Portfolio loaded once per process from the database at STOCK_PORTFOLIO_DB
+
+    With create=False a portfolio without positions is returned but not kept,
+    so sessions that only look at the (empty) portfolio hold no memory.
+    """
+    global _store
+    portfolio = _portfolios.get(name)
+    if portfolio is None:
+        with _portfolios_lock:
+            if _store is None:
+                _store = PortfolioStore(os.environ.get("STOCK_PORTFOLIO_DB", DEFAULT_PORTFOLIO_DB))
+            portfolio = _portfolios.get(name)
+            if portfolio is None:
+                portfolio = Portfolio(name, _store)
+                if create or portfolio.symbols():
+                    _portfolios[name] = portfolio
+    return portfolio
+
+
+def release_portfolio(name, delete=False):
+    """Unload a portfolio whose session ended, also deleting its positions if delete is set"""
+    with _portfolios_lock:
+        _portfolios.pop(name, None)
+        store = _store
+    if delete and store is not None:
+        store.delete(name)
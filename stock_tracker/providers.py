@@ -0,0 +1,383 @@
+"""
+Quote Providers - Upstream market data sources behind the quote cache
+"""
+
+import asyncio
+import math
+import os
+import random
+import time
+
+from stock_tracker.quote_store import quote_store
+
+# Fields refreshed together, each group with its own cache TTL
+FIELD_GROUPS = {
+    "price": ("price", "change", "change_percent", "volume"),
+    "market_cap": ("market_cap",),
+    "fundamentals": ("pe_ratio", "recommendation"),
+}
+ALL_GROUPS = tuple(FIELD_GROUPS)
+
+
+class QuoteProvider:
+    """Base class for upstream quote sources
+
+    fetch() returns a dict holding the fields of the requested groups (plus
+    "name" when the source knows it), or None when the symbol is unknown.
+    """
+    name = "base"
+    # Whether an empty fetch_history() means there were no bars, rather than
+    # possibly a failed or throttled request
+    confirms_empty_history = False
+
+    def __init__(self):
+        self.calls = 0
+
+    def fetch(self, symbol, groups=ALL_GROUPS):
+        raise NotImplementedError
+
+    async def afetch(self, symbol, groups=ALL_GROUPS):
+        """Async fetch; blocking sources run in a worker thread unless they override this"""
+        return await asyncio.to_thread(self.fetch, symbol, groups)
+
+    async def afetch_many(self, symbols, groups=ALL_GROUPS):
+        return await asyncio.to_thread(self.fetch_many, symbols, groups)
+
+    def fetch_many(self, symbols, groups=ALL_GROUPS):
+        """Fetch several symbols; returns {symbol: fields} for the symbols found
+
+        Sources that support multi-symbol requests override this with a single
+        upstream call. Groups a source cannot fill in bulk may be left out of
+        the returned fields; the cache treats them as stale.
+        """
+        results = {}
+        for symbol in symbols:
+            fields = self.fetch(symbol, groups)
+            if fields is not None:
+                results[symbol] = fields
+        return results
+
+    def fetch_history(self, symbol, start, end, interval="1d"):
+        """OHLCV bars with start <= ts < end as a BAR_DTYPE array, oldest first"""
+        raise NotImplementedError
+
+
+class DemoQuoteProvider(QuoteProvider):
+    """Serves the built-in demo quotes, optionally with simulated latency"""
+    name = "demo"
+    confirms_empty_history = True
+
+    def __init__(self, store=quote_store, latency=0.0):
+        super().__init__()
+        self.store = store
+        self.latency = latency
+
+    def fetch(self, symbol, groups=ALL_GROUPS):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        return self._fields(symbol, groups)
+
+    async def afetch(self, symbol, groups=ALL_GROUPS):
+        self.calls += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self._fields(symbol, groups)
+
+    def fetch_history(self, symbol, start, end, interval="1d"):
+        """Deterministic synthetic bars around the demo price, one session per business day
+
+        Prices are a pure function of (symbol, ts), so ranges fetched separately
+        line up exactly when the history store stitches them together.
+        """
+        import numpy as np
+
+        from stock_tracker.history_store import BAR_DTYPE, INTERVAL_SECONDS
+
+        self.calls += 1
+        quote = self.store.get(symbol)
+        if quote is None:
+            return np.empty(0, dtype=BAR_DTYPE)
+        step = INTERVAL_SECONDS[interval]
+        days = np.arange(np.datetime64(int(start) // 86400, "D"), np.datetime64(int(end) // 86400 + 1, "D"))
+        days = days[np.is_busday(days)]
+        # Sessions open at 14:30 UTC and run 6.5 hours
+        opens = days.astype("datetime64[s]").astype(np.int64) + 14 * 3600 + 1800
+        if step >= 86400:
+            ts = opens
+        else:
+            ts = (opens[:, None] + np.arange(0, 23400, step)[None, :]).ravel()
+        ts = ts[(ts >= start) & (ts < end)]
+
+        seed = sum(map(ord, symbol))
+        days_elapsed = ts / 86400.0
+        close = quote.price * np.exp(0.12 * np.sin(days_elapsed / 97.0 + seed)
+                                     + 0.04 * np.sin(days_elapsed / 13.0 + seed / 3.0)
+                                     + 0.01 * _noise(ts, seed))
+        open_ = close * np.exp(0.004 * _noise(ts, seed + 1))
+        bars = np.empty(len(ts), dtype=BAR_DTYPE)
+        bars["ts"] = ts
+        bars["open"] = open_.round(2)
+        bars["close"] = close.round(2)
+        bars["high"] = (np.maximum(open_, close) * (1 + 0.003 * np.abs(_noise(ts, seed + 2)))).round(2)
+        bars["low"] = (np.minimum(open_, close) * (1 - 0.003 * np.abs(_noise(ts, seed + 3)))).round(2)
+        bars_per_day = 23400 // step if step < 86400 else 1
+        bars["volume"] = (quote.volume / bars_per_day * (1 + 0.5 * _noise(ts, seed + 4))).astype(np.int64)
+        return bars
+
+    def _fields(self, symbol, groups):
+        quote = self.store.get(symbol)
+        if quote is None:
+            return None
+        fields = {"name": quote.name}
+        for group in groups:
+            for field in FIELD_GROUPS[group]:
+                fields[field] = getattr(quote, field)
+        return fields
+
+
+class YFinanceQuoteProvider(QuoteProvider):
+    """Live quotes from Yahoo Finance via yfinance"""
+    name = "yfinance"
+
+    # yfinance recommendationKey -> UI recommendation
+    RECOMMENDATIONS = {
+        "strong_buy": "BUY",
+        "buy": "BUY",
+        "hold": "HOLD",
+        "underperform": "SELL",
+        "sell": "SELL",
+    }
+    # Longest span Yahoo serves per history request, in days
+    MAX_REQUEST_DAYS = {"1m": 7}
+
+    def fetch(self, symbol, groups=ALL_GROUPS):
+        import yfinance as yf
+
+        self.calls += 1
+        ticker = yf.Ticker(symbol)
+        fields = {}
+        if "price" in groups or "market_cap" in groups:
+            try:
+                fast = ticker.fast_info
+                price = fast["lastPrice"]
+                previous_close = fast["previousClose"]
+            except KeyError:
+                return None
+            if price is None or math.isnan(price):
+                return None
+            if "price" in groups:
+                change = price - previous_close
+                fields["price"] = float(price)
+                fields["change"] = float(change)
+                fields["change_percent"] = float(change / previous_close * 100) if previous_close else 0.0
+                fields["volume"] = int(fast["lastVolume"] or 0)
+            if "market_cap" in groups:
+                fields["market_cap"] = float(fast["marketCap"] or 0)
+        if "fundamentals" in groups:
+            info = ticker.info or {}
+            if not fields and not info.get("shortName"):
+                return None
+            fields["name"] = info.get("shortName") or symbol
+            fields["pe_ratio"] = float(info.get("trailingPE") or math.nan)
+            fields["recommendation"] = self.RECOMMENDATIONS.get(info.get("recommendationKey"), "HOLD")
+        return fields
+
+    def fetch_many(self, symbols, groups=ALL_GROUPS):
+        """Price data for every symbol from one multi-ticker download
+
+        Market cap and fundamentals have no bulk endpoint in yfinance, so they
+        are left for the cache to refresh per symbol in the background.
+        """
+        import yfinance as yf
+
+        self.calls += 1
+        data = yf.download(list(symbols), period="5d", interval="1d", auto_adjust=False,
+                           group_by="column", progress=False, threads=True)
+        if data is None or data.empty:
+            return {}
+        closes = data["Close"].ffill()
+        volumes = data["Volume"].fillna(0)
+        last = closes.iloc[-1]
+        previous = closes.iloc[-2] if len(closes) > 1 else last
+        change = last - previous
+        change_percent = (change / previous * 100).fillna(0.0)
+        results = {}
+        for symbol in last.dropna().index:
+            results[symbol] = {
+                "price": float(last[symbol]),
+                "change": float(change[symbol]),
+                "change_percent": float(change_percent[symbol]),
+                "volume": int(volumes[symbol].iloc[-1]),
+            }
+        return results
+
+    def fetch_history(self, symbol, start, end, interval="1d"):
+        import numpy as np
+        import pandas as pd
+        import yfinance as yf
+
+        from stock_tracker.history_store import bars_from_frame, empty_bars
+
+        ticker = yf.Ticker(symbol)
+        start, end = int(start), int(end)
+        step = self.MAX_REQUEST_DAYS[interval] * 86400 if interval in self.MAX_REQUEST_DAYS else max(end - start, 1)
+        chunks = []
+        for chunk_start in range(start, end, step):
+            self.calls += 1
+            frame = ticker.history(start=pd.Timestamp(chunk_start, unit="s", tz="UTC"),
+                                   end=pd.Timestamp(min(chunk_start + step, end), unit="s", tz="UTC"),
+                                   interval=interval, auto_adjust=False)
+            chunks.append(bars_from_frame(frame))
+        bars = np.concatenate(chunks) if chunks else empty_bars()
+        return bars[(bars["ts"] >= start) & (bars["ts"] < end)]
+
+
+class HttpQuoteProvider(QuoteProvider):
+    """Quotes from the backend REST API over pooled keep-alive HTTP connections
+
+    Expects GET {base_url}/quote/{symbol}?groups=... returning the fields as
+    JSON (404 for unknown symbols) and GET {base_url}/quotes?symbols=...&groups=...
+    returning {symbol: fields}. The async path shares one aiohttp session per
+    event loop; the blocking path shares one requests session.
+    """
+    name = "http"
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+    # Symbols per /quotes request (the backend's MAX_BATCH_SYMBOLS)
+    BATCH_SIZE = 200
+
+    def __init__(self, base_url=None, timeout=5.0, connect_timeout=2.0, max_connections=100,
+                 max_connections_per_host=20, retries=3, backoff=0.2):
+        super().__init__()
+        self.base_url = (base_url or os.environ.get("STOCK_API_URL", "http://127.0.0.1:8000")).rstrip("/")
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.max_connections = max_connections
+        self.max_connections_per_host = max_connections_per_host
+        self.retries = retries
+        self.backoff = backoff
+        self.retried = 0
+        self._session = None
+        self._session_loop = None
+        self._sync_session = None
+
+    def fetch(self, symbol, groups=ALL_GROUPS):
+        self.calls += 1
+        return self._get_json(f"/quote/{symbol}", {"groups": ",".join(groups)})
+
+    def fetch_many(self, symbols, groups=ALL_GROUPS):
+        results = {}
+        for batch in self._batches(symbols):
+            self.calls += 1
+            results.update(self._get_json("/quotes", {"symbols": ",".join(batch), "groups": ",".join(groups)}) or {})
+        return results
+
+    async def afetch(self, symbol, groups=ALL_GROUPS):
+        self.calls += 1
+        return await self._aget_json(f"/quote/{symbol}", {"groups": ",".join(groups)})
+
+    async def afetch_many(self, symbols, groups=ALL_GROUPS):
+        batches = self._batches(symbols)
+        self.calls += len(batches)
+        found = await asyncio.gather(*(
+            self._aget_json("/quotes", {"symbols": ",".join(batch), "groups": ",".join(groups)})
+            for batch in batches
+        ))
+        return {symbol: fields for batch in found for symbol, fields in (batch or {}).items()}
+
+    def fetch_history(self, symbol, start, end, interval="1d"):
+        """GET {base_url}/history/{symbol} returning {"ts": [...], "open": [...], ...} columns"""
+        from stock_tracker.history_store import bars_from_columns, empty_bars
+
+        self.calls += 1
+        columns = self._get_json(f"/history/{symbol}", {"start": int(start), "end": int(end), "interval": interval})
+        return empty_bars() if columns is None else bars_from_columns(columns)
+
+    async def aclose(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _batches(self, symbols):
+        symbols = list(symbols)
+        return [symbols[i:i + self.BATCH_SIZE] for i in range(0, len(symbols), self.BATCH_SIZE)]
+
+    def _backoff_delay(self, attempt):
+        # Exponential backoff with jitter so retries from many callers spread out
+        return self.backoff * (2 ** attempt) * (0.5 + random.random() / 2)
+
+    async def _get_session(self):
+        import aiohttp
+
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            connector = aiohttp.TCPConnector(limit=self.max_connections,
+                                             limit_per_host=self.max_connections_per_host,
+                                             keepalive_timeout=30)
+            timeout = aiohttp.ClientTimeout(total=self.timeout, connect=self.connect_timeout)
+            self._session = aiohttp.ClientSession(connector=connector, timeout=timeout,
+                                                  raise_for_status=False)
+            self._session_loop = loop
+        return self._session
+
+    async def _aget_json(self, path, params):
+        import aiohttp
+
+        session = await self._get_session()
+        for attempt in range(self.retries + 1):
+            try:
+                async with session.get(self.base_url + path, params=params) as response:
+                    if response.status == 404:
+                        return None
+                    # Other client errors would fail the same way again, so only listed statuses retry
+                    if response.status not in self.RETRY_STATUSES or attempt >= self.retries:
+                        response.raise_for_status()
+                        return await response.json()
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if attempt >= self.retries:
+                    raise
+            self.retried += 1
+            await asyncio.sleep(self._backoff_delay(attempt))
+
+    def _get_json(self, path, params):
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        if self._sync_session is None:
+            retry = Retry(total=self.retries, backoff_factor=self.backoff,
+                          status_forcelist=self.RETRY_STATUSES, allowed_methods=("GET",))
+            adapter = HTTPAdapter(pool_connections=self.max_connections_per_host,
+                                  pool_maxsize=self.max_connections_per_host, max_retries=retry)
+            session = requests.Session()
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self._sync_session = session
+        response = self._sync_session.get(self.base_url + path, params=params,
+                                          timeout=(self.connect_timeout, self.timeout))
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        return response.json()
+
+
+def _noise(ts, seed):
+    """Repeatable pseudo-random values in [-1, 1) keyed on bar timestamps"""
+    import numpy as np
+
+    return (np.sin(ts * 1e-4 * 12.9898 + seed * 78.233) * 43758.5453) % 1.0 * 2 - 1
+
+
+PROVIDERS = {
+    DemoQuoteProvider.name: DemoQuoteProvider,
+    YFinanceQuoteProvider.name: YFinanceQuoteProvider,
+    HttpQuoteProvider.name: HttpQuoteProvider,
+}
+
+
+def create_provider(name=None):
+    """Build the provider named by STOCK_DATA_PROVIDER (defaults to demo data)"""
+    name = (name or os.environ.get("STOCK_DATA_PROVIDER", "demo")).lower()
+    if name not in PROVIDERS:
+        raise ValueError(f"Unknown data provider '{name}' (expected one of: {', '.join(PROVIDERS)})")
+    return PROVIDERS[name]()
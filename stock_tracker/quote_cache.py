@@ -0,0 +1,390 @@
+"""
+Quote Cache - Size-bounded LRU cache with per-field TTLs in front of a provider
+"""
+
+import asyncio
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+
+from stock_tracker.providers import ALL_GROUPS, FIELD_GROUPS, create_provider
+from stock_tracker.quote_store import Quote, next_version
+from stock_tracker.singleflight import AsyncSingleFlight, SingleFlight
+from stock_tracker.telemetry import timed
+
+# Seconds before each field group is considered stale
+DEFAULT_TTLS = {
+    "price": 15.0,
+    "market_cap": 300.0,
+    "fundamentals": 3600.0,
+}
+
+# Unknown symbols are remembered briefly so typos don't hammer upstream
+NEGATIVE_TTL = 60.0
+
+
+class _Entry:
+    __slots__ = ("quote", "fetched_at")
+
+    def __init__(self, quote, fetched_at):
+        self.quote = quote
+        self.fetched_at = fetched_at
+
+
+class QuoteCache:
+    """LRU quote cache that serves stale fields while refreshing them in the background"""
+
+    def __init__(self, provider, max_size=1024, ttls=None, negative_ttl=NEGATIVE_TTL,
+                 clock=time.monotonic, refresh_workers=4):
+        self.provider = provider
+        self.max_size = max_size
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.negative_ttl = negative_ttl
+        self.clock = clock
+        self.refresh_workers = refresh_workers
+        self._entries = OrderedDict()
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._flight = SingleFlight()
+        self._aflight = AsyncSingleFlight()
+        self._executor = None
+        self._tasks = set()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.refresh_errors = 0
+        self.evictions = 0
+
+    def get(self, symbol):
+        """Return the cached quote for a normalized symbol, fetching it on a miss"""
+        found, quote = self._lookup(symbol, self._submit_refresh)
+        if found:
+            return quote
+        return self._load(symbol, ALL_GROUPS)
+
+    def get_cached(self, symbol):
+        """(found, quote or None) without waiting on upstream; stale quotes refresh in the background"""
+        return self._lookup(symbol, self._submit_refresh)
+
+    async def aget(self, symbol):
+        """Async get(): hits return without awaiting; misses and refreshes use provider.afetch()"""
+        found, quote = self._lookup(symbol, self._schedule_refresh)
+        if found:
+            return quote
+        # Concurrent misses for the same symbol await one upstream fetch
+        return await self._aflight.do(symbol, self._afetch_and_store, symbol, ALL_GROUPS)
+
+    def get_many(self, symbols):
+        """Return {symbol: quote or None} for normalized symbols, batching all misses
+
+        Every symbol that is not cached is resolved with one provider.fetch_many()
+        call instead of one upstream request per symbol; stale symbols are
+        served as they are and refreshed in background fetch_many() batches.
+        """
+        now = self.clock()
+        results = {}
+        missing = []
+        stale_batches = {}
+        with self._lock:
+            for symbol in symbols:
+                entry = self._entries.get(symbol)
+                if entry is not None and (entry.quote is not None
+                                          or now - entry.fetched_at["price"] < self.negative_ttl):
+                    self._entries.move_to_end(symbol)
+                    results[symbol] = entry.quote
+                    stale = self._stale_groups(entry, now) if entry.quote is not None else ()
+                    if not stale:
+                        self.hits += 1
+                        continue
+                    self.stale_hits += 1
+                    if symbol not in self._refreshing:
+                        self._refreshing.add(symbol)
+                        stale_batches.setdefault(stale, []).append(symbol)
+                else:
+                    self.misses += 1
+                    missing.append(symbol)
+        self._submit_batches(stale_batches)
+        if missing:
+            with timed("provider"):
+                fetched = self.provider.fetch_many(missing, ALL_GROUPS)
+            for symbol in missing:
+                self._store(symbol, fetched.get(symbol))
+                results[symbol] = self.peek(symbol)
+        return results
+
+    async def aget_many(self, symbols):
+        """Async get_many(): hits return without awaiting, all misses share one provider.afetch_many()"""
+        results = {}
+        missing = []
+        for symbol in symbols:
+            found, quote = self._lookup(symbol, self._schedule_refresh)
+            if found:
+                results[symbol] = quote
+            else:
+                missing.append(symbol)
+        if missing:
+            key = ("batch",) + tuple(sorted(missing))
+            results.update(await self._aflight.do(key, self._afetch_many_and_store, missing))
+        return results
+
+    def get_cached_many(self, symbols):
+        """Return {symbol: quote} for the symbols already cached, never waiting on upstream
+
+        Stale symbols are refreshed in background fetch_many() batches; symbols
+        not cached yet are left out and fetched with one background fetch_many().
+        """
+        results = {}
+        missing = []
+        stale_batches = {}
+
+        def refresh_later(symbol, groups):
+            stale_batches.setdefault(groups, []).append(symbol)
+
+        for symbol in symbols:
+            found, quote = self._lookup(symbol, refresh_later)
+            if not found:
+                missing.append(symbol)
+            elif quote is not None:
+                results[symbol] = quote
+        self._submit_batches(stale_batches)
+        with self._lock:
+            missing = [symbol for symbol in missing if symbol not in self._refreshing]
+            self._refreshing.update(missing)
+        if missing:
+            self._submit(self._load_many, missing)
+        return results
+
+    def peek(self, symbol):
+        """Return whatever is cached for a symbol without fetching or touching LRU order"""
+        entry = self._entries.get(symbol)
+        return entry.quote if entry is not None else None
+
+    def quotes(self):
+        """Every cached quote (known symbols only), without fetching"""
+        with self._lock:
+            return [entry.quote for entry in self._entries.values() if entry.quote is not None]
+
+    def invalidate(self, symbol):
+        with self._lock:
+            self._entries.pop(symbol, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Hit/miss counters for monitoring"""
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "hit_ratio": (self.hits + self.stale_hits) / lookups if lookups else 0.0,
+            "refreshes": self.refreshes,
+            "refresh_errors": self.refresh_errors,
+            "evictions": self.evictions,
+            "coalesced": self._flight.coalesced + self._aflight.coalesced,
+        }
+
+    def _lookup(self, symbol, refresh):
+        """(found, quote) from the cache; stale groups are handed to refresh()"""
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get(symbol)
+            if entry is not None:
+                if entry.quote is None:
+                    if now - entry.fetched_at["price"] < self.negative_ttl:
+                        self._entries.move_to_end(symbol)
+                        self.hits += 1
+                        return True, None
+                else:
+                    self._entries.move_to_end(symbol)
+                    stale = self._stale_groups(entry, now)
+                    if not stale:
+                        self.hits += 1
+                        return True, entry.quote
+                    self.stale_hits += 1
+                    if symbol not in self._refreshing:
+                        self._refreshing.add(symbol)
+                        refresh(symbol, stale)
+                    return True, entry.quote
+            self.misses += 1
+        return False, None
+
+    def _stale_groups(self, entry, now):
+        return tuple(group for group, fetched_at in entry.fetched_at.items()
+                     if now - fetched_at >= self.ttls[group])
+
+    def _load(self, symbol, groups):
+        # Concurrent misses for the same symbol share one upstream fetch
+        return self._flight.do(symbol, self._fetch_and_store, symbol, groups)
+
+    def _fetch_and_store(self, symbol, groups):
+        with timed("provider"):
+            fields = self.provider.fetch(symbol, groups)
+        self._store(symbol, fields)
+        return self.peek(symbol)
+
+    async def _afetch_and_store(self, symbol, groups):
+        with timed("provider"):
+            fields = await self.provider.afetch(symbol, groups)
+        self._store(symbol, fields)
+        return self.peek(symbol)
+
+    async def _afetch_many_and_store(self, symbols):
+        with timed("provider"):
+            fetched = await self.provider.afetch_many(symbols, ALL_GROUPS)
+        for symbol in symbols:
+            self._store(symbol, fetched.get(symbol))
+        return {symbol: self.peek(symbol) for symbol in symbols}
+
+    def _store(self, symbol, fields):
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get(symbol)
+            if fields is None:
+                if entry is None or entry.quote is None:
+                    self._entries[symbol] = _Entry(None, {"price": now})
+            else:
+                # Groups the provider did not return stay (or start out) stale
+                if entry is None or entry.quote is None:
+                    entry = _Entry(_new_quote(symbol, fields), dict.fromkeys(ALL_GROUPS, -math.inf))
+                    self._entries[symbol] = entry
+                elif _changes(entry.quote, fields):
+                    # Versions key render memos and rescoring, so an unchanged refetch keeps its version
+                    entry.quote = replace(entry.quote, version=next_version(), **fields)
+                for group, group_fields in FIELD_GROUPS.items():
+                    if group_fields[0] in fields:
+                        entry.fetched_at[group] = now
+            self._entries.move_to_end(symbol)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def _submit(self, fn, *args):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.refresh_workers,
+                                                thread_name_prefix="quote-refresh")
+        self._executor.submit(fn, *args)
+
+    def _submit_refresh(self, symbol, groups):
+        self._submit(self._refresh, symbol, groups)
+
+    def _submit_batches(self, stale_batches):
+        # One upstream request per set of stale groups rather than one per symbol
+        for groups, symbols in stale_batches.items():
+            self._submit(self._refresh_many, symbols, groups)
+
+    def _schedule_refresh(self, symbol, groups):
+        task = asyncio.get_running_loop().create_task(self._arefresh(symbol, groups))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _refresh(self, symbol, groups):
+        try:
+            with timed("provider"):
+                fields = self.provider.fetch(symbol, groups)
+            self._finish_refresh(symbol, fields)
+        except Exception:
+            # Keep serving the stale quote; the next lookup retries
+            with self._lock:
+                self.refresh_errors += 1
+        finally:
+            with self._lock:
+                self._refreshing.discard(symbol)
+
+    async def _arefresh(self, symbol, groups):
+        try:
+            with timed("provider"):
+                fields = await self.provider.afetch(symbol, groups)
+            self._finish_refresh(symbol, fields)
+        except Exception:
+            with self._lock:
+                self.refresh_errors += 1
+        finally:
+            with self._lock:
+                self._refreshing.discard(symbol)
+
+    def _refresh_many(self, symbols, groups):
+        try:
+            with timed("provider"):
+                fetched = self.provider.fetch_many(symbols, groups)
+            for symbol in symbols:
+                self._finish_refresh(symbol, fetched.get(symbol))
+        except Exception:
+            with self._lock:
+                self.refresh_errors += 1
+        finally:
+            with self._lock:
+                self._refreshing.difference_update(symbols)
+
+    def _load_many(self, symbols):
+        try:
+            with timed("provider"):
+                fetched = self.provider.fetch_many(symbols, ALL_GROUPS)
+            for symbol in symbols:
+                self._store(symbol, fetched.get(symbol))
+        except Exception:
+            # Nothing cached to fall back on; the next lookup retries
+            with self._lock:
+                self.refresh_errors += 1
+        finally:
+            with self._lock:
+                self._refreshing.difference_update(symbols)
+
+    def _finish_refresh(self, symbol, fields):
+        if fields is not None:
+            self._store(symbol, fields)
+        with self._lock:
+            self.refreshes += 1
+
+
+def _changes(quote, fields):
+    """Whether fields differ from the quote's values (NaN matches NaN)"""
+    for field, value in fields.items():
+        current = getattr(quote, field)
+        if current != value and not (current != current and value != value):
+            return True
+    return False
+
+
+def _new_quote(symbol, fields):
+    defaults = {
+        "name": symbol,
+        "price": 0.0,
+        "change": 0.0,
+        "change_percent": 0.0,
+        "volume": 0,
+        "market_cap": math.nan,
+        "pe_ratio": math.nan,
+    }
+    return Quote(symbol=symbol, version=next_version(), **{**defaults, **fields})
+
+
+_quote_cache = None
+_quote_cache_lock = threading.Lock()
+
+
+def get_quote_cache():
+    """Process-wide quote cache shared by the UI handlers"""
+    global _quote_cache
+    if _quote_cache is None:
+        with _quote_cache_lock:
+            if _quote_cache is None:
+                _quote_cache = QuoteCache(create_provider(),
+                                          max_size=int(os.environ.get("STOCK_QUOTE_CACHE_SIZE", 1024)))
+    return _quote_cache
+
+
+def set_quote_cache(cache):
+    """Install the process-wide cache, e.g. one whose provider reads through a shared store"""
+    global _quote_cache
+    with _quote_cache_lock:
+        _quote_cache = cache
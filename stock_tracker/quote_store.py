@@ -0,0 +1,92 @@
+"""
+Quote Store - In-process quote records keyed by symbol
+"""
+
+import itertools
+import math
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True, slots=True)
+class Quote:
+    """Immutable snapshot of a single symbol's market data"""
+    symbol: str
+    name: str
+    price: float
+    change: float
+    change_percent: float
+    volume: int
+    market_cap: float
+    pe_ratio: float
+    recommendation: str = "HOLD"
+    version: int = 0
+
+
+_versions = itertools.count(1)
+
+
+def next_version():
+    """Process-wide monotonically increasing quote version, used to key render memos"""
+    return next(_versions)
+
+
+def format_compact(value):
+    """Format a large number the way the UI shows it (45.2M, 2.95T, 793B)"""
+    if math.isnan(value):
+        return "N/A"
+    for threshold, suffix in ((1e12, "T"), (1e9, "B"), (1e6, "M"), (1e3, "K")):
+        if abs(value) >= threshold:
+            scaled = value / threshold
+            break
+    else:
+        scaled, suffix = value, ""
+    if abs(scaled) >= 100:
+        return f"{scaled:.0f}{suffix}"
+    if abs(scaled) >= 10:
+        return f"{scaled:.1f}{suffix}"
+    return f"{scaled:.2f}{suffix}"
+
+
+class QuoteStore:
+    """Symbol -> Quote mapping shared by every handler in the process"""
+    __slots__ = ("_quotes", "_symbols")
+
+    def __init__(self, quotes=()):
+        self._quotes = {}
+        self._symbols = ()
+        for quote in quotes:
+            self.put(quote)
+
+    def get(self, symbol):
+        """Return the stored quote for an already-normalized symbol, or None"""
+        return self._quotes.get(symbol)
+
+    def put(self, quote):
+        """Insert or replace the quote for its symbol"""
+        if quote.symbol not in self._quotes:
+            self._symbols = self._symbols + (quote.symbol,)
+        self._quotes[quote.symbol] = quote
+
+    def symbols(self):
+        """Symbols in insertion order"""
+        return self._symbols
+
+    def __contains__(self, symbol):
+        return symbol in self._quotes
+
+    def __len__(self):
+        return len(self._quotes)
+
+
+# Demo data for popular stocks, built once at import time
+DEMO_QUOTES = (
+    Quote("AAPL", "Apple Inc.", 189.42, +2.35, +1.26, 45_200_000, 2.95e12, 28.5, "BUY"),
+    Quote("GOOGL", "Alphabet Inc.", 142.56, -1.23, -0.85, 28_700_000, 1.78e12, 24.2, "HOLD"),
+    Quote("MSFT", "Microsoft Corporation", 378.85, +5.67, +1.52, 32_100_000, 2.81e12, 31.8, "BUY"),
+    Quote("TSLA", "Tesla Inc.", 248.98, -8.45, -3.28, 67_400_000, 793e9, 45.7, "HOLD"),
+    Quote("NVDA", "NVIDIA Corporation", 891.23, +15.78, +1.80, 41_800_000, 2.20e12, 65.4, "BUY"),
+    Quote("AMZN", "Amazon.com Inc.", 156.78, +3.12, +2.03, 38_900_000, 1.64e12, 42.1, "BUY"),
+    Quote("META", "Meta Platforms Inc.", 298.45, -2.89, -0.96, 22_600_000, 756e9, 23.8, "HOLD"),
+)
+
+quote_store = QuoteStore(DEMO_QUOTES)
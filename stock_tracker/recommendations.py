@@ -0,0 +1,222 @@
+"""
+Recommendation Engine - Vectorized BUY/HOLD/SELL scoring from live quotes and indicators
+"""
+
+import math
+import threading
+from dataclasses import dataclass
+
+import numpy as np
+
+ACTIONS = ("SELL", "HOLD", "BUY")
+BUY_THRESHOLD = 0.2
+SELL_THRESHOLD = -0.2
+
+# Relative weight of each signal in the composite score (sums to 1)
+WEIGHTS = {
+    "momentum": 0.15,
+    "trend": 0.2,
+    "macd": 0.15,
+    "rsi": 0.15,
+    "valuation": 0.15,
+    "analyst": 0.2,
+}
+ANALYST_SCORES = {"BUY": 1.0, "HOLD": 0.0, "SELL": -1.0}
+
+# Seconds between batch rescoring passes over the tracked universe
+RESCORE_INTERVAL = 60.0
+
+
+@dataclass(frozen=True, slots=True)
+class Recommendation:
+    """Scored recommendation and the inputs (quote version, indicator bar) it was derived from"""
+    symbol: str
+    action: str
+    score: float
+    inputs: tuple
+
+
+def score(change_percent, pe_ratio, analyst, rsi, macd_hist, sma_fast, sma_slow):
+    """Composite score in [-1, 1] for arrays of inputs; missing indicators count as neutral"""
+    change_percent = np.asarray(change_percent, dtype=float)
+    pe_ratio = np.asarray(pe_ratio, dtype=float)
+    momentum = np.clip(change_percent / 3.0, -1.0, 1.0)
+    trend = np.nan_to_num(np.sign(np.asarray(sma_fast, dtype=float) - np.asarray(sma_slow, dtype=float)))
+    macd = np.nan_to_num(np.sign(np.asarray(macd_hist, dtype=float)))
+    # Mean reversion: oversold scores up, overbought scores down
+    rsi = np.nan_to_num(np.clip((50.0 - np.asarray(rsi, dtype=float)) / 20.0, -1.0, 1.0))
+    # Missing P/E (losses) scores like an expensive stock
+    valuation = np.select([pe_ratio < 15, pe_ratio < 25, pe_ratio < 40], [1.0, 0.5, 0.0], -0.5)
+    return (WEIGHTS["momentum"] * momentum
+            + WEIGHTS["trend"] * trend
+            + WEIGHTS["macd"] * macd
+            + WEIGHTS["rsi"] * rsi
+            + WEIGHTS["valuation"] * valuation
+            + WEIGHTS["analyst"] * np.asarray(analyst, dtype=float))
+
+
+def action_codes(scores):
+    """Index into ACTIONS for each score"""
+    scores = np.asarray(scores)
+    return (scores > SELL_THRESHOLD).astype(np.int8) + (scores >= BUY_THRESHOLD)
+
+
+def score_frame(frame):
+    """Add score and action columns to a quotes DataFrame that also holds indicator columns
+
+    Expects change_percent, pe_ratio and recommendation (analyst consensus)
+    plus rsi_14, macd_hist, sma_20 and sma_50; absent indicator columns are
+    treated as missing.
+    """
+    import pandas as pd
+
+    missing = pd.Series(math.nan, index=frame.index)
+    scores = score(
+        frame["change_percent"],
+        frame["pe_ratio"],
+        frame["recommendation"].map(ANALYST_SCORES).fillna(0.0),
+        frame.get("rsi_14", missing),
+        frame.get("macd_hist", missing),
+        frame.get("sma_20", missing),
+        frame.get("sma_50", missing),
+    )
+    return frame.assign(score=scores, action=pd.Categorical.from_codes(action_codes(scores), ACTIONS))
+
+
+def _inputs(quote, indicators):
+    return quote.version, None if indicators is None else indicators.ts
+
+
+class RecommendationEngine:
+    """Per-symbol recommendations rescored in vectorized batches when their inputs change
+
+    A background pass brings tracked indicator series up to date, then
+    rescores every cached quote whose version or latest indicator bar moved;
+    handlers call recommend(), which is a dictionary lookup unless that
+    symbol's inputs changed since the last pass.
+    """
+
+    def __init__(self, cache=None, indicators=None, interval=RESCORE_INTERVAL):
+        self.cache = cache
+        self.indicators = indicators
+        self.interval = interval
+        self._results = {}
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+        self.batches = 0
+        self.scored = 0
+        self.hits = 0
+
+    def get(self, symbol):
+        """Last computed recommendation for a symbol, or None"""
+        return self._results.get(symbol)
+
+    def recommend(self, quote, indicators=None):
+        """Recommendation for a quote, rescoring it only if its inputs changed"""
+        if self._thread is None:
+            self.start()
+        cached = self._results.get(quote.symbol)
+        if cached is not None and cached.inputs == _inputs(quote, indicators):
+            self.hits += 1
+            return cached
+        return self._score([quote], [indicators])[0]
+
+    def refresh(self):
+        """Batch pass over every cached symbol; returns how many were rescored"""
+        quotes = self._cache().quotes()
+        indicators = self._indicators()
+        # The indicator engine refreshes on its own too; this folds in bars completed since its last pass
+        indicators.refresh()
+        stale_quotes, stale_indicators = [], []
+        for quote in quotes:
+            snapshot = indicators.latest(quote.symbol)
+            cached = self._results.get(quote.symbol)
+            if cached is None or cached.inputs != _inputs(quote, snapshot):
+                stale_quotes.append(quote)
+                stale_indicators.append(snapshot)
+        if stale_quotes:
+            self._score(stale_quotes, stale_indicators)
+        tracked = {quote.symbol for quote in quotes}
+        with self._lock:
+            self.batches += 1
+            # Drop symbols the quote cache has evicted
+            for symbol in [symbol for symbol in self._results if symbol not in tracked]:
+                del self._results[symbol]
+        return len(stale_quotes)
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name="recommendation-engine", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join()
+
+    def stats(self):
+        return {"symbols": len(self._results), "batches": self.batches, "scored": self.scored, "hits": self.hits}
+
+    def _score(self, quotes, indicators):
+        def column(field):
+            return np.array([math.nan if snapshot is None else getattr(snapshot, field) for snapshot in indicators])
+
+        scores = score(
+            [quote.change_percent for quote in quotes],
+            [quote.pe_ratio for quote in quotes],
+            [ANALYST_SCORES.get(quote.recommendation, 0.0) for quote in quotes],
+            column("rsi_14"),
+            column("macd_hist"),
+            column("sma_20"),
+            column("sma_50"),
+        )
+        results = [
+            Recommendation(quote.symbol, ACTIONS[code], round(float(value), 4), _inputs(quote, snapshot))
+            for quote, snapshot, value, code in zip(quotes, indicators, scores, action_codes(scores))
+        ]
+        with self._lock:
+            self._results.update((result.symbol, result) for result in results)
+            self.scored += len(results)
+        return results
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            try:
+                self.refresh()
+            except Exception:
+                # Keep serving the previous results; try again next interval
+                pass
+
+    def _cache(self):
+        if self.cache is None:
+            from stock_tracker.quote_cache import get_quote_cache
+
+            self.cache = get_quote_cache()
+        return self.cache
+
+    def _indicators(self):
+        if self.indicators is None:
+            from stock_tracker.indicators import get_indicator_engine
+
+            self.indicators = get_indicator_engine()
+        return self.indicators
+
+
+_recommendation_engine = None
+_recommendation_engine_lock = threading.Lock()
+
+
+def get_recommendation_engine():
+    """Process-wide recommendation engine over the shared quote cache and indicators"""
+    global _recommendation_engine
+    if _recommendation_engine is None:
+        with _recommendation_engine_lock:
+            if _recommendation_engine is None:
+                _recommendation_engine = RecommendationEngine()
+    return _recommendation_engine
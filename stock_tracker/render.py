@@ -0,0 +1,533 @@
+"""
+Render Layer - Precompiled templates and memoized output for the UI cards and panels
+"""
+
+import math
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from functools import lru_cache
+
+from stock_tracker.alerts import ALERT_KINDS, ALERT_LABELS
+from stock_tracker.analytics import classify_quote
+from stock_tracker.quote_store import format_compact, quote_store
+
+# Display constants shared by the search handlers
+POPULAR_SYMBOLS = ", ".join(quote_store.symbols())
+REC_MAP = {
+    "BUY": "🟢 BUY",
+    "HOLD": "🟡 HOLD",
+    "SELL": "🔴 SELL"
+}
+UP_COLOR = "#10b981"
+DOWN_COLOR = "#ef4444"
+
+# Templates below are built once at import; only the {fields} change per render
+
+STOCK_REPORT_TEMPLATE = """📊 **Stock Analysis for {symbol}**
+
+## 📊 {name}
+
+### 💰 **Price Information**
+- **Current Price**: ${price:.2f}
+- **Daily Change**: {change_color} {change:+.2f} ({change_percent:+.2f}%)
+- **Volume**: {volume}
+
+### 📈 **Market Data**
+- **Market Cap**: ${market_cap}
+- **P/E Ratio**: {pe_ratio}
+- **Trend**: {trend}
+- **Volatility**: {vol_emoji} {volatility}
+
+### 🎯 **Investment Analysis** (Demo)
+- **Recommendation**: {rec_display}
+- **Risk Level**: {risk_level}
+- **Growth Potential**: {growth_potential}
+
+---
+
+✨ **Note**: This is demo data for testing purposes. 
+🚀 **Coming Soon**: Real-time data via MCP server connection!"""
+
+STOCK_REPORT_NOT_FOUND_TEMPLATE = """🔍 **Searching for {symbol}**...
+
+⚠️ **Demo Mode**: Currently showing sample data for popular stocks
+
+📝 **Available Demo Symbols**: 
+""" + POPULAR_SYMBOLS + """
+
+🔄 **Symbol Entered**: `{symbol}`
+📊 **Status**: Will be supported with real-time data in the next update!
+
+### 🚀 **What's Coming**:
+- Real-time data for **all** stock symbols
+- MCP server integration with live market feeds
+- Advanced technical analysis and indicators
+- Portfolio tracking and alerts
+
+**💡 Tip**: Try one of the available demo symbols above to see the full analysis interface!"""
+
+STOCK_INFO_TEMPLATE = """# 📊 {name} ({symbol})
+
+## 💰 Current Price: ${price:.2f}
+### {change_color} Daily Change: {change:+.2f} ({change_percent:+.2f}%)
+
+#### 📈 Market Data
+- **Volume**: {volume}
+- **Market Cap**: ${market_cap}
+- **P/E Ratio**: {pe_ratio}
+- **Trend**: {trend}
+"""
+
+ANALYSIS_INFO_TEMPLATE = """## 🎯 Investment Analysis
+
+### {rec_display}
+
+#### 📊 Key Metrics
+- **Risk Level**: {risk_level}
+- **Volatility**: {vol_emoji} {volatility}
+- **Growth Potential**: {growth_potential}
+
+*Note: This is demo data for testing purposes.*
+"""
+
+INDICATORS_TEMPLATE = """
+#### 📉 Technical Indicators ({as_of})
+- **RSI (14)**: {rsi} {rsi_label}
+- **MACD (12, 26, 9)**: {macd} (signal {macd_signal}) {macd_label}
+- **SMA 20 / 50**: {sma_20} / {sma_50}
+- **EMA 12 / 26**: {ema_12} / {ema_26}
+- **Bollinger (20, 2)**: {bb_lower} – {bb_upper} ({band_label})
+"""
+
+PORTFOLIO_SUMMARY_TEMPLATE = """### 💼 Portfolio Value: ${market_value:,.2f}
+- **Day Change**: {day_color} {day_change:+,.2f} ({day_change_percent:+.2f}%)
+- **Unrealized P&L**: {pnl_color} {unrealized:+,.2f} ({unrealized_percent:+.2f}%)
+- **Realized P&L**: {realized:+,.2f}
+- **Cost Basis**: ${cost_basis:,.2f} across {positions} open positions
+"""
+
+QUICK_STATS_TEMPLATE = """
+        <div class="compact-card">
+            <h4 style="margin: 0 0 0.75rem 0; font-size: 1rem;">⚡ Quick Stats</h4>
+            <div style="text-align: center;">
+                <div style="font-size: 1.4em; font-weight: bold; margin: 0.5rem 0; color: {color};">
+                    ${price:.2f}
+                </div>
+                <div style="margin: 0 0 0.75rem 0; color: {color}; font-size: 0.9rem;">
+                    {change:+.2f} ({change_percent:+.2f}%)
+                </div>
+                <div style="display: flex; justify-content: space-between; margin: 0.5rem 0; font-size: 0.85rem; color: #64748b;">
+                    <span><strong>Vol:</strong> {volume}</span>
+                    <span><strong>P/E:</strong> {pe_ratio}</span>
+                </div>
+                <div style="font-size: 0.85rem; color: #64748b;">
+                    <strong>Cap:</strong> ${market_cap}
+                </div>
+            </div>
+        </div>
+        """
+
+SEARCH_STATUS_FOUND_TEMPLATE = """
+        <div class="compact-card">
+            <h4 style="margin: 0 0 0.75rem 0; font-size: 1rem;">✅ Found</h4>
+            <div style="text-align: center;">
+                <div style="margin: 0.5rem 0; color: #10b981; font-weight: bold;">
+                    {symbol}
+                </div>
+                <div style="margin: 0 0 0.75rem 0; font-size: 0.85rem; color: #64748b;">
+                    Demo data loaded
+                </div>
+                <div style="font-size: 1.2em; margin: 0.5rem 0;">
+                    {rec_display}
+                </div>
+                <div style="font-size: 0.8rem; color: #64748b;">
+                    Real-time coming soon
+                </div>
+            </div>
+        </div>
+        """
+
+STOCK_INFO_NOT_FOUND_TEMPLATE = """# 🔍 Searching for {symbol}
+
+## ⚠️ Demo Mode Active
+
+Currently showing sample data for popular stocks only.
+
+### 📝 Available Demo Symbols:
+""" + POPULAR_SYMBOLS + """
+
+### 🔄 Symbol Entered: `{symbol}`
+This symbol will be supported with real-time data in the next update!
+"""
+
+DID_YOU_MEAN_TEMPLATE = """
+
+### 💡 Did you mean: {suggestions}?"""
+
+ANALYSIS_INFO_NOT_FOUND = """## 🚀 What's Coming
+
+### Real-time Features:
+- Live data for **all** stock symbols
+- MCP server integration with market feeds  
+- Advanced technical analysis
+- Portfolio tracking and alerts
+
+**💡 Tip**: Try one of the available demo symbols to see the full interface!
+"""
+
+# Rendered in the browser from live_tick_values(), so each streamed tick carries only changed fields
+LIVE_STATS_TEMPLATE = """
+        <div class="compact-card" style="${value ? '' : 'display: none;'}">
+            <h4 style="margin: 0 0 0.75rem 0; font-size: 1rem;">📡 Live Price</h4>
+            <div style="text-align: center;">
+                <div style="font-size: 1.4em; font-weight: bold; margin: 0.5rem 0; color: ${value?.color};">
+                    $${value?.price}
+                </div>
+                <div style="margin: 0 0 0.75rem 0; color: ${value?.color}; font-size: 0.9rem;">
+                    ${value?.change} (${value?.change_percent}%)
+                </div>
+                <div style="font-size: 0.85rem; color: #64748b;">
+                    <strong>Vol:</strong> ${value?.volume}
+                </div>
+            </div>
+        </div>
+        """
+
+QUICK_STATS_NOT_FOUND_TEMPLATE = """
+        <div class="compact-card">
+            <h4 style="margin: 0 0 0.75rem 0; font-size: 1rem;">📋 Symbol Status</h4>
+            <div style="text-align: center;">
+                <div style="font-size: 1.1em; font-weight: bold; margin: 0.5rem 0; color: #f59e0b;">
+                    {symbol}
+                </div>
+                <div style="margin: 0 0 0.75rem 0; color: #64748b; font-size: 0.85rem;">
+                    Not in demo data
+                </div>
+                <div style="font-size: 0.8rem; color: #64748b; line-height: 1.3;">
+                    Try: """ + POPULAR_SYMBOLS + """
+                </div>
+            </div>
+        </div>
+        """
+
+SEARCH_STATUS_NOT_FOUND = """
+        <div class="compact-card">
+            <h4 style="margin: 0 0 0.75rem 0; font-size: 1rem;">🔄 Status</h4>
+            <div style="text-align: center;">
+                <div style="margin: 0.5rem 0; color: #f59e0b; font-weight: bold;">
+                    Not Found
+                </div>
+                <div style="margin: 0 0 0.75rem 0; font-size: 0.85rem; color: #64748b;">
+                    Demo mode only
+                </div>
+                <div style="font-size: 0.8rem; color: #64748b;">
+                    Limited symbols available
+                </div>
+            </div>
+        </div>
+        """
+
+EMPTY_INPUT_STATUS = """
+        <div class="compact-card">
+            <h4 style="margin: 0 0 0.75rem 0; font-size: 1rem;">⚠️ Input Required</h4>
+            <p style="text-align: center; color: #ef4444; font-size: 0.9rem; margin: 0;">
+                Please enter a stock symbol
+            </p>
+        </div>
+        """
+SEARCH_STATUS_FETCHING_TEMPLATE = """
+        <div class="compact-card">
+            <h4 style="margin: 0 0 0.75rem 0; font-size: 1rem;">🔄 Status</h4>
+            <div style="text-align: center;">
+                <div style="margin: 0.5rem 0; color: #3b82f6; font-weight: bold;">
+                    {symbol}
+                </div>
+                <div style="font-size: 0.85rem; color: #64748b;">
+                    Fetching quote and history...
+                </div>
+            </div>
+        </div>
+        """
+
+EMPTY_INPUT_RESULTS = ("⚠️ Please enter a stock symbol!", "", EMPTY_INPUT_STATUS, EMPTY_INPUT_STATUS)
+
+MARKET_CARD_TEMPLATE = """
+    <div class="{card_class}">
+        <h4 style="margin: 0 0 0.75rem 0; font-size: 1rem;">🕐 Market Hours</h4>
+        <div style="text-align: center;">
+            <div style="font-size: 1.1em; font-weight: bold; margin: 0.5rem 0;">
+                {status}
+            </div>
+            <div style="font-size: 0.85rem; color: #64748b; margin: 0.5rem 0;">
+                {current_time}
+            </div>
+            <div style="font-size: 0.8rem; color: #64748b; line-height: 1.3;">
+                {next_session}
+            </div>
+        </div>
+    </div>
+    """
+
+SYSTEM_CARD_TEMPLATE = """
+    <div class="{card_class}">
+        <h4 style="margin: 0 0 0.75rem 0; font-size: 1rem;">⚡ System Status</h4>
+        <div style="text-align: center;">
+            <div style="font-size: 1.1em; font-weight: bold; margin: 0.5rem 0;">
+                {status}
+            </div>
+            <div style="font-size: 0.8rem; color: #64748b; margin: 0.25rem 0;">
+                API: {api_status}
+            </div>
+            <div style="font-size: 0.8rem; color: #64748b; margin: 0.25rem 0;">
+                Feed: {data_feed}
+            </div>
+            <div style="font-size: 0.8rem; color: #64748b; margin: 0.25rem 0;">
+                Response: {response_time}
+            </div>
+            <div style="font-size: 0.8rem; color: #64748b; margin: 0.25rem 0;">
+                Cache: {cache_hit_ratio} hits
+            </div>
+            <div style="font-size: 0.8rem; color: #64748b; margin: 0.25rem 0;">
+                Uptime: {uptime}
+            </div>
+        </div>
+    </div>
+    """
+
+TIMESTAMP_CARD_TEMPLATE = """
+    <div class="status-card">
+        <h4 style="margin: 0 0 0.75rem 0; font-size: 1rem;">🔄 Last Updated</h4>
+        <div style="text-align: center;">
+            <div style="font-size: 0.9em; font-weight: bold; margin: 0.5rem 0; color: #10b981;">
+                {current_time}
+            </div>
+            <div style="font-size: 0.75rem; color: #64748b;">
+                Auto-refresh every 30s
+            </div>
+        </div>
+    </div>
+    """
+
+
+class RenderMemo:
+    """Bounded LRU memo of rendered output keyed by (symbol, quote version, *extra inputs)"""
+
+    def __init__(self, max_size=2048):
+        self.max_size = max_size
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_render(self, quote, render, *args):
+        key = (quote.symbol, quote.version, *args)
+        with self._lock:
+            cached = self._items.get(key)
+            if cached is not None:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return cached
+            self.misses += 1
+        rendered = render(quote, *args)
+        with self._lock:
+            self._items[key] = rendered
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+        return rendered
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+
+stock_report_memo = RenderMemo()
+search_results_memo = RenderMemo()
+
+
+def format_ratio(value):
+    """P/E style ratio for display; missing values show as N/A"""
+    return "N/A" if math.isnan(value) else value
+
+
+def format_level(value, prefix=""):
+    return "N/A" if math.isnan(value) else f"{prefix}{value:,.2f}"
+
+
+def _quote_fields(quote, recommendation=None):
+    recommendation = recommendation or quote.recommendation
+    analysis = classify_quote(quote)
+    return {
+        "symbol": quote.symbol,
+        "name": quote.name,
+        "price": quote.price,
+        "change": quote.change,
+        "change_percent": quote.change_percent,
+        "change_color": "🟢" if quote.change > 0 else "🔴",
+        "volume": format_compact(quote.volume),
+        "market_cap": format_compact(quote.market_cap),
+        "pe_ratio": format_ratio(quote.pe_ratio),
+        "trend": f"{analysis.trend} {analysis.trend_emoji}",
+        "vol_emoji": analysis.vol_emoji,
+        "volatility": analysis.volatility,
+        "risk_level": analysis.risk_level,
+        "growth_potential": analysis.growth_potential,
+        "rec_display": REC_MAP.get(recommendation, recommendation),
+    }
+
+
+def _render_stock_report(quote, recommendation=None):
+    return STOCK_REPORT_TEMPLATE.format(**_quote_fields(quote, recommendation))
+
+
+def _render_search_results(quote, recommendation=None):
+    fields = _quote_fields(quote, recommendation)
+    return (
+        STOCK_INFO_TEMPLATE.format(**fields),
+        ANALYSIS_INFO_TEMPLATE.format(**fields),
+        QUICK_STATS_TEMPLATE.format(color=UP_COLOR if quote.change > 0 else DOWN_COLOR, **fields),
+        SEARCH_STATUS_FOUND_TEMPLATE.format(**fields),
+    )
+
+
+def render_stock_report(quote, recommendation=None):
+    """Single markdown report used by search_stock; recommendation overrides the quote's own"""
+    return stock_report_memo.get_or_render(quote, _render_stock_report, recommendation)
+
+
+def render_search_results(quote, recommendation=None):
+    """(stock_info, analysis_info, quick_stats, search_status) for search_stock_enhanced"""
+    return search_results_memo.get_or_render(quote, _render_search_results, recommendation)
+
+
+@lru_cache(maxsize=1024)
+def render_indicators(snapshot):
+    """Technical indicator section appended to the analysis panel"""
+    if math.isnan(snapshot.rsi_14):
+        rsi_label = ""
+    elif snapshot.rsi_14 >= 70:
+        rsi_label = "🔥 Overbought"
+    elif snapshot.rsi_14 <= 30:
+        rsi_label = "🧊 Oversold"
+    else:
+        rsi_label = "Neutral"
+    if snapshot.close > snapshot.bb_upper:
+        band_label = "above upper band"
+    elif snapshot.close < snapshot.bb_lower:
+        band_label = "below lower band"
+    elif math.isnan(snapshot.bb_middle):
+        band_label = "warming up"
+    else:
+        band_label = "within bands"
+    return INDICATORS_TEMPLATE.format(
+        as_of=datetime.fromtimestamp(snapshot.ts, timezone.utc).strftime("%b %d, %Y"),
+        rsi=format_level(snapshot.rsi_14),
+        rsi_label=rsi_label,
+        macd=format_level(snapshot.macd),
+        macd_signal=format_level(snapshot.macd_signal),
+        macd_label="🟢 Bullish" if snapshot.macd_hist > 0 else "🔴 Bearish",
+        sma_20=format_level(snapshot.sma_20, "$"),
+        sma_50=format_level(snapshot.sma_50, "$"),
+        ema_12=format_level(snapshot.ema_12, "$"),
+        ema_26=format_level(snapshot.ema_26, "$"),
+        bb_lower=format_level(snapshot.bb_lower, "$"),
+        bb_upper=format_level(snapshot.bb_upper, "$"),
+        band_label=band_label,
+    )
+
+
+def render_portfolio_summary(summary):
+    """Markdown totals for a Portfolio.summary() dict"""
+    return PORTFOLIO_SUMMARY_TEMPLATE.format(
+        day_color="🟢" if summary["day_change"] > 0 else "🔴",
+        pnl_color="🟢" if summary["unrealized"] > 0 else "🔴",
+        **summary,
+    )
+
+
+def format_alert_value(kind, value):
+    """Threshold in the units of an alert kind"""
+    if kind == "volume_spike":
+        return f"{value:g}× avg volume"
+    return format_tick_value(ALERT_KINDS[kind][0], value)
+
+
+def format_tick_value(field, value):
+    """Value of a tick field the way alerts show it"""
+    if field == "price":
+        return f"${value:,.2f}"
+    if field == "change_percent":
+        return f"{value:+.2f}%"
+    return format_compact(value)
+
+
+def render_alert_events(events):
+    """Markdown list of fired alerts, newest first"""
+    if not events:
+        return "🔕 No alerts have fired yet."
+    lines = ["### 🔔 Recent Alerts"]
+    for event in events:
+        alert = event.alert
+        fired_at = datetime.fromtimestamp(event.fired_at).strftime("%I:%M:%S %p")
+        lines.append(f"- **{alert.symbol}** {ALERT_LABELS[alert.kind]} {format_alert_value(alert.kind, alert.threshold)}"
+                     f" — hit {format_tick_value(ALERT_KINDS[alert.kind][0], event.value)} at {fired_at}")
+    return "\n".join(lines)
+
+
+def live_tick_values(tick):
+    """Formatted tick fields for LIVE_STATS_TEMPLATE; a stream sends only the ones that changed"""
+    return {
+        "color": UP_COLOR if tick.change > 0 else DOWN_COLOR,
+        "price": f"{tick.price:.2f}",
+        "change": f"{tick.change:+.2f}",
+        "change_percent": f"{tick.change_percent:+.2f}",
+        "volume": format_compact(tick.volume),
+    }
+
+
+def render_did_you_mean(suggestions):
+    """Closest listings for an unknown symbol, or "" when there are none"""
+    if not suggestions:
+        return ""
+    return DID_YOU_MEAN_TEMPLATE.format(
+        suggestions=", ".join(f"**{listing.symbol}** ({listing.name})" for listing in suggestions))
+
+
+@lru_cache(maxsize=256)
+def render_stock_report_not_found(symbol, suggestions=()):
+    return STOCK_REPORT_NOT_FOUND_TEMPLATE.format(symbol=symbol) + render_did_you_mean(suggestions)
+
+
+@lru_cache(maxsize=256)
+def render_search_fetching(symbol):
+    """Status card shown while a search the caches could not answer waits on upstream"""
+    return SEARCH_STATUS_FETCHING_TEMPLATE.format(symbol=symbol)
+
+
+@lru_cache(maxsize=256)
+def render_search_results_not_found(symbol, suggestions=()):
+    return (
+        STOCK_INFO_NOT_FOUND_TEMPLATE.format(symbol=symbol) + render_did_you_mean(suggestions),
+        ANALYSIS_INFO_NOT_FOUND,
+        QUICK_STATS_NOT_FOUND_TEMPLATE.format(symbol=symbol),
+        SEARCH_STATUS_NOT_FOUND,
+    )
+
+
+@lru_cache(maxsize=64)
+def render_market_card(status, is_open, current_time, next_session):
+    card_class = "status-card market-hours-open" if is_open else "status-card market-hours-closed"
+    return MARKET_CARD_TEMPLATE.format(card_class=card_class, status=status,
+                                       current_time=current_time, next_session=next_session)
+
+
+@lru_cache(maxsize=64)
+def render_system_card(status, api_status, data_feed, response_time, cache_hit_ratio, uptime):
+    card_class = "status-card system-status-healthy" if "HEALTHY" in status else "status-card system-status-warning"
+    return SYSTEM_CARD_TEMPLATE.format(card_class=card_class, status=status, api_status=api_status,
+                                       data_feed=data_feed, response_time=response_time,
+                                       cache_hit_ratio=cache_hit_ratio, uptime=uptime)
+
+
+def render_timestamp_card(current_time):
+    return TIMESTAMP_CARD_TEMPLATE.format(current_time=current_time)
@@ -0,0 +1,275 @@
+"""
+Screener - Columnar snapshot of the tracked universe filtered with NumPy masks
+"""
+
+import threading
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from stock_tracker.analytics import GROWTH_POTENTIAL, RISK_LEVELS, TRENDS, VOLATILITY_LEVELS, classify_codes
+from stock_tracker.recommendations import ACTIONS
+
+SCREEN_REFRESH_INTERVAL = 30
+DEFAULT_SCREEN_LIMIT = 50
+MAX_SCREEN_LIMIT = 1000
+
+QUOTE_COLUMNS = ("price", "change", "change_percent", "volume", "market_cap", "pe_ratio")
+INDICATOR_COLUMNS = ("rsi_14", "sma_20", "sma_50", "macd_hist")
+NUMERIC_COLUMNS = QUOTE_COLUMNS + INDICATOR_COLUMNS
+
+# Category columns are stored as int8 codes into these labels; -1 means unknown
+CATEGORY_COLUMNS = {
+    "volatility": VOLATILITY_LEVELS,
+    "trend": TRENDS,
+    "risk_level": RISK_LEVELS,
+    "growth_potential": GROWTH_POTENTIAL,
+    "action": ACTIONS,
+}
+
+
+@dataclass(frozen=True, slots=True)
+class ScreenResult:
+    """Top rows of a screen, how many symbols matched and how many were screened"""
+    frame: pd.DataFrame
+    matched: int
+    universe: int
+
+    def records(self):
+        """Rows as dicts with missing values (no P/E, indicators still warming up) as None, so they encode as JSON"""
+        return self.frame.astype(object).where(self.frame.notna(), None).to_dict("records")
+
+
+class _Snapshot:
+    """One immutable generation of columns; refresh() swaps in a new one"""
+
+    __slots__ = ("symbols", "names", "columns", "keys")
+
+    def __init__(self, symbols, names, columns, keys):
+        self.symbols = symbols
+        self.names = names
+        self.columns = columns
+        self.keys = keys
+
+    def __len__(self):
+        return len(self.symbols)
+
+
+def _columns(quotes, snapshots, recommendations):
+    """Column arrays for rows of (quote, indicator snapshot, recommendation)"""
+    columns = {column: np.array([getattr(quote, column) for quote in quotes], dtype=float)
+               for column in QUOTE_COLUMNS}
+    for column in INDICATOR_COLUMNS:
+        columns[column] = np.array([np.nan if snapshot is None else getattr(snapshot, column)
+                                    for snapshot in snapshots], dtype=float)
+    # Same rules, and so the same labels, as the search and watchlist views
+    codes = classify_codes(columns["change"], columns["change_percent"], columns["pe_ratio"])
+    for column, values in zip(("volatility", "trend", "risk_level", "growth_potential"), codes):
+        columns[column] = np.asarray(values, dtype=np.int8)
+    columns["action"] = np.array([-1 if recommendation is None else ACTIONS.index(recommendation.action)
+                                  for recommendation in recommendations], dtype=np.int8)
+    return columns
+
+
+def _top(values, candidates, limit, descending):
+    """candidates ordered by values, keeping only the first limit; NaN sorts last"""
+    keys = values[candidates].astype(float)
+    if descending:
+        keys = -keys
+    keys[np.isnan(keys)] = np.inf
+    if limit < len(keys):
+        # O(n) selection of the top rows, then a sort of just those
+        top = np.argpartition(keys, limit - 1)[:limit]
+    else:
+        top = np.arange(len(keys))
+    return candidates[top[np.argsort(keys[top], kind="stable")]]
+
+
+class Screener:
+    """Filters and ranks every tracked symbol over a columnar in-memory snapshot
+
+    The snapshot holds one NumPy array per field. A background pass re-reads
+    the quote cache and rewrites only the rows whose quote version, indicator
+    bar or recommendation changed; queries are boolean masks over whole
+    columns plus an argpartition for the top rows, so they never wait on I/O.
+    """
+
+    def __init__(self, cache=None, indicators=None, recommendations=None, universe=None,
+                 interval=SCREEN_REFRESH_INTERVAL):
+        self.cache = cache
+        self.indicators = indicators
+        self.recommendations = recommendations
+        self.universe = universe
+        self.interval = interval
+        self._snapshot = None
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+        self.refreshes = 0
+        self.rows_updated = 0
+        self.queries = 0
+
+    def screen(self, ranges=None, categories=None, sort_by="market_cap", descending=True,
+               limit=DEFAULT_SCREEN_LIMIT):
+        """Symbols within every (low, high) range and category set, best limit rows first
+
+        ranges maps numeric columns to (low, high) bounds, either of which may
+        be None; categories maps category columns to the labels to keep.
+        Symbols with no value for a filtered column never match.
+        """
+        if self._thread is None:
+            self.start()
+        snapshot = self._snapshot
+        if snapshot is None:
+            self.refresh()
+            snapshot = self._snapshot
+        if sort_by not in NUMERIC_COLUMNS and sort_by not in CATEGORY_COLUMNS:
+            raise ValueError(f"Cannot sort by '{sort_by}'")
+        limit = max(0, min(int(limit), MAX_SCREEN_LIMIT))
+
+        mask = np.ones(len(snapshot), dtype=bool)
+        for column, (low, high) in (ranges or {}).items():
+            if column not in NUMERIC_COLUMNS:
+                raise ValueError(f"Unknown numeric column '{column}'")
+            values = snapshot.columns[column]
+            if low is not None:
+                mask &= values >= low
+            if high is not None:
+                mask &= values <= high
+        for column, labels in (categories or {}).items():
+            if column not in CATEGORY_COLUMNS:
+                raise ValueError(f"Unknown category column '{column}'")
+            levels = CATEGORY_COLUMNS[column]
+            unknown = [label for label in labels if label not in levels]
+            if unknown:
+                raise ValueError(f"Unknown {column} value(s): {', '.join(unknown)}")
+            mask &= np.isin(snapshot.columns[column], [levels.index(label) for label in labels])
+
+        candidates = np.flatnonzero(mask)
+        rows = _top(snapshot.columns[sort_by], candidates, limit, descending)
+        self.queries += 1
+        return ScreenResult(self._frame(snapshot, rows), len(candidates), len(snapshot))
+
+    def refresh(self):
+        """Re-read the universe from the quote cache; returns how many rows changed"""
+        with self._refresh_lock:
+            indicators = self._indicators()
+            recommendations = self._recommendations()
+            quotes = self._cache().get_many(self._universe())
+            quotes = [quote for quote in quotes.values() if quote is not None]
+            # Batch rescore so changed quotes carry their current recommendation
+            recommendations.refresh()
+            snapshots = [indicators.latest(quote.symbol) for quote in quotes]
+            recs = [recommendations.get(quote.symbol) for quote in quotes]
+            keys = [(quote.version, None if snapshot is None else snapshot.ts,
+                     None if recommendation is None else recommendation.action)
+                    for quote, snapshot, recommendation in zip(quotes, snapshots, recs)]
+
+            previous = self._snapshot
+            symbols = np.array([quote.symbol for quote in quotes], dtype=object)
+            if previous is not None and np.array_equal(previous.symbols, symbols):
+                changed = [row for row, key in enumerate(keys) if key != previous.keys[row]]
+                if not changed:
+                    self._count(0)
+                    return 0
+                # Copy-on-write: queries keep reading the previous generation untouched
+                columns = {column: values.copy() for column, values in previous.columns.items()}
+                updates = _columns([quotes[row] for row in changed], [snapshots[row] for row in changed],
+                                   [recs[row] for row in changed])
+                for column, values in updates.items():
+                    columns[column][changed] = values
+                names = previous.names.copy()
+                names[changed] = [quotes[row].name for row in changed]
+            else:
+                changed = range(len(quotes))
+                columns = _columns(quotes, snapshots, recs)
+                names = np.array([quote.name for quote in quotes], dtype=object)
+            self._snapshot = _Snapshot(symbols, names, columns, keys)
+            self._count(len(changed))
+            return len(changed)
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name="screener", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join()
+
+    def stats(self):
+        snapshot = self._snapshot
+        return {"symbols": 0 if snapshot is None else len(snapshot), "refreshes": self.refreshes,
+                "rows_updated": self.rows_updated, "queries": self.queries}
+
+    def _frame(self, snapshot, rows):
+        columns = {"symbol": snapshot.symbols[rows], "name": snapshot.names[rows]}
+        columns.update((column, snapshot.columns[column][rows]) for column in NUMERIC_COLUMNS)
+        columns.update((column, pd.Categorical.from_codes(snapshot.columns[column][rows], levels))
+                       for column, levels in CATEGORY_COLUMNS.items())
+        return pd.DataFrame(columns)
+
+    def _count(self, changed):
+        with self._lock:
+            self.refreshes += 1
+            self.rows_updated += changed
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            try:
+                self.refresh()
+            except Exception:
+                # Keep serving the previous snapshot; try again next interval
+                pass
+
+    def _universe(self):
+        """Listed symbols plus anything else already in the quote cache"""
+        if self.universe is not None:
+            return self.universe
+        from stock_tracker.symbol_index import get_symbol_index
+
+        listed = [listing.symbol for listing in get_symbol_index().listings]
+        return list(dict.fromkeys(listed + sorted(quote.symbol for quote in self._cache().quotes())))
+
+    def _cache(self):
+        if self.cache is None:
+            from stock_tracker.quote_cache import get_quote_cache
+
+            self.cache = get_quote_cache()
+        return self.cache
+
+    def _indicators(self):
+        if self.indicators is None:
+            from stock_tracker.indicators import get_indicator_engine
+
+            self.indicators = get_indicator_engine()
+        return self.indicators
+
+    def _recommendations(self):
+        if self.recommendations is None:
+            from stock_tracker.recommendations import get_recommendation_engine
+
+            self.recommendations = get_recommendation_engine()
+        return self.recommendations
+
+
+_screener = None
+_screener_lock = threading.Lock()
+
+
+def get_screener():
+    """Process-wide screener over the shared quote cache, indicators and recommendations"""
+    global _screener
+    if _screener is None:
+        with _screener_lock:
+            if _screener is None:
+                _screener = Screener()
+    return _screener
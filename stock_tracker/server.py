@@ -0,0 +1,101 @@
+"""
+Server - FastAPI app hosting the Gradio UI alongside operational endpoints
+"""
+
+import os
+
+import gradio as gr
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+
+from stock_tracker.metrics import PROMETHEUS_CONTENT_TYPE, render_metrics
+from stock_tracker.quote_cache import get_quote_cache
+
+
+def share_session_config(blocks):
+    """Render each component's config once and give new sessions copies instead of re-rendering
+
+    Gradio builds the config of every component for each new session, and each
+    REST call without a session hash is a new session; on this interface that
+    was most of the event loop's time under load, stalling every other event.
+    """
+    for block in blocks.blocks.values():
+        if hasattr(block, "get_config"):
+            block.get_config = _render_once(block.get_config)
+        block.shared_session_config = None
+    _share_block_configs()
+    return blocks
+
+
+def _render_once(get_config):
+    rendered = []
+
+    def get_config_once(*args, **kwargs):
+        if args or kwargs:
+            return get_config(*args, **kwargs)
+        if not rendered:
+            rendered.append(get_config())
+        # Sessions write updated values into the props in place
+        return dict(rendered[0])
+
+    return get_config_once
+
+
+def _share_block_configs():
+    """Serve the whole per-session entry of a shared block from one rendering
+
+    Besides the props, each entry carries the component's API schema and
+    example inputs, and copying the session state rebuilds all of them for
+    every block; on this interface that alone was ~6 ms of loop time per new
+    session. Blocks not passed through share_session_config are untouched.
+    """
+    from gradio.blocks import BlocksConfig
+
+    config_for_block = BlocksConfig.config_for_block
+    if getattr(config_for_block, "shares_configs", False):
+        return
+
+    def shared_config_for_block(_id, rendered_ids, block, renderable=None):
+        if renderable is not None or rendered_ids or not hasattr(block, "shared_session_config"):
+            return config_for_block(_id, rendered_ids, block, renderable)
+        if block.shared_session_config is None:
+            block.shared_session_config = config_for_block(_id, rendered_ids, block)
+        config = dict(block.shared_session_config)
+        if "props" in config:
+            config["props"] = dict(config["props"])
+        return config
+
+    shared_config_for_block.shares_configs = True
+    BlocksConfig.config_for_block = staticmethod(shared_config_for_block)
+
+
+def create_server(blocks, css=None, theme=None):
+    """FastAPI app exposing /metrics with the Gradio Blocks mounted at the root
+
+    Gradio 6 takes css and theme at launch or mount time, not in the Blocks
+    constructor, so the interface's styling is passed in here.
+    """
+    share_session_config(blocks)
+    api = FastAPI(title="MCP Stock Tracker", docs_url=None, redoc_url=None)
+
+    @api.get("/metrics", include_in_schema=False)
+    def metrics():
+        return PlainTextResponse(render_metrics(cache=get_quote_cache(), blocks=blocks),
+                                 media_type=PROMETHEUS_CONTENT_TYPE)
+
+    # Routes registered above take precedence over the catch-all Gradio mount
+    return gr.mount_gradio_app(api, blocks, path="/", css=css, theme=theme)
+
+
+def serve(blocks, host=None, port=None, warm_steps=(), css=None, theme=None):
+    """Run the combined app with uvicorn, honouring Gradio's server env vars"""
+    import uvicorn
+
+    from stock_tracker.warmup import start_warmup
+
+    host = host or os.environ.get("GRADIO_SERVER_NAME", "127.0.0.1")
+    port = int(port or os.environ.get("GRADIO_SERVER_PORT", 7860))
+    server = uvicorn.Server(uvicorn.Config(create_server(blocks, css, theme), host=host, port=port))
+    # Caches fill once the socket is listening, so startup never waits on upstream data
+    start_warmup(ready=lambda: server.started, extra_steps=warm_steps)
+    server.run()
@@ -0,0 +1,131 @@
+"""
+Shared Cache - Read-through quote layer over a store shared by every backend replica
+"""
+
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from stock_tracker.providers import ALL_GROUPS, FIELD_GROUPS, QuoteProvider
+from stock_tracker.quote_cache import DEFAULT_TTLS, NEGATIVE_TTL
+
+KEY_PREFIX = "quote:"
+
+
+def _groups_in(fields):
+    return [group for group, group_fields in FIELD_GROUPS.items() if group_fields[0] in fields]
+
+
+def _select(fields, groups):
+    selected = {"name": fields["name"]} if "name" in fields else {}
+    for group in groups:
+        for field in FIELD_GROUPS[group]:
+            if field in fields:
+                selected[field] = fields[field]
+    return selected
+
+
+class SharedCacheProvider(QuoteProvider):
+    """Wraps an upstream provider with a cache every replica reads and writes
+
+    The store only needs get(key), item assignment and update(mapping), so a
+    modal.Dict works in production and a plain dict stands in locally. Records
+    keep a fetch time per field group (epoch seconds, comparable across
+    machines), so a replica only calls upstream for groups nobody refreshed
+    recently. With read_concurrency > 1, fetch_many() reads its keys in
+    parallel, so a remote store costs about one round trip per batch.
+    """
+
+    def __init__(self, provider, store, ttls=None, negative_ttl=NEGATIVE_TTL, clock=time.time, read_concurrency=1):
+        super().__init__()
+        self.provider = provider
+        self.name = provider.name
+        self.confirms_empty_history = provider.confirms_empty_history
+        self.store = store
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.negative_ttl = negative_ttl
+        self.clock = clock
+        self.read_concurrency = read_concurrency
+        self._executor = None
+        self.shared_hits = 0
+        self.upstream_calls = 0
+
+    def fetch(self, symbol, groups=ALL_GROUPS):
+        self.calls += 1
+        record = self.store.get(KEY_PREFIX + symbol)
+        now = self.clock()
+        if record is not None and record.get("missing") is not None and now - record["missing"] < self.negative_ttl:
+            self.shared_hits += 1
+            return None
+        stale = self._stale(record, groups, now)
+        if not stale:
+            self.shared_hits += 1
+            return _select(record["fields"], groups)
+        self.upstream_calls += 1
+        record, written = self._merge(record, self.provider.fetch(symbol, stale), now)
+        if written is not None:
+            self.store[KEY_PREFIX + symbol] = written
+        return None if record is None else _select(record["fields"], groups)
+
+    def fetch_many(self, symbols, groups=ALL_GROUPS):
+        self.calls += 1
+        now = self.clock()
+        results = {}
+        records = dict(zip(symbols, self._read_many([KEY_PREFIX + symbol for symbol in symbols])))
+        stale_symbols = []
+        for symbol, record in records.items():
+            if record is not None and record.get("missing") is not None and now - record["missing"] < self.negative_ttl:
+                continue
+            if self._stale(record, groups, now):
+                stale_symbols.append(symbol)
+            else:
+                results[symbol] = _select(record["fields"], groups)
+        self.shared_hits += len(records) - len(stale_symbols)
+        if stale_symbols:
+            self.upstream_calls += 1
+            fetched = self.provider.fetch_many(stale_symbols, groups)
+            updates = {}
+            for symbol in stale_symbols:
+                record, written = self._merge(records[symbol], fetched.get(symbol), now)
+                if written is not None:
+                    updates[KEY_PREFIX + symbol] = written
+                if record is not None:
+                    results[symbol] = _select(record["fields"], groups)
+            if updates:
+                self.store.update(updates)
+        return results
+
+    def fetch_history(self, symbol, start, end, interval="1d"):
+        # History is shared through the history store's volume instead
+        return self.provider.fetch_history(symbol, start, end, interval)
+
+    def stats(self):
+        return {"calls": self.calls, "shared_hits": self.shared_hits, "upstream_calls": self.upstream_calls}
+
+    def _stale(self, record, groups, now):
+        if record is None or record.get("fields") is None:
+            return tuple(groups)
+        fetched_at = record["fetched_at"]
+        return tuple(group for group in groups if now - fetched_at.get(group, -math.inf) >= self.ttls[group])
+
+    def _read_many(self, keys):
+        if self.read_concurrency <= 1 or len(keys) <= 1:
+            return [self.store.get(key) for key in keys]
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.read_concurrency,
+                                                thread_name_prefix="shared-cache-read")
+        return list(self._executor.map(self.store.get, keys))
+
+    def _merge(self, record, fields, now):
+        """(record with fresh fields or None if unknown, value to store or None)"""
+        if fields is None:
+            if record is None or record.get("fields") is None:
+                return None, {"missing": now}
+            return record, None
+        if record is None or record.get("fields") is None:
+            record = {"fields": {}, "fetched_at": {}}
+        record = {
+            "fields": {**record["fields"], **fields},
+            "fetched_at": {**record["fetched_at"], **dict.fromkeys(_groups_in(fields), now)},
+        }
+        return record, record
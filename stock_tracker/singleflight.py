@@ -0,0 +1,83 @@
+"""
+Single-Flight - Coalesce concurrent calls for the same key into one execution
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Future
+
+
+class SingleFlight:
+    """Run at most one call per key at a time; concurrent callers share its result"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._inflight = {}
+        self.calls = 0
+        self.executions = 0
+        self.coalesced = 0
+
+    def do(self, key, fn, *args, **kwargs):
+        """Call fn(*args, **kwargs) unless a call for key is already running, then wait on it"""
+        with self._lock:
+            self.calls += 1
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[key] = future
+                self.executions += 1
+            else:
+                self.coalesced += 1
+        if not leader:
+            return future.result()
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._inflight[key]
+
+    def stats(self):
+        return {
+            "calls": self.calls,
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._inflight),
+        }
+
+
+class AsyncSingleFlight:
+    """Event-loop counterpart of SingleFlight: concurrent awaiters share one task"""
+
+    def __init__(self):
+        self._inflight = {}
+        self.calls = 0
+        self.executions = 0
+        self.coalesced = 0
+
+    async def do(self, key, fn, *args, **kwargs):
+        """Await fn(*args, **kwargs) unless a call for key is already pending, then await that"""
+        self.calls += 1
+        future = self._inflight.get(key)
+        if future is not None:
+            self.coalesced += 1
+            return await asyncio.shield(future)
+        future = asyncio.ensure_future(fn(*args, **kwargs))
+        self._inflight[key] = future
+        self.executions += 1
+        future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(future)
+
+    def stats(self):
+        return {
+            "calls": self.calls,
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._inflight),
+        }
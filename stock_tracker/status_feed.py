@@ -0,0 +1,83 @@
+"""
+Status Feed - One shared background computation of the status cards for every session
+"""
+
+import threading
+
+# Seconds between status recomputations (matches "Auto-refresh every 30s")
+STATUS_INTERVAL = 30.0
+
+
+class StatusBroadcaster:
+    """Recomputes a tuple of outputs on a background thread and versions each one
+
+    Sessions read snapshot() instead of recomputing; an output's version only
+    changes when its rendered value does, so callers can skip unchanged ones.
+    """
+
+    def __init__(self, compute, interval=STATUS_INTERVAL):
+        self.compute = compute
+        self.interval = interval
+        self.computations = 0
+        self._values = None
+        self._versions = None
+        self._lock = threading.Lock()
+        self._first_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name="status-broadcaster", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join()
+
+    def refresh(self):
+        """Recompute now and bump the version of every output that changed"""
+        values = tuple(self.compute())
+        with self._lock:
+            self.computations += 1
+            if self._values is None:
+                self._versions = (1,) * len(values)
+            else:
+                self._versions = tuple(version + (value != old)
+                                       for version, value, old in zip(self._versions, values, self._values))
+            self._values = values
+
+    def snapshot(self):
+        """(versions, values) of the latest computation, starting the feed on first use"""
+        if self._thread is None:
+            self.start()
+        if self._values is None:
+            # Sessions arriving together before the first computation wait for one
+            with self._first_lock:
+                if self._values is None:
+                    self.refresh()
+        with self._lock:
+            return self._versions, self._values
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            try:
+                self.refresh()
+            except Exception:
+                # Keep serving the previous snapshot; try again next interval
+                pass
+
+
+def changed_outputs(snapshot, seen, skip):
+    """Values for outputs whose version differs from seen, skip() for the rest"""
+    versions, values = snapshot
+    if seen is None:
+        return list(values)
+    return [value if version != last else skip()
+            for value, version, last in zip(values, versions, seen)]
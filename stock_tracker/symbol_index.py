@@ -0,0 +1,153 @@
+"""
+Symbol Index - Sorted-array prefix search and trigram fuzzy matching over listed securities
+"""
+
+import bisect
+import csv
+import os
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+
+DEFAULT_LISTINGS_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                     "data", "listings.csv")
+
+# Fraction of the query's trigrams a fuzzy match must share
+MIN_OVERLAP = 0.5
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+@dataclass(frozen=True, slots=True)
+class Listing:
+    symbol: str
+    name: str
+    exchange: str = ""
+
+
+def load_listings(path=DEFAULT_LISTINGS_FILE):
+    """Listings from a CSV file with symbol, name and (optional) exchange columns"""
+    with open(path, newline="", encoding="utf-8") as handle:
+        return [Listing(row["symbol"].strip().upper(), row["name"].strip(), (row.get("exchange") or "").strip())
+                for row in csv.DictReader(handle) if row.get("symbol")]
+
+
+def _trigrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class SymbolIndex:
+    """Immutable index over listings, built once
+
+    Symbols and company-name words are kept in sorted arrays so a prefix is
+    two bisects and a slice; a trigram -> listings map ranks fuzzy "did you
+    mean" candidates. Answers are memoized per query, since many users type
+    the same prefixes.
+    """
+
+    def __init__(self, listings):
+        listings = sorted({listing.symbol: listing for listing in listings}.values(), key=lambda item: item.symbol)
+        self.listings = listings
+        self._by_symbol = {listing.symbol: listing for listing in listings}
+        self._symbols = [listing.symbol for listing in listings]
+
+        self._name_words = [tuple(_WORD.findall(listing.name.lower())) for listing in listings]
+        words = sorted((word, position) for position, name_words in enumerate(self._name_words)
+                       for word in set(name_words))
+        self._words = [word for word, _ in words]
+        self._word_listings = [position for _, position in words]
+
+        postings = {}
+        self._trigram_counts = []
+        for position, listing in enumerate(listings):
+            grams = _trigrams(listing.symbol.lower()) | _trigrams(" ".join(self._name_words[position]))
+            self._trigram_counts.append(len(grams))
+            for gram in grams:
+                postings.setdefault(gram, []).append(position)
+        self._postings = {gram: tuple(positions) for gram, positions in postings.items()}
+        self.suggest = lru_cache(maxsize=8192)(self._suggest)
+        self.did_you_mean = lru_cache(maxsize=4096)(self._did_you_mean)
+
+    def __len__(self):
+        return len(self.listings)
+
+    def __contains__(self, symbol):
+        return symbol in self._by_symbol
+
+    def get(self, symbol):
+        return self._by_symbol.get(symbol)
+
+    def prefix(self, text, limit=10):
+        """Listings whose symbol starts with text, shortest symbols first"""
+        text = text.upper()
+        start = bisect.bisect_left(self._symbols, text)
+        end = bisect.bisect_left(self._symbols, text + "\uffff", start)
+        matches = self.listings[start:end]
+        if len(matches) > limit:
+            matches = sorted(matches, key=lambda listing: len(listing.symbol))
+        return matches[:limit]
+
+    def name_prefix(self, text, limit=10):
+        """Listings with a company-name word starting with text"""
+        text = text.lower()
+        start = bisect.bisect_left(self._words, text)
+        end = bisect.bisect_left(self._words, text + "\uffff", start)
+        positions = dict.fromkeys(self._word_listings[start:end])
+        return [self.listings[position] for position in list(positions)[:limit]]
+
+    def _suggest(self, query, limit=8):
+        """Autocomplete candidates: exact symbol, symbol prefixes, name prefixes, then fuzzy matches"""
+        query = query.strip()
+        if not query:
+            return ()
+        results = dict.fromkeys(self.prefix(query, limit))
+        words = _WORD.findall(query.lower())
+        if len(results) < limit and words:
+            # Name matches must have a word starting with each word of the query
+            for listing in self.name_prefix(words[0], len(self.listings)):
+                name_words = self._name_words[self._position(listing)]
+                if all(any(name_word.startswith(word) for name_word in name_words) for word in words[1:]):
+                    results[listing] = None
+                    if len(results) >= limit:
+                        break
+        if len(results) < limit:
+            results.update(dict.fromkeys(self._fuzzy(query, limit)))
+        return tuple(results)[:limit]
+
+    def _did_you_mean(self, query, limit=3):
+        """Closest listings to a symbol or name that was not found"""
+        return tuple(listing for listing in self._fuzzy(query, limit + 1) if listing.symbol != query.upper())[:limit]
+
+    def _fuzzy(self, query, limit):
+        grams = _trigrams(" ".join(_WORD.findall(query.lower())))
+        shared = Counter()
+        for gram in grams:
+            shared.update(self._postings.get(gram, ()))
+        scored = []
+        for position, count in shared.items():
+            if count >= MIN_OVERLAP * len(grams):
+                # Rank by how much of the query matched, then by how little else the listing holds
+                similarity = count / (len(grams) + self._trigram_counts[position] - count)
+                scored.append((-count, -similarity, position))
+        scored.sort()
+        return [self.listings[position] for _, _, position in scored[:limit]]
+
+    def _position(self, listing):
+        return bisect.bisect_left(self._symbols, listing.symbol)
+
+
+_symbol_index = None
+_symbol_index_lock = threading.Lock()
+
+
+def get_symbol_index():
+    """Process-wide index loaded from STOCK_LISTINGS_FILE (defaults to data/listings.csv)"""
+    global _symbol_index
+    if _symbol_index is None:
+        with _symbol_index_lock:
+            if _symbol_index is None:
+                _symbol_index = SymbolIndex(load_listings(os.environ.get("STOCK_LISTINGS_FILE", DEFAULT_LISTINGS_FILE)))
+    return _symbol_index
@@ -0,0 +1,177 @@
+"""
+Telemetry - Rolling latency and error instrumentation for handlers and providers
+"""
+
+import bisect
+import functools
+import inspect
+import threading
+import time
+from collections import deque
+
+# Samples older than this drop out of percentiles and error rates
+WINDOW_SECONDS = 300.0
+WINDOW_SIZE = 2048
+
+# Histogram bucket upper bounds (seconds), Prometheus style
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class LatencyWindow:
+    """Bounded window of recent (timestamp, seconds, ok) samples for one operation
+
+    Alongside the window it keeps lifetime totals and histogram bucket counts
+    for the /metrics endpoint.
+    """
+
+    def __init__(self, size=WINDOW_SIZE, horizon=WINDOW_SECONDS, clock=time.monotonic):
+        self.horizon = horizon
+        self.clock = clock
+        self._samples = deque(maxlen=size)
+        self._lock = threading.Lock()
+        self.count = 0
+        self.errors = 0
+        self.total_seconds = 0.0
+        self.bucket_counts = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def record(self, seconds, ok=True):
+        with self._lock:
+            self._samples.append((self.clock(), seconds, ok))
+            self.count += 1
+            self.total_seconds += seconds
+            self.bucket_counts[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+            if not ok:
+                self.errors += 1
+
+    def recent(self):
+        cutoff = self.clock() - self.horizon
+        with self._lock:
+            return [(seconds, ok) for timestamp, seconds, ok in self._samples if timestamp >= cutoff]
+
+    def summary(self):
+        """p50/p95/p99 latency (seconds), error rate and sample count over the window"""
+        samples = self.recent()
+        if not samples:
+            return {"count": 0, "p50": None, "p95": None, "p99": None, "error_rate": 0.0}
+        latencies = sorted(seconds for seconds, _ in samples)
+        failures = sum(1 for _, ok in samples if not ok)
+        return {
+            "count": len(samples),
+            "p50": _percentile(latencies, 0.50),
+            "p95": _percentile(latencies, 0.95),
+            "p99": _percentile(latencies, 0.99),
+            "error_rate": failures / len(samples),
+        }
+
+
+def _percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class Telemetry:
+    """Process-wide registry of latency windows keyed by operation name"""
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self.started_at = time.time()
+        self._windows = {}
+        self._lock = threading.Lock()
+
+    def window(self, name):
+        window = self._windows.get(name)
+        if window is None:
+            with self._lock:
+                window = self._windows.setdefault(name, LatencyWindow(clock=self.clock))
+        return window
+
+    def record(self, name, seconds, ok=True):
+        self.window(name).record(seconds, ok)
+
+    def names(self):
+        return tuple(self._windows)
+
+    def summary(self, names):
+        """Combined window summary across several operations"""
+        merged = LatencyWindow(size=None, clock=self.clock)
+        for name in names:
+            window = self._windows.get(name)
+            if window is not None:
+                with window._lock:
+                    merged._samples.extend(window._samples)
+        return merged.summary()
+
+    def uptime(self):
+        return time.time() - self.started_at
+
+
+telemetry = Telemetry()
+
+
+def instrument(name, registry=None):
+    """Decorator recording call latency and failures of a sync or async function under name"""
+    def decorator(fn):
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                ok = False
+                try:
+                    result = await fn(*args, **kwargs)
+                    ok = True
+                    return result
+                finally:
+                    (registry or telemetry).record(name, time.perf_counter() - start, ok)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            ok = False
+            try:
+                result = fn(*args, **kwargs)
+                ok = True
+                return result
+            finally:
+                (registry or telemetry).record(name, time.perf_counter() - start, ok)
+        return wrapper
+    return decorator
+
+
+class timed:
+    """Context manager form of instrument() for code that isn't a whole function"""
+    __slots__ = ("name", "registry", "start")
+
+    def __init__(self, name, registry=None):
+        self.name = name
+        self.registry = registry or telemetry
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.registry.record(self.name, time.perf_counter() - self.start, exc_type is None)
+        return False
+
+
+def format_duration(seconds):
+    """Latency for display: 850µs, 42ms, 1.3s"""
+    if seconds is None:
+        return "N/A"
+    if seconds < 0.001:
+        return f"{seconds * 1e6:.0f}µs"
+    if seconds < 1:
+        return f"{seconds * 1e3:.0f}ms"
+    return f"{seconds:.1f}s"
+
+
+def format_uptime(seconds):
+    days, remainder = divmod(int(seconds), 86400)
+    hours, remainder = divmod(remainder, 3600)
+    minutes = remainder // 60
+    if days:
+        return f"{days}d {hours}h"
+    if hours:
+        return f"{hours}h {minutes}m"
+    return f"{minutes}m"
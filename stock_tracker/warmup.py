@@ -0,0 +1,105 @@
+"""
+Warmup - Fill the data-layer caches in the background once the server is accepting requests
+"""
+
+import logging
+import os
+import threading
+import time
+
+# Demo symbols; most first searches are for one of these
+WARM_SYMBOLS = ("AAPL", "MSFT", "GOOGL", "AMZN", "NVDA", "TSLA", "META")
+READY_POLL_INTERVAL = 0.05
+
+logger = logging.getLogger("stock_tracker.warmup")
+
+
+def warm_symbols():
+    """Symbols to pre-load, from STOCK_WARM_SYMBOLS (comma separated) or the defaults"""
+    configured = os.environ.get("STOCK_WARM_SYMBOLS")
+    if configured is None:
+        return list(WARM_SYMBOLS)
+    return [symbol.strip().upper() for symbol in configured.split(",") if symbol.strip()]
+
+
+def default_steps(symbols):
+    """(name, callable) pairs warming everything the first search, chart and screen would build"""
+    # Each step imports its module when it runs, so none of this is paid before the server listens
+    def calendar():
+        from stock_tracker.market_calendar import get_calendar
+
+        get_calendar().status()
+
+    def symbol_index():
+        from stock_tracker.symbol_index import get_symbol_index
+
+        get_symbol_index()
+
+    def quotes():
+        from stock_tracker.quote_cache import get_quote_cache
+
+        get_quote_cache().get_many(symbols)
+
+    def indicators():
+        from stock_tracker.indicators import get_indicator_engine
+
+        engine = get_indicator_engine()
+        for symbol in symbols:
+            engine.snapshot(symbol)
+
+    def recommendations():
+        from stock_tracker.recommendations import get_recommendation_engine
+
+        get_recommendation_engine().refresh()
+
+    def screener():
+        from stock_tracker.screener import get_screener
+
+        get_screener().refresh()
+
+    return [("calendar", calendar), ("symbol_index", symbol_index), ("quotes", quotes),
+            ("indicators", indicators), ("recommendations", recommendations), ("screener", screener)]
+
+
+class Warmup:
+    """Runs warm-up steps on a daemon thread, after ready() first returns True
+
+    Steps run in order and a failing step is logged and skipped, so a slow or
+    unreachable upstream never delays startup; requests arriving first simply
+    fill the same caches themselves.
+    """
+
+    def __init__(self, steps, ready=None):
+        self.steps = list(steps)
+        self.ready = ready
+        self.timings = {}
+        self.errors = {}
+        self.done = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self.run, name="warmup", daemon=True)
+            self._thread.start()
+        return self
+
+    def run(self):
+        while self.ready is not None and not self.ready():
+            time.sleep(READY_POLL_INTERVAL)
+        started = time.perf_counter()
+        for name, step in self.steps:
+            step_started = time.perf_counter()
+            try:
+                step()
+            except Exception as e:
+                self.errors[name] = repr(e)
+                logger.warning("Warm-up step %s failed: %r", name, e)
+            self.timings[name] = time.perf_counter() - step_started
+        logger.info("Warm-up finished in %.2fs", time.perf_counter() - started)
+        self.done.set()
+
+
+def start_warmup(ready=None, symbols=None, extra_steps=()):
+    """Warm the default caches plus extra_steps in the background once ready() is True"""
+    steps = default_steps(warm_symbols() if symbols is None else symbols) + list(extra_steps)
+    return Warmup(steps, ready).start()
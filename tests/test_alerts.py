@@ -0,0 +1,71 @@
+import numpy as np
+
+from stock_tracker.alerts import AlertEngine, InboxNotifier, QueueNotifier
+from stock_tracker.history_store import BAR_DTYPE
+from stock_tracker.live_feed import Tick
+
+
+def tick(symbol, price, change_percent=0.0, volume=0):
+    return Tick(symbol, price, price * change_percent / 100, change_percent, volume)
+
+
+def test_alerts_fire_once_when_their_threshold_is_crossed():
+    engine = AlertEngine(QueueNotifier(), clock=lambda: 0.0)
+    above = [engine.add("AAPL", "price_above", threshold) for threshold in (110, 105, 120)]
+    below = engine.add("AAPL", "price_below", 90)
+    drop = engine.add("AAPL", "percent_down", 5)
+    cancelled = engine.add("AAPL", "price_above", 101)
+    other = engine.add("MSFT", "price_above", 1)
+    assert engine.remove(cancelled.id)
+
+    assert engine.on_tick(tick("AAPL", 100)) == []
+    fired = engine.on_tick(tick("AAPL", 110))
+    # Ascending threshold order; exactly at the threshold counts
+    assert [event.alert for event in fired] == [above[1], above[0]]
+    assert engine.on_tick(tick("AAPL", 115)) == []
+
+    fired = engine.on_tick(tick("AAPL", 89, change_percent=-6))
+    assert {event.alert for event in fired} == {below, drop}
+    assert [event.alert for event in engine.notifier.drain()] == [above[1], above[0], below, drop]
+    assert engine.alerts() == [above[2], other]
+
+
+def test_alerts_and_fired_events_belong_to_their_session():
+    engine = AlertEngine(InboxNotifier(), clock=lambda: 0.0)
+    mine = engine.add("AAPL", "price_above", 110, owner="a")
+    theirs = engine.add("AAPL", "price_above", 120, owner="b")
+
+    assert engine.alerts(owner="a") == [mine]
+    assert not engine.remove(theirs.id, owner="a")
+    engine.on_tick(tick("AAPL", 125))
+
+    seq, events = engine.notifier.recent("a")
+    assert seq == 1 and [event.alert for event in events] == [mine]
+    assert [event.alert for event in engine.notifier.recent("b")[1]] == [theirs]
+    engine.add("AAPL", "price_above", 130, owner="a")
+    assert engine.remove_owner("a") == 1
+    assert engine.alerts(owner="a") == [] and engine.notifier.recent("a") == (0, [])
+
+
+class VolumeHistory:
+    """History store stub with one flat daily volume"""
+
+    def __init__(self, volume):
+        self.volume = volume
+
+    def clock(self):
+        return 100 * 86400
+
+    def history(self, symbol, interval, start, end):
+        bars = np.zeros(30, dtype=BAR_DTYPE)
+        bars["volume"] = self.volume
+        return bars
+
+
+def test_volume_spikes_are_relative_to_average_volume():
+    engine = AlertEngine(QueueNotifier(), clock=lambda: 0.0, history_store=VolumeHistory(1_000_000))
+    alert = engine.add("AAPL", "volume_spike", 2)
+    assert (alert.threshold, alert.level) == (2.0, 2_000_000)
+
+    assert engine.on_tick(tick("AAPL", 100, volume=1_999_999)) == []
+    assert [event.alert for event in engine.on_tick(tick("AAPL", 100, volume=2_000_000))] == [alert]
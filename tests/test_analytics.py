@@ -0,0 +1,66 @@
+import math
+from dataclasses import asdict, replace
+
+import pandas as pd
+import pytest
+
+from stock_tracker.analytics import classify, classify_quote
+from stock_tracker.quote_store import DEMO_QUOTES
+
+BASE = DEMO_QUOTES[0]
+EDGE_QUOTES = [
+    # Ties on every threshold: 1% and 3% moves, a flat day, P/E of 25 and 40
+    replace(BASE, symbol="UP1", change=1.0, change_percent=1.0),
+    replace(BASE, symbol="UP3", change=3.0, change_percent=3.0),
+    replace(BASE, symbol="DOWN1", change=-1.0, change_percent=-1.0),
+    replace(BASE, symbol="DOWN3", change=-3.0, change_percent=-3.0),
+    replace(BASE, symbol="FLAT", change=0.0, change_percent=0.0),
+    replace(BASE, symbol="PE25", pe_ratio=25.0),
+    replace(BASE, symbol="PE40", pe_ratio=40.0),
+    # Unprofitable companies have no P/E; a failed fetch can leave the move unknown
+    replace(BASE, symbol="NOPE", pe_ratio=math.nan),
+    replace(BASE, symbol="NOMOVE", change=math.nan, change_percent=math.nan),
+]
+
+
+def scalar_classification(quote):
+    """The per-handler if/else rules the analytics engine replaced"""
+    if abs(quote.change_percent) > 3:
+        volatility = "High"
+    elif abs(quote.change_percent) > 1:
+        volatility = "Moderate"
+    else:
+        volatility = "Low"
+    return {
+        "volatility": volatility,
+        "trend": "Bullish" if quote.change > 0 else "Bearish",
+        "risk_level": "Low" if quote.pe_ratio < 25 else "Moderate" if quote.pe_ratio < 40 else "High",
+        "growth_potential": "High" if quote.change_percent > 1 else "Moderate",
+    }
+
+
+def frame(records):
+    return pd.DataFrame.from_records(records).set_index("symbol")
+
+
+@pytest.mark.parametrize("quotes", [DEMO_QUOTES, EDGE_QUOTES], ids=["demo", "edges"])
+def test_frame_and_single_quote_classification_match_the_scalar_rules(quotes):
+    classified = classify(frame([asdict(quote) for quote in quotes]))
+
+    for quote in quotes:
+        expected = scalar_classification(quote)
+        single = classify_quote(quote)
+        row = classified.loc[quote.symbol]
+        for field, label in expected.items():
+            assert getattr(single, field) == label, (quote.symbol, field)
+            assert row[field] == label, (quote.symbol, field)
+
+
+def test_missing_pe_column_values_classify_as_high_risk():
+    records = [asdict(quote) for quote in DEMO_QUOTES[:2]]
+    del records[1]["pe_ratio"]
+
+    classified = classify(frame(records))
+
+    assert classified.loc[DEMO_QUOTES[1].symbol, "risk_level"] == "High"
+    assert classified.loc[DEMO_QUOTES[0].symbol, "risk_level"] == classify_quote(DEMO_QUOTES[0]).risk_level
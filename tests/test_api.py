@@ -0,0 +1,63 @@
+import json
+import math
+from dataclasses import replace
+
+from fastapi.testclient import TestClient
+
+from stock_tracker import history_store, screener
+from stock_tracker.api import MAX_HISTORY_BARS, create_api
+from stock_tracker.history_store import MAX_HISTORY_DAYS, HistoryStore
+from stock_tracker.indicators import IndicatorEngine
+from stock_tracker.providers import DemoQuoteProvider
+from stock_tracker.quote_cache import QuoteCache
+from stock_tracker.quote_store import DEMO_QUOTES, QuoteStore
+from stock_tracker.recommendations import RecommendationEngine
+
+NOW = 1_760_000_000
+
+
+def make_client(tmp_path, monkeypatch):
+    store = HistoryStore(str(tmp_path), DemoQuoteProvider(), clock=lambda: NOW)
+    monkeypatch.setattr(history_store, "_history_store", store)
+    return TestClient(create_api(mcp=False)), store
+
+
+def test_history_range_is_bounded_per_interval(tmp_path, monkeypatch):
+    client, store = make_client(tmp_path, monkeypatch)
+
+    response = client.get("/history/AAPL", params={"start": 0, "end": NOW, "interval": "1m"})
+    assert response.status_code == 200
+    assert min(response.json()["ts"]) >= NOW - MAX_HISTORY_DAYS["1m"] * 86400
+    assert store.coverage("AAPL", "1m")[0] >= NOW - MAX_HISTORY_DAYS["1m"] * 86400
+
+    response = client.get("/history/AAPL", params={"start": 0, "end": NOW, "interval": "1d"})
+    assert len(response.json()["ts"]) <= MAX_HISTORY_BARS
+    assert store.coverage("AAPL", "1d")[0] >= NOW - MAX_HISTORY_BARS * 86400
+
+
+def test_bad_history_requests_are_client_errors(tmp_path, monkeypatch):
+    client, _ = make_client(tmp_path, monkeypatch)
+
+    assert client.get("/history/..", params={"start": 0, "end": NOW}).status_code in (400, 404)
+    assert client.get("/history/.AAPL", params={"start": 0, "end": NOW}).status_code == 400
+    assert client.get("/history/AAPL", params={"start": NOW, "end": 0}).status_code == 400
+    assert client.get("/history/AAPL", params={"start": 0, "end": NOW, "interval": "2m"}).status_code == 400
+
+
+def test_screen_results_are_strict_json(tmp_path, monkeypatch):
+    client, _ = make_client(tmp_path, monkeypatch)
+    # An unprofitable company has no P/E
+    provider = DemoQuoteProvider(QuoteStore(DEMO_QUOTES + (replace(DEMO_QUOTES[0], symbol="LOSS", pe_ratio=math.nan),)))
+    cache = QuoteCache(provider)
+    indicators = IndicatorEngine(HistoryStore(str(tmp_path / "screen"), provider, clock=lambda: NOW))
+    monkeypatch.setattr(screener, "_screener", screener.Screener(
+        cache, indicators, RecommendationEngine(cache, indicators), universe=list(provider.store.symbols())))
+
+    response = client.get("/screen", params={"sort": "pe_ratio", "limit": 100})
+
+    def reject(constant):
+        raise ValueError(f"{constant} is not JSON")
+
+    results = json.loads(response.text, parse_constant=reject)["results"]
+    assert response.status_code == 200
+    assert {row["symbol"]: row["pe_ratio"] for row in results}["LOSS"] is None
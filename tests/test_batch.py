@@ -0,0 +1,87 @@
+import threading
+import time
+
+import pytest
+
+from stock_tracker.batch import QUOTE_COLUMNS, get_quotes, parse_symbols
+from stock_tracker.providers import ALL_GROUPS, DemoQuoteProvider
+from stock_tracker.quote_cache import QuoteCache
+
+
+class BatchProvider(DemoQuoteProvider):
+    """Demo quotes that record batch fetches and may hold them until released"""
+
+    def __init__(self):
+        super().__init__()
+        self.batches = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def fetch_many(self, symbols, groups=ALL_GROUPS):
+        self.batches.append((list(symbols), tuple(groups)))
+        self.release.wait(5)
+        return super().fetch_many(symbols, groups)
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+@pytest.mark.parametrize("text, symbols", [
+    ("aapl, msft", ["AAPL", "MSFT"]),
+    ("AAPL,,MSFT  nvda", ["AAPL", "MSFT", "NVDA"]),
+    ("aapl AAPL msft aapl", ["AAPL", "MSFT"]),
+    (" , ", []),
+])
+def test_parse_symbols(text, symbols):
+    assert parse_symbols(text) == symbols
+
+
+def test_watchlist_misses_are_one_upstream_batch_and_unknown_symbols_are_left_out():
+    provider = BatchProvider()
+    cache = QuoteCache(provider)
+
+    quotes = get_quotes(["AAPL", "NOPE", "MSFT"], cache)
+
+    assert list(quotes.index) == ["AAPL", "MSFT"]
+    assert list(quotes.columns) == list(QUOTE_COLUMNS)
+    assert provider.batches == [(["AAPL", "NOPE", "MSFT"], ALL_GROUPS)]
+    # Known and unknown symbols are both answered from the cache next time
+    get_quotes(["AAPL", "NOPE", "MSFT"], cache)
+    assert len(provider.batches) == 1
+
+
+def test_only_the_expired_field_groups_are_refreshed():
+    now = [0.0]
+    provider = BatchProvider()
+    cache = QuoteCache(provider, clock=lambda: now[0],
+                       ttls={"price": 10.0, "market_cap": 100.0, "fundamentals": 1000.0})
+    cache.get_many(["AAPL", "MSFT"])
+
+    now[0] += 150
+    cache.get_many(["AAPL", "MSFT"])
+    wait_for(lambda: cache.stats()["refreshes"] == 2)
+
+    assert provider.batches[1] == (["AAPL", "MSFT"], ("price", "market_cap"))
+
+
+def test_stale_quotes_are_served_while_they_revalidate():
+    now = [0.0]
+    provider = BatchProvider()
+    cache = QuoteCache(provider, clock=lambda: now[0])
+    before = cache.get_many(["AAPL"])
+
+    provider.release.clear()
+    now[0] += 20
+    # The refresh is still held upstream, yet the stale quote comes back at once
+    assert cache.get_many(["AAPL"]) == before
+    assert cache.get_many(["AAPL"]) == before
+    wait_for(lambda: len(provider.batches) == 2)
+    provider.release.set()
+    wait_for(lambda: cache.stats()["refreshes"] == 1)
+
+    assert len(provider.batches) == 2
+    assert cache.stats()["stale_hits"] == 2
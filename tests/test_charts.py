@@ -0,0 +1,31 @@
+import pytest
+
+from stock_tracker.charts import CHART_RANGES, MAX_CHART_POINTS, OVERLAYS, ChartService, chart_ranges
+from stock_tracker.history_store import MAX_HISTORY_DAYS, HistoryStore
+from stock_tracker.providers import DemoQuoteProvider
+
+NOW = 1_760_000_000
+
+
+def test_intraday_ranges_stay_within_the_provider_limits(tmp_path):
+    store = HistoryStore(str(tmp_path), DemoQuoteProvider(), clock=lambda: NOW)
+    service = ChartService(store)
+
+    assert chart_ranges("1d") == list(CHART_RANGES)
+    assert chart_ranges("1m") == ["5D", "1M"]
+    with pytest.raises(ValueError):
+        service.chart("AAPL", "1m", CHART_RANGES["10Y"])
+
+    assert service.chart("AAPL", "1m", CHART_RANGES["1M"]).bars > 0
+    assert store.coverage("AAPL", "1m")[0] >= NOW - MAX_HISTORY_DAYS["1m"] * 86400
+
+
+@pytest.mark.parametrize("overlays", [(), tuple(OVERLAYS)])
+def test_the_whole_chart_stays_within_the_point_budget(tmp_path, overlays):
+    store = HistoryStore(str(tmp_path), DemoQuoteProvider(), clock=lambda: NOW)
+    chart = ChartService(store).chart("AAPL", "1m", CHART_RANGES["1M"], overlays)
+
+    points = len(chart.price) + len(chart.volume) + len(chart.rsi)
+    assert chart.bars > MAX_CHART_POINTS
+    assert MAX_CHART_POINTS // 2 < points <= MAX_CHART_POINTS
+    assert set(chart.price["series"]) == {"Close", *(OVERLAYS[name] for name in overlays)}
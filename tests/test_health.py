@@ -0,0 +1,96 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from stock_tracker import quote_cache
+from stock_tracker.api import create_api
+from stock_tracker.health import evaluate_system_health
+from stock_tracker.providers import DemoQuoteProvider
+from stock_tracker.quote_cache import QuoteCache
+from stock_tracker.telemetry import Telemetry, format_duration, instrument
+
+
+def record(registry, name, seconds, count, ok=True):
+    for _ in range(count):
+        registry.record(name, seconds, ok)
+
+
+def test_idle_process_is_healthy_with_no_response_time():
+    health = evaluate_system_health(Telemetry())
+
+    assert health["status"] == "🟢 HEALTHY"
+    assert health["response_time"] == "N/A"
+    assert health["cache_hit_ratio"] == "0%"
+
+
+@pytest.mark.parametrize("handler, provider, status, api_status, data_feed", [
+    ((0.05, 0), (0.2, 0), "🟢 HEALTHY", "Online", "Connected"),
+    ((1.5, 0), (0.2, 0), "🟡 DEGRADED", "Limited", "Connected"),
+    ((0.05, 0), (3.0, 0), "🟡 DEGRADED", "Online", "Delayed"),
+    ((0.05, 10), (0.2, 0), "🟡 DEGRADED", "Limited", "Connected"),
+    ((0.05, 0), (0.2, 60), "🔴 DOWN", "Online", "Disconnected"),
+    ((0.05, 60), (0.2, 0), "🔴 DOWN", "Offline", "Connected"),
+])
+def test_status_follows_latency_and_error_rates(handler, provider, status, api_status, data_feed):
+    registry = Telemetry()
+    (handler_seconds, handler_errors), (provider_seconds, provider_errors) = handler, provider
+    record(registry, "search_stock", handler_seconds, 100 - handler_errors)
+    record(registry, "search_stock", handler_seconds, handler_errors, ok=False)
+    record(registry, "provider", provider_seconds, 100 - provider_errors)
+    record(registry, "provider", provider_seconds, provider_errors, ok=False)
+
+    health = evaluate_system_health(registry, {"hit_ratio": 0.75})
+
+    assert (health["status"], health["api_status"], health["data_feed"]) == (status, api_status, data_feed)
+    assert health["response_time"] == f"{format_duration(handler_seconds)} (p95 {format_duration(handler_seconds)})"
+    assert health["cache_hit_ratio"] == "75%"
+
+
+def test_samples_age_out_of_the_window():
+    now = [0.0]
+    registry = Telemetry(clock=lambda: now[0])
+    record(registry, "search_stock", 0.01, 10, ok=False)
+
+    now[0] += 301
+    assert evaluate_system_health(registry)["status"] == "🟢 HEALTHY"
+    assert registry.window("search_stock").errors == 10
+
+
+def test_instrument_records_failures_of_sync_and_async_handlers():
+    registry = Telemetry()
+
+    @instrument("sync", registry)
+    def sync_handler(fail):
+        if fail:
+            raise RuntimeError
+        return "ok"
+
+    @instrument("async", registry)
+    async def async_handler(fail):
+        if fail:
+            raise RuntimeError
+        return "ok"
+
+    assert sync_handler(False) == "ok"
+    assert asyncio.run(async_handler(False)) == "ok"
+    with pytest.raises(RuntimeError):
+        sync_handler(True)
+    with pytest.raises(RuntimeError):
+        asyncio.run(async_handler(True))
+
+    assert [registry.window(name).summary()["error_rate"] for name in ("sync", "async")] == [0.5, 0.5]
+
+
+def test_health_endpoint_reports_the_cache(monkeypatch):
+    cache = QuoteCache(DemoQuoteProvider())
+    monkeypatch.setattr(quote_cache, "_quote_cache", cache)
+    cache.get("AAPL")
+    cache.get("AAPL")
+
+    response = TestClient(create_api(mcp=False)).get("/health")
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "ok"
+    assert response.json()["cache"]["hits"] == 1
+    assert response.json()["cache"]["misses"] == 1
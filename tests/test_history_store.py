@@ -0,0 +1,99 @@
+import json
+import os
+
+import numpy as np
+
+from stock_tracker.history_store import HistoryStore, empty_bars
+from stock_tracker.providers import DemoQuoteProvider
+
+NOW = 1_760_000_000
+DAY = 86400
+
+
+class FlakyProvider(DemoQuoteProvider):
+    """Demo bars, except that the first few history requests come back empty"""
+    confirms_empty_history = False
+
+    def __init__(self, failures):
+        super().__init__()
+        self.failures = failures
+
+    def fetch_history(self, symbol, start, end, interval="1d"):
+        if self.failures:
+            self.failures -= 1
+            self.calls += 1
+            return empty_bars()
+        return super().fetch_history(symbol, start, end, interval)
+
+
+def test_empty_answer_does_not_mark_the_range_fetched(tmp_path):
+    store = HistoryStore(str(tmp_path), FlakyProvider(failures=1), clock=lambda: NOW)
+
+    assert len(store.history("AAPL", "1d", NOW - 90 * DAY, NOW)) == 0
+    assert store.coverage("AAPL", "1d") is None
+
+    bars = store.history("AAPL", "1d", NOW - 90 * DAY, NOW)
+    assert len(bars) > 0
+    assert store.coverage("AAPL", "1d") is not None
+    assert store.fetches == 2
+
+
+def test_empty_head_is_refetched_but_covered_tail_is_kept(tmp_path):
+    store = HistoryStore(str(tmp_path), FlakyProvider(failures=0), clock=lambda: NOW)
+    store.history("AAPL", "1d", NOW - 30 * DAY, NOW)
+    covered = store.coverage("AAPL", "1d")
+
+    store.provider.failures = 1
+    store.history("AAPL", "1d", NOW - 90 * DAY, NOW)
+    assert store.coverage("AAPL", "1d") == covered
+
+    store.history("AAPL", "1d", NOW - 90 * DAY, NOW)
+    assert store.coverage("AAPL", "1d")[0] == NOW - 90 * DAY
+    assert store.read("AAPL", "1d")["ts"][0] < covered[0]
+
+
+def test_confirmed_empty_range_is_not_refetched(tmp_path):
+    store = HistoryStore(str(tmp_path), DemoQuoteProvider(), clock=lambda: NOW)
+
+    for _ in range(3):
+        assert len(store.history("NOSUCH", "1d", NOW - 90 * DAY, NOW)) == 0
+    assert store.fetches == 1
+
+
+class RecordingProvider(DemoQuoteProvider):
+    """Demo bars that record the requested ranges"""
+
+    def __init__(self):
+        super().__init__()
+        self.ranges = []
+
+    def fetch_history(self, symbol, start, end, interval="1d"):
+        self.ranges.append((start, end))
+        return super().fetch_history(symbol, start, end, interval)
+
+
+def test_head_and_tail_backfills_merge_into_one_sorted_series(tmp_path):
+    now = [NOW]
+    provider = RecordingProvider()
+    store = HistoryStore(str(tmp_path / "pieces"), provider, clock=lambda: now[0])
+    store.history("AAPL", "1d", NOW - 30 * DAY, NOW)
+    store.history("AAPL", "1d", NOW - 90 * DAY, NOW)
+    now[0] += 20 * DAY
+    merged = np.asarray(store.history("AAPL", "1d", NOW - 90 * DAY, now[0]))
+
+    assert provider.ranges[1] == (NOW - 90 * DAY, NOW - 30 * DAY)
+    assert provider.ranges[2][0] == provider.ranges[0][1]
+    whole = HistoryStore(str(tmp_path / "whole"), DemoQuoteProvider(), clock=lambda: now[0])
+    assert np.array_equal(merged, whole.history("AAPL", "1d", NOW - 90 * DAY, now[0]))
+    assert np.all(np.diff(merged["ts"]) > 0)
+
+
+def test_coverage_sidecar_is_shared_with_later_stores(tmp_path):
+    HistoryStore(str(tmp_path), DemoQuoteProvider(), clock=lambda: NOW).history("AAPL", "1d", NOW - 90 * DAY, NOW)
+    with open(os.path.join(tmp_path, "AAPL", "1d.json")) as handle:
+        sidecar = json.load(handle)
+
+    store = HistoryStore(str(tmp_path), DemoQuoteProvider(), clock=lambda: NOW)
+    assert store.coverage("AAPL", "1d") == (sidecar["from"], sidecar["to"])
+    assert len(store.history("AAPL", "1d", NOW - 60 * DAY, NOW)) > 0
+    assert store.fetches == 0
@@ -0,0 +1,117 @@
+import builtins
+import math
+import time
+
+import numpy as np
+import pytest
+
+from stock_tracker.history_store import BAR_DTYPE, HistoryStore
+from stock_tracker.indicators import IndicatorEngine, IndicatorSnapshot, IndicatorState, compute_indicators
+from stock_tracker.providers import DemoQuoteProvider
+
+NOW = 1_760_000_000
+
+
+def make_engine(tmp_path, clock):
+    store = HistoryStore(str(tmp_path), DemoQuoteProvider(), clock=clock)
+    return IndicatorEngine(store), store
+
+
+def test_repeat_snapshot_is_answered_from_memory(tmp_path, monkeypatch):
+    engine, store = make_engine(tmp_path, lambda: NOW)
+    first = engine.snapshot("AAPL")
+    opened = []
+    real_open = builtins.open
+    monkeypatch.setattr(builtins, "open", lambda *args, **kwargs: opened.append(args[0]) or real_open(*args, **kwargs))
+
+    for _ in range(10):
+        assert engine.snapshot("AAPL") == first
+    assert opened == []
+    assert store.fetches == 1
+
+
+def test_refresh_folds_in_new_bars_once(tmp_path):
+    now = [NOW]
+    engine, store = make_engine(tmp_path, lambda: now[0])
+    first = engine.snapshot("AAPL")
+
+    now[0] += 7 * 86400
+    assert engine.refresh() > 0
+    assert engine.snapshot("AAPL").ts > first.ts
+    fetches = store.fetches
+    assert engine.refresh() == 0
+    assert store.fetches == fetches
+
+
+def demo_bars(days=400):
+    return DemoQuoteProvider().fetch_history("AAPL", NOW - days * 86400, NOW)
+
+
+def assert_matches_full_recompute(snapshot, close):
+    expected = compute_indicators(close).iloc[-1]
+    for field in IndicatorSnapshot.__slots__[1:]:
+        assert getattr(snapshot, field) == pytest.approx(expected[field], rel=1e-9, nan_ok=True), field
+
+
+@pytest.mark.parametrize("bars", [1, 2, 15, 20, 50, len(demo_bars())])
+def test_incremental_updates_match_the_vectorized_indicators(bars):
+    history = demo_bars()[:bars]
+    state = IndicatorState()
+    for ts, close in zip(history["ts"], history["close"]):
+        snapshot = state.update(ts, close)
+
+    assert_matches_full_recompute(snapshot, history["close"])
+
+
+def test_seeded_state_keeps_matching_as_bars_arrive():
+    history = demo_bars()
+    state = IndicatorState.from_bars(history[:-30])
+    assert_matches_full_recompute(state.snapshot(), history["close"][:-30])
+
+    for ts, close in zip(history["ts"][-30:], history["close"][-30:]):
+        snapshot = state.update(ts, close)
+    assert_matches_full_recompute(snapshot, history["close"])
+
+
+def test_flat_and_rising_series_have_defined_rsi():
+    state = IndicatorState()
+    for ts in range(20):
+        state.update(ts, 10.0)
+    assert state.snapshot().rsi_14 == 50.0
+    assert state.snapshot().bb_upper == state.snapshot().bb_lower == 10.0
+
+    for ts in range(20, 40):
+        state.update(ts, float(ts))
+    assert state.snapshot().rsi_14 == 100.0
+    assert math.isnan(state.snapshot().sma_50)
+
+
+def test_pushed_bars_apply_once_and_in_order(tmp_path):
+    engine, _ = make_engine(tmp_path, lambda: NOW)
+    bars = np.zeros(3, dtype=BAR_DTYPE)
+    bars["ts"] = [1, 2, 3]
+    bars["close"] = [10.0, 11.0, 12.0]
+
+    engine.push("AAPL", "1m", bars[:2])
+    snapshot = engine.push("AAPL", "1m", bars)
+
+    assert (snapshot.ts, snapshot.close) == (3, 12.0)
+    assert engine.stats()["bars_applied"] == 3
+    assert engine.latest("AAPL", "1m").ts == 3
+    assert engine.latest("MSFT", "1m") is None
+
+
+def test_tracked_series_advance_on_their_own(tmp_path):
+    now = [NOW]
+    store = HistoryStore(str(tmp_path), DemoQuoteProvider(), clock=lambda: now[0])
+    engine = IndicatorEngine(store, interval=0.01)
+    first = engine.snapshot("AAPL")
+
+    # No recommendation engine is running; the indicator engine's own pass picks up the new bars
+    now[0] += 7 * 86400
+    deadline = time.monotonic() + 5
+    while engine.latest("AAPL").ts == first.ts:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    engine.stop()
+    assert engine.latest("AAPL").ts > first.ts
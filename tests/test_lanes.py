@@ -0,0 +1,76 @@
+import threading
+import uuid
+
+import gradio as gr
+import requests
+
+from stock_tracker import lanes as lanes_module
+from stock_tracker.lanes import BATCH_LANE, FAST_LANE, UPSTREAM_LANE, install_lanes, lane, stream_slots
+
+LANES = {FAST_LANE: (2, 8), UPSTREAM_LANE: (1, 1), BATCH_LANE: (1, 4)}
+
+
+def join(base_url, fn_index, session):
+    return requests.post(f"{base_url}gradio_api/queue/join", timeout=5,
+                         json={"data": ["x"], "fn_index": fn_index, "session_hash": session, "trigger_id": None})
+
+
+def wait_completed(base_url, session):
+    with requests.get(f"{base_url}gradio_api/queue/data", params={"session_hash": session}, stream=True,
+                      timeout=10) as response:
+        for line in response.iter_lines():
+            if b'"process_completed"' in line:
+                return b'"success":true' in line
+
+
+def test_events_run_in_their_lane_with_its_limits(monkeypatch):
+    monkeypatch.setenv("STOCK_STREAM_SLOTS", "10")
+    release = threading.Event()
+    started = threading.Semaphore(0)
+    running = [0, 0]
+
+    def upstream(text):
+        running[0] += 1
+        running[1] = max(running)
+        started.release()
+        release.wait(5)
+        running[0] -= 1
+        return text
+
+    with gr.Blocks() as blocks:
+        box = gr.Textbox()
+        gr.Button().click(upstream, box, box, **lane(UPSTREAM_LANE, LANES))
+        gr.Button().click(lambda text: text, box, box, **lane(FAST_LANE, LANES))
+    install_lanes(blocks, LANES)
+    upstream_index, fast_index = 0, 1
+
+    assert [fn.concurrency_id for fn in blocks.fns.values()] == [UPSTREAM_LANE, FAST_LANE]
+    assert [fn.concurrency_limit for fn in blocks.fns.values()] == [1, 2]
+    assert blocks.max_threads >= sum(workers for workers, _ in LANES.values())
+    assert blocks._queue.max_thread_count == blocks.max_threads + stream_slots() == blocks.max_threads + 10
+
+    _, base_url, _ = blocks.launch(prevent_thread_lock=True, quiet=True)
+    try:
+        sessions = [uuid.uuid4().hex for _ in range(3)]
+        assert join(base_url, upstream_index, sessions[0]).status_code == 200
+        assert started.acquire(timeout=5)
+        # One upstream event runs and one waits; the lane holds no more
+        assert join(base_url, upstream_index, sessions[1]).status_code == 200
+        rejections = lanes_module.queue_rejections[UPSTREAM_LANE]
+        assert join(base_url, upstream_index, sessions[2]).status_code == 503
+        assert lanes_module.queue_rejections[UPSTREAM_LANE] == rejections + 1
+
+        # The fast lane is unaffected by the saturated upstream lane
+        fast_session = uuid.uuid4().hex
+        assert join(base_url, fast_index, fast_session).status_code == 200
+        assert wait_completed(base_url, fast_session)
+        assert not release.is_set()
+
+        release.set()
+        assert wait_completed(base_url, sessions[0]) and wait_completed(base_url, sessions[1])
+        assert running[1] == 1
+        assert FAST_LANE in lanes_module.queue_waits.names()
+        assert UPSTREAM_LANE in lanes_module.queue_waits.names()
+    finally:
+        release.set()
+        blocks.close()
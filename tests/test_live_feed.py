@@ -0,0 +1,60 @@
+import asyncio
+
+from stock_tracker.live_feed import SimulatedTickSource, Tick, TickHub
+from stock_tracker.providers import DemoQuoteProvider
+from stock_tracker.quote_cache import QuoteCache
+
+
+class CountingSource:
+    """Ticks with a price that rises on every poll"""
+
+    def __init__(self):
+        self.polls = 0
+        self.released = []
+
+    async def next_tick(self, symbol):
+        self.polls += 1
+        return Tick(symbol, 100.0 + self.polls, float(self.polls), float(self.polls), 1000)
+
+    def release(self, symbol):
+        self.released.append(symbol)
+
+
+async def take(stream, count):
+    ticks = []
+    async for tick in stream:
+        ticks.append(tick)
+        if len(ticks) == count:
+            break
+    await stream.aclose()
+    return ticks
+
+
+def test_viewers_of_a_symbol_share_one_feed_that_stops_with_the_last_viewer():
+    async def scenario():
+        source = CountingSource()
+        published = []
+        hub = TickHub(source, interval=0.01, listeners=[published.append])
+        first, second = await asyncio.gather(take(hub.stream("AAPL"), 3), take(hub.stream("AAPL"), 3))
+
+        assert hub.stats()["symbols"] == 0
+        assert source.released == ["AAPL"]
+        polls = source.polls
+        await asyncio.sleep(0.05)
+        # The producer was cancelled with the last viewer
+        assert source.polls == polls
+        # Both viewers saw the same ticks from the one producer
+        assert first == second
+        assert published[:3] == first
+
+    asyncio.run(scenario())
+
+
+def test_simulated_ticks_forget_symbols_nobody_streams():
+    async def scenario():
+        source = SimulatedTickSource(QuoteCache(DemoQuoteProvider()), seed=1)
+        hub = TickHub(source, interval=0.01)
+        await take(hub.stream("AAPL"), 2)
+        assert source._last == {}
+
+    asyncio.run(scenario())
@@ -0,0 +1,62 @@
+from datetime import datetime
+
+import pytest
+
+from stock_tracker.market_calendar import ET, MarketCalendar
+
+CALENDAR = MarketCalendar(2021, 2027)
+
+
+def at(*moment):
+    return ET.localize(datetime(*moment)).timestamp()
+
+
+@pytest.mark.parametrize("moment, phase, holiday, next_session", [
+    # Good Friday: Easter 2025 is April 20
+    ((2025, 4, 18, 11, 0), "closed", "Good Friday", "Closed for Good Friday • Opens Monday 9:30 AM ET"),
+    ((2025, 4, 17, 11, 0), "open", None, "Closes 4:00 PM ET"),
+    # Juneteenth is a closure from 2022 on
+    ((2025, 6, 19, 11, 0), "closed", "Juneteenth", "Closed for Juneteenth • Opens Tomorrow 9:30 AM ET"),
+    ((2021, 6, 18, 11, 0), "open", None, "Closes 4:00 PM ET"),
+    # July 4th on a Saturday closes the Friday, which is then not an early close
+    ((2026, 7, 3, 11, 0), "closed", "Independence Day", "Closed for Independence Day • Opens Monday 9:30 AM ET"),
+    ((2026, 7, 2, 15, 0), "open", None, "Closes 4:00 PM ET"),
+    # July 4th on a Sunday closes the Monday
+    ((2027, 7, 5, 11, 0), "closed", "Independence Day", "Closed for Independence Day • Opens Tomorrow 9:30 AM ET"),
+    # The day after Thanksgiving closes at 1:00 PM with after-hours until 5:00 PM
+    ((2025, 11, 28, 12, 0), "open", None, "Closes 1:00 PM ET (early close)"),
+    ((2025, 11, 28, 13, 30), "after-hours", None, "Monday 9:30 AM ET"),
+    ((2025, 11, 28, 17, 30), "closed", None, "Monday 9:30 AM ET"),
+    # Friday evening and the weekend wait for Monday's open
+    ((2025, 10, 17, 21, 0), "closed", None, "Monday 9:30 AM ET"),
+    ((2025, 10, 19, 12, 0), "closed", None, "Tomorrow 9:30 AM ET"),
+    ((2025, 10, 20, 4, 0), "pre-market", None, "Today 9:30 AM ET"),
+    # Spring forward (March 9, 2025): sessions keep Eastern wall-clock hours
+    ((2025, 3, 7, 16, 30), "after-hours", None, "Monday 9:30 AM ET"),
+    ((2025, 3, 10, 9, 29), "pre-market", None, "Today 9:30 AM ET"),
+    ((2025, 3, 10, 9, 30), "open", None, "Closes 4:00 PM ET"),
+    # Fall back (November 2, 2025)
+    ((2025, 10, 31, 20, 0), "closed", None, "Monday 9:30 AM ET"),
+    ((2025, 11, 3, 9, 30), "open", None, "Closes 4:00 PM ET"),
+    ((2025, 11, 3, 16, 0), "after-hours", None, "Tomorrow 9:30 AM ET"),
+])
+def test_status(moment, phase, holiday, next_session):
+    status = CALENDAR.status(at(*moment))
+
+    assert status["phase"] == phase
+    assert status["is_open"] == (phase == "open")
+    assert status["holiday"] == holiday
+    assert status["next_session"] == next_session
+
+
+def test_sessions_shift_with_the_utc_offset_across_dst():
+    # 9:30 ET is 14:30 UTC in winter and 13:30 UTC in summer
+    assert at(2025, 3, 7, 9, 30) % 86400 == 14 * 3600 + 1800
+    assert at(2025, 3, 10, 9, 30) % 86400 == 13 * 3600 + 1800
+    assert CALENDAR.status(at(2025, 3, 10, 9, 30) - 3600)["phase"] == "pre-market"
+    assert CALENDAR.status(at(2025, 11, 3, 9, 30) - 1)["phase"] == "pre-market"
+
+
+def test_lookups_outside_the_calendar_fail():
+    with pytest.raises(LookupError):
+        CALENDAR.status(at(2020, 6, 1, 12, 0))
@@ -0,0 +1,100 @@
+import asyncio
+import json
+import math
+from dataclasses import replace
+
+import pytest
+
+from stock_tracker import history_store, mcp_server, quote_cache
+from stock_tracker import indicators as indicators_module
+from stock_tracker.history_store import HistoryStore
+from stock_tracker.indicators import IndicatorEngine
+from stock_tracker.providers import DemoQuoteProvider
+from stock_tracker.quote_cache import QuoteCache
+from stock_tracker.quote_store import DEMO_QUOTES, QuoteStore
+
+NOW = 1_760_000_000
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = HistoryStore(str(tmp_path), DemoQuoteProvider(), clock=lambda: NOW)
+    monkeypatch.setattr(history_store, "_history_store", store)
+    return store
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    # One unprofitable company, whose P/E is unknown
+    quotes = QuoteStore(DEMO_QUOTES + (replace(DEMO_QUOTES[0], symbol="LOSS", pe_ratio=math.nan),))
+    cache = QuoteCache(DemoQuoteProvider(quotes))
+    monkeypatch.setattr(quote_cache, "_quote_cache", cache)
+    return cache
+
+
+def call(name, arguments):
+    """Call a tool through the MCP server and decode its JSON result"""
+    content = asyncio.run(mcp_server.mcp_server.call_tool(name, arguments))
+    return json.loads(content[0].text)
+
+
+def test_every_tool_is_registered():
+    tools = asyncio.run(mcp_server.mcp_server.list_tools())
+
+    assert {tool.name for tool in tools} == {"get_quote", "get_quotes", "get_history", "get_indicators",
+                                             "screen_stocks", "market_status"}
+
+
+def test_quote_tools_share_the_cache_and_report_unknown_symbols(cache):
+    quote = call("get_quote", {"symbol": " aapl "})
+    batch = call("get_quotes", {"symbols": ["AAPL", "msft", "NOPE", "AAPL"]})
+
+    assert quote["symbol"] == "AAPL"
+    assert quote["recommendation"] in ("BUY", "HOLD", "SELL")
+    assert "version" not in quote
+    assert list(batch["quotes"]) == ["AAPL", "MSFT"]
+    assert batch["quotes"]["AAPL"] == quote
+    assert batch["not_found"] == ["NOPE"]
+    assert cache.stats()["misses"] == 3
+
+
+def test_missing_values_are_null_in_tool_results(cache):
+    assert call("get_quote", {"symbol": "LOSS"})["pe_ratio"] is None
+
+
+def test_bad_arguments_are_tool_errors(cache):
+    with pytest.raises(Exception, match="Unknown symbol"):
+        call("get_quote", {"symbol": "NOPE"})
+    with pytest.raises(Exception, match="must not be empty"):
+        call("get_quote", {"symbol": "  "})
+    with pytest.raises(Exception, match="At most"):
+        call("get_quotes", {"symbols": [f"S{i}" for i in range(mcp_server.MAX_BATCH_SYMBOLS + 1)]})
+
+
+def test_indicators_and_market_status(store, monkeypatch):
+    monkeypatch.setattr(indicators_module, "_indicator_engine", IndicatorEngine(store))
+    indicators = call("get_indicators", {"symbol": "AAPL"})
+    status = call("market_status", {})
+
+    assert indicators["symbol"] == "AAPL"
+    assert indicators["ts"] < NOW
+    assert indicators["sma_50"] is not None
+    assert status["phase"] in ("open", "pre-market", "after-hours", "closed")
+
+
+def test_history_days_are_capped_before_fetching(store):
+    result = asyncio.run(mcp_server.get_history("AAPL", "1m", days=3650))
+
+    assert result["days"] == 30
+    assert store.coverage("AAPL", "1m")[0] >= NOW - 30 * 86400
+    assert 0 < result["count"] <= mcp_server.MAX_HISTORY_BARS
+
+
+def test_unknown_intervals_are_rejected(store):
+    with pytest.raises(ValueError):
+        asyncio.run(mcp_server.get_history("AAPL", "2h"))
+    with pytest.raises(ValueError):
+        asyncio.run(mcp_server.get_indicators("AAPL", "2h"))
+    with pytest.raises(ValueError):
+        asyncio.run(mcp_server.get_history("AAPL", "1d", days=0))
+    assert store.fetches == 0
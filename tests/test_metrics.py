@@ -0,0 +1,66 @@
+from collections import Counter
+
+from fastapi.testclient import TestClient
+
+from stock_tracker import quote_cache
+from stock_tracker.api import create_api
+from stock_tracker.metrics import PROMETHEUS_CONTENT_TYPE, REPORTED_HANDLERS, render_metrics
+from stock_tracker.providers import DemoQuoteProvider
+from stock_tracker.quote_cache import QuoteCache
+from stock_tracker.telemetry import Telemetry
+
+
+def samples(text):
+    """{name{labels}: value} of every sample line"""
+    lines = [line for line in text.splitlines() if line and not line.startswith("#")]
+    return {name: float(value) for name, value in (line.rsplit(" ", 1) for line in lines)}
+
+
+def test_handlers_are_reported_as_counters_and_cumulative_histograms():
+    registry = Telemetry()
+    for seconds in (0.002, 0.03, 0.03, 4.0):
+        registry.record("search_stock", seconds)
+    registry.record("search_stock", 0.03, ok=False)
+
+    text = render_metrics(registry, waits=Telemetry(), rejections=Counter())
+    metrics = samples(text)
+
+    assert "# TYPE stock_tracker_request_duration_seconds histogram" in text
+    assert metrics['stock_tracker_requests_total{handler="search_stock",outcome="success"}'] == 4
+    assert metrics['stock_tracker_requests_total{handler="search_stock",outcome="error"}'] == 1
+    bucket = 'stock_tracker_request_duration_seconds_bucket{{le="{}",handler="search_stock"}}'
+    assert metrics[bucket.format("0.0025")] == 1
+    assert metrics[bucket.format("0.05")] == 4
+    assert metrics[bucket.format("2.5")] == 4
+    assert metrics[bucket.format("+Inf")] == 5
+    assert metrics['stock_tracker_request_duration_seconds_count{handler="search_stock"}'] == 5
+    # Handlers that were never called still show up, at zero
+    for name in REPORTED_HANDLERS:
+        assert metrics[f'stock_tracker_requests_total{{handler="{name}",outcome="success"}}'] >= 0
+
+
+def test_cache_and_queue_statistics_are_reported():
+    cache = QuoteCache(DemoQuoteProvider())
+    cache.get("AAPL")
+    cache.get("AAPL")
+    waits = Telemetry()
+    waits.record("upstream", 0.2)
+
+    metrics = samples(render_metrics(Telemetry(), cache=cache, waits=waits, rejections=Counter(upstream=3)))
+
+    assert metrics["stock_tracker_cache_hits_total"] == 1
+    assert metrics["stock_tracker_cache_misses_total"] == 1
+    assert metrics["stock_tracker_cache_entries"] == 1
+    assert metrics['stock_tracker_queue_wait_seconds_count{concurrency_id="upstream"}'] == 1
+    assert metrics['stock_tracker_queue_rejected_total{concurrency_id="upstream"}'] == 3
+
+
+def test_data_api_serves_metrics_in_the_prometheus_format(monkeypatch):
+    monkeypatch.setattr(quote_cache, "_quote_cache", QuoteCache(DemoQuoteProvider()))
+
+    response = TestClient(create_api(mcp=False)).get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == PROMETHEUS_CONTENT_TYPE
+    assert "stock_tracker_uptime_seconds" in response.text
+    assert 'stock_tracker_upstream_requests_total{provider="demo",outcome="success"}' in response.text
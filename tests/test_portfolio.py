@@ -0,0 +1,58 @@
+import math
+
+import pytest
+
+from stock_tracker import portfolio as portfolio_module
+from stock_tracker.portfolio import Portfolio, PortfolioStore, get_portfolio, release_portfolio
+from stock_tracker.providers import DemoQuoteProvider
+from stock_tracker.quote_cache import QuoteCache
+
+
+def test_sessions_get_separate_portfolios_released_when_they_end(monkeypatch):
+    store = PortfolioStore(":memory:")
+    monkeypatch.setattr(portfolio_module, "_store", store)
+    monkeypatch.setattr(portfolio_module, "_portfolios", {})
+
+    # Looking at an empty portfolio keeps nothing loaded
+    assert get_portfolio("session:a", create=False).symbols() == []
+    assert portfolio_module._portfolios == {}
+
+    mine = get_portfolio("session:a")
+    mine.cache = QuoteCache(DemoQuoteProvider())
+    mine.trade("AAPL", 10, 100.0)
+    assert get_portfolio("session:a", create=False) is mine
+    assert get_portfolio("session:b", create=False).symbols() == []
+
+    release_portfolio("session:a", delete=True)
+    assert portfolio_module._portfolios == {}
+    assert store.load("session:a") == []
+
+
+def test_running_totals_match_a_fresh_sum_of_the_holdings():
+    store = PortfolioStore(":memory:")
+    portfolio = Portfolio("test", store, QuoteCache(DemoQuoteProvider()))
+    for step in range(3000):
+        symbol = ("AAPL", "MSFT", "GOOGL")[step % 3]
+        portfolio.trade(symbol, -0.05 if step % 5 == 4 else 0.1, 100.0 + step * 0.37)
+
+    # Loading sums the stored positions from scratch
+    reloaded = Portfolio("test", store)
+    assert reloaded.cost == math.fsum(position.quantity * position.avg_cost for position in store.load("test"))
+    assert math.isclose(portfolio.cost, reloaded.cost, rel_tol=1e-12)
+    assert math.isclose(portfolio.realized, reloaded.realized, rel_tol=1e-12)
+    assert portfolio.open_positions == reloaded.open_positions == 3
+
+
+def test_rejected_sells_leave_the_portfolio_unchanged():
+    store = PortfolioStore(":memory:")
+    portfolio = Portfolio("test", store, QuoteCache(DemoQuoteProvider()))
+    portfolio.trade("AAPL", 5, 100.0)
+    before = portfolio.summary(), portfolio.revision
+
+    for symbol, quantity in (("MSFT", -1), ("AAPL", -6)):
+        with pytest.raises(ValueError, match="Cannot sell"):
+            portfolio.trade(symbol, quantity, 100.0)
+
+    assert portfolio.symbols() == ["AAPL"]
+    assert (portfolio.summary(), portfolio.revision) == before
+    assert [position.symbol for position in store.load("test")] == ["AAPL"]
@@ -0,0 +1,143 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import aiohttp
+import pytest
+import requests
+
+from stock_tracker.providers import HttpQuoteProvider
+
+
+class StubServer:
+    """Local HTTP server answering each request with the next scripted status"""
+
+    def __init__(self, statuses):
+        self.statuses = list(statuses)
+        self.requests = 0
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub.requests += 1
+                status = stub.statuses.pop(0) if stub.statuses else 200
+                body = json.dumps({"price": 1.0} if status == 200 else {"detail": "stub"}).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stub():
+    servers = []
+
+    def start(*statuses):
+        servers.append(StubServer(statuses))
+        return servers[-1]
+
+    yield start
+    for server in servers:
+        server.close()
+
+
+def afetch(provider):
+    async def run():
+        try:
+            return await provider.afetch("AAPL")
+        finally:
+            await provider.aclose()
+
+    return asyncio.run(run())
+
+
+def test_client_errors_are_not_retried(stub):
+    server = stub(400)
+    provider = HttpQuoteProvider(server.url, backoff=0)
+
+    with pytest.raises(aiohttp.ClientResponseError) as raised:
+        afetch(provider)
+    assert raised.value.status == 400
+    assert server.requests == 1 and provider.retried == 0
+
+
+def test_retryable_statuses_are_retried_until_success(stub):
+    server = stub(503, 429)
+    provider = HttpQuoteProvider(server.url, backoff=0)
+
+    assert afetch(provider) == {"price": 1.0}
+    assert server.requests == 3 and provider.retried == 2
+
+
+def test_retries_give_up_with_the_last_status(stub):
+    server = stub(502, 502, 502)
+    provider = HttpQuoteProvider(server.url, retries=2, backoff=0)
+
+    with pytest.raises(aiohttp.ClientResponseError) as raised:
+        afetch(provider)
+    assert raised.value.status == 502
+    assert server.requests == 3
+
+
+def test_unknown_symbol_is_none(stub):
+    assert afetch(HttpQuoteProvider(stub(404).url, backoff=0)) is None
+
+
+def test_connection_errors_are_retried(stub):
+    server = stub()
+    url = server.url
+    server.close()
+    provider = HttpQuoteProvider(url, retries=2, backoff=0)
+
+    with pytest.raises(aiohttp.ClientConnectionError):
+        afetch(provider)
+    assert provider.retried == 2
+
+
+def test_blocking_path_retries_only_listed_statuses(stub):
+    server = stub(400)
+    with pytest.raises(requests.HTTPError):
+        HttpQuoteProvider(server.url, backoff=0).fetch("AAPL")
+    assert server.requests == 1
+
+    server = stub(503)
+    assert HttpQuoteProvider(server.url, backoff=0).fetch("AAPL") == {"price": 1.0}
+    assert server.requests == 2
+
+
+@pytest.mark.parametrize("status", HttpQuoteProvider.RETRY_STATUSES)
+def test_every_listed_status_is_retried_on_both_paths(stub, status):
+    server = stub(status)
+    assert afetch(HttpQuoteProvider(server.url, backoff=0)) == {"price": 1.0}
+    assert server.requests == 2
+
+    server = stub(status)
+    assert HttpQuoteProvider(server.url, backoff=0).fetch("AAPL") == {"price": 1.0}
+    assert server.requests == 2
+
+
+@pytest.mark.parametrize("status", [401, 403, 409, 501])
+def test_unlisted_errors_fail_on_the_first_attempt_on_both_paths(stub, status):
+    server = stub(status)
+    provider = HttpQuoteProvider(server.url, backoff=0)
+    with pytest.raises(aiohttp.ClientResponseError):
+        afetch(provider)
+    assert server.requests == 1 and provider.retried == 0
+
+    server = stub(status)
+    with pytest.raises(requests.HTTPError):
+        HttpQuoteProvider(server.url, backoff=0).fetch("AAPL")
+    assert server.requests == 1
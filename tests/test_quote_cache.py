@@ -0,0 +1,145 @@
+import threading
+import time
+from dataclasses import replace
+
+from stock_tracker.providers import ALL_GROUPS, DemoQuoteProvider
+from stock_tracker.quote_cache import QuoteCache
+
+
+class GatedProvider(DemoQuoteProvider):
+    """Demo quotes whose batch fetches block until released"""
+
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+        self.batches = []
+
+    def fetch_many(self, symbols, groups=ALL_GROUPS):
+        self.batches.append(list(symbols))
+        self.release.wait(5)
+        return super().fetch_many(symbols, groups)
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_cached_reads_load_misses_in_the_background():
+    provider = GatedProvider()
+    cache = QuoteCache(provider)
+
+    assert cache.get_cached_many(["AAPL", "MSFT"]) == {}
+    # Still loading: no second batch for the same symbols
+    assert cache.get_cached_many(["AAPL", "MSFT"]) == {}
+    provider.release.set()
+    wait_for(lambda: cache.peek("AAPL") is not None and cache.peek("MSFT") is not None)
+
+    assert provider.batches == [["AAPL", "MSFT"]]
+    assert set(cache.get_cached_many(["AAPL", "MSFT"])) == {"AAPL", "MSFT"}
+
+
+class CountingProvider(DemoQuoteProvider):
+    """Demo quotes that record single and batch fetches"""
+
+    def __init__(self):
+        super().__init__()
+        self.singles = []
+        self.batches = []
+
+    def fetch(self, symbol, groups=ALL_GROUPS):
+        self.singles.append(symbol)
+        return super().fetch(symbol, groups)
+
+    def fetch_many(self, symbols, groups=ALL_GROUPS):
+        self.batches.append((list(symbols), tuple(groups)))
+        return {symbol: self._fields(symbol, groups) for symbol in symbols}
+
+
+def test_stale_symbols_refresh_in_one_batch():
+    now = [0.0]
+    provider = CountingProvider()
+    cache = QuoteCache(provider, clock=lambda: now[0])
+    symbols = ["AAPL", "MSFT", "GOOGL"]
+    before = cache.get_many(symbols)
+
+    now[0] += 20
+    assert cache.get_many(symbols) == before
+    wait_for(lambda: cache.stats()["refreshes"] == len(symbols))
+
+    assert provider.singles == []
+    assert provider.batches == [(symbols, ALL_GROUPS), (symbols, ("price",))]
+
+
+def test_fresh_quotes_are_served_until_their_ttl_expires():
+    now = [0.0]
+    provider = CountingProvider()
+    cache = QuoteCache(provider, clock=lambda: now[0], ttls={"price": 10.0})
+    first = cache.get("AAPL")
+
+    now[0] += 9
+    assert cache.get("AAPL") is first
+    assert provider.singles == ["AAPL"]
+
+    now[0] += 1
+    # Stale: served as is while the price group refreshes in the background
+    assert cache.get("AAPL") is first
+    wait_for(lambda: cache.stats()["refreshes"] == 1)
+    assert provider.singles == ["AAPL", "AAPL"]
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["stale_hits"] == 1
+
+
+def test_an_unchanged_refresh_keeps_the_version():
+    now = [0.0]
+    provider = CountingProvider()
+    cache = QuoteCache(provider, clock=lambda: now[0])
+    first = cache.get("AAPL")
+
+    now[0] += 20
+    cache.get("AAPL")
+    wait_for(lambda: cache.stats()["refreshes"] == 1)
+    assert cache.peek("AAPL").version == first.version
+
+    provider.store.put(replace(provider.store.get("AAPL"), price=first.price + 1))
+    now[0] += 20
+    cache.get("AAPL")
+    wait_for(lambda: cache.stats()["refreshes"] == 2)
+    assert cache.peek("AAPL").version != first.version
+    assert cache.peek("AAPL").price == first.price + 1
+
+
+class SlowProvider(DemoQuoteProvider):
+    """Demo quotes whose single fetches block until released"""
+
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+        self.started = threading.Event()
+        self.singles = []
+
+    def fetch(self, symbol, groups=ALL_GROUPS):
+        self.singles.append(symbol)
+        self.started.set()
+        self.release.wait(5)
+        return super().fetch(symbol, groups)
+
+
+def test_concurrent_misses_share_one_fetch():
+    provider = SlowProvider()
+    cache = QuoteCache(provider)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get("AAPL"))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    provider.started.wait(5)
+    wait_for(lambda: cache.stats()["coalesced"] == len(threads) - 1)
+    provider.release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert provider.singles == ["AAPL"]
+    assert len(results) == len(threads)
+    assert all(quote is results[0] for quote in results)
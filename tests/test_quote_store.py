@@ -0,0 +1,42 @@
+import math
+from dataclasses import FrozenInstanceError, replace
+
+import pytest
+
+from stock_tracker.quote_store import DEMO_QUOTES, QuoteStore, format_compact, next_version, quote_store
+
+
+def test_store_replaces_quotes_and_keeps_first_insertion_order():
+    store = QuoteStore(DEMO_QUOTES[:3])
+    first = DEMO_QUOTES[0]
+
+    store.put(replace(first, price=first.price + 1))
+
+    assert store.symbols() == tuple(quote.symbol for quote in DEMO_QUOTES[:3])
+    assert store.get(first.symbol).price == first.price + 1
+    assert len(store) == 3
+    assert first.symbol in store
+    assert store.get("ZZZZ") is None
+
+
+def test_shared_store_holds_the_demo_universe_and_quotes_are_immutable():
+    assert quote_store.symbols() == tuple(quote.symbol for quote in DEMO_QUOTES)
+    with pytest.raises(FrozenInstanceError):
+        quote_store.get("AAPL").price = 0.0
+
+
+def test_versions_increase():
+    assert next_version() < next_version()
+
+
+@pytest.mark.parametrize("value, text", [
+    (2.95e12, "2.95T"),
+    (793e9, "793B"),
+    (45_200_000, "45.2M"),
+    (1_500, "1.50K"),
+    (999, "999"),
+    (-12_300_000, "-12.3M"),
+    (math.nan, "N/A"),
+])
+def test_format_compact(value, text):
+    assert format_compact(value) == text
@@ -0,0 +1,68 @@
+import math
+from dataclasses import replace
+
+from stock_tracker.quote_store import DEMO_QUOTES, next_version
+from stock_tracker.render import (
+    RenderMemo,
+    render_search_results,
+    render_search_results_not_found,
+    render_stock_report,
+)
+from stock_tracker.symbol_index import Listing
+
+QUOTE = DEMO_QUOTES[0]
+
+
+def test_memo_renders_once_per_quote_version_and_extra_inputs():
+    memo = RenderMemo()
+    calls = []
+
+    def render(quote, recommendation):
+        calls.append((quote.version, recommendation))
+        return f"{quote.price} {recommendation}"
+
+    first = memo.get_or_render(QUOTE, render, "BUY")
+    assert memo.get_or_render(QUOTE, render, "BUY") is first
+    memo.get_or_render(QUOTE, render, "SELL")
+    newer = replace(QUOTE, price=QUOTE.price + 1, version=next_version())
+    assert memo.get_or_render(newer, render, "BUY") == f"{newer.price} BUY"
+
+    assert calls == [(QUOTE.version, "BUY"), (QUOTE.version, "SELL"), (newer.version, "BUY")]
+    assert (memo.hits, memo.misses) == (1, 3)
+
+
+def test_memo_is_bounded():
+    memo = RenderMemo(max_size=2)
+    quotes = [replace(QUOTE, version=next_version()) for _ in range(3)]
+    for quote in quotes:
+        memo.get_or_render(quote, lambda quote: quote.version)
+
+    memo.get_or_render(quotes[0], lambda quote: quote.version)
+    assert memo.misses == 4
+
+
+def test_search_results_show_the_quote_and_its_classification():
+    stock_info, analysis, quick_stats, status = render_search_results(QUOTE, "SELL")
+
+    assert f"({QUOTE.symbol})" in stock_info
+    assert f"${QUOTE.price}" in stock_info
+    assert "45.2M" in stock_info and "2.95T" in stock_info
+    assert "SELL" in analysis
+    assert "**Volatility**: 📊 Moderate" in analysis
+    assert "**Growth Potential**: High" in analysis
+    assert "#10b981" in quick_stats
+    assert QUOTE.symbol in status
+
+
+def test_missing_pe_renders_as_not_available():
+    report = render_stock_report(replace(QUOTE, pe_ratio=math.nan, version=next_version()))
+
+    assert "N/A" in report
+    assert "nan" not in report
+
+
+def test_not_found_panels_include_suggestions():
+    stock_info, *_ = render_search_results_not_found("APPL", (Listing("AAPL", "Apple Inc."),))
+
+    assert "APPL" in stock_info
+    assert "**AAPL** (Apple Inc.)" in stock_info
@@ -0,0 +1,43 @@
+import time
+
+from stock_tracker.history_store import HistoryStore
+from stock_tracker.indicators import IndicatorEngine
+from stock_tracker.providers import ALL_GROUPS, DemoQuoteProvider
+from stock_tracker.quote_cache import QuoteCache
+from stock_tracker.quote_store import quote_store
+from stock_tracker.recommendations import RecommendationEngine
+from stock_tracker.screener import Screener
+
+
+class CountingProvider(DemoQuoteProvider):
+    def __init__(self):
+        super().__init__()
+        self.requests = 0
+
+    def fetch(self, symbol, groups=ALL_GROUPS):
+        self.requests += 1
+        return super().fetch(symbol, groups)
+
+    def fetch_many(self, symbols, groups=ALL_GROUPS):
+        self.requests += 1
+        return {symbol: self._fields(symbol, groups) for symbol in symbols if symbol in quote_store}
+
+
+def test_refresh_of_a_stale_universe_is_one_upstream_request(tmp_path):
+    now = [0.0]
+    provider = CountingProvider()
+    cache = QuoteCache(provider, clock=lambda: now[0])
+    indicators = IndicatorEngine(HistoryStore(str(tmp_path), provider))
+    universe = list(quote_store.symbols())
+    screener = Screener(cache, indicators, RecommendationEngine(cache, indicators), universe=universe)
+
+    screener.refresh()
+    assert provider.requests == 1
+
+    now[0] += 20
+    screener.refresh()
+    deadline = time.monotonic() + 5
+    while cache._refreshing and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert provider.requests == 2
+    assert screener.stats()["symbols"] == len(universe)
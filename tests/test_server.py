@@ -0,0 +1,14 @@
+from fastapi.testclient import TestClient
+
+import app
+from stock_tracker.server import create_server
+
+
+def test_mounted_interface_keeps_its_stylesheet_and_theme():
+    server = create_server(app.create_interface(), css=app.custom_css, theme=app.create_theme())
+
+    with TestClient(server) as client:
+        config = client.get("/config").json()
+        assert ".compact-card" in config["css"]
+        assert config["theme"] == "soft"
+        assert client.get("/metrics").status_code == 200
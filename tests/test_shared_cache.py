@@ -0,0 +1,116 @@
+import threading
+
+from modal_app import VolumeSync
+from stock_tracker.history_store import HistoryStore
+from stock_tracker.providers import ALL_GROUPS, DemoQuoteProvider
+from stock_tracker.shared_cache import SharedCacheProvider
+
+NOW = 1_760_000_000
+
+
+class RecordingStore(dict):
+    """Dict store that records reads, the threads they ran on, and batched writes"""
+
+    def __init__(self):
+        super().__init__()
+        self.reads = []
+        self.updates = []
+
+    def get(self, key, default=None):
+        self.reads.append((key, threading.current_thread().name))
+        return super().get(key, default)
+
+    def update(self, mapping):
+        self.updates.append(dict(mapping))
+        super().update(mapping)
+
+
+def test_fetch_many_reads_in_parallel_and_writes_once():
+    store = RecordingStore()
+    provider = SharedCacheProvider(DemoQuoteProvider(), store, clock=lambda: NOW, read_concurrency=4)
+    symbols = ["AAPL", "MSFT", "GOOGL", "NOSUCH"]
+
+    first = provider.fetch_many(symbols)
+    assert set(first) == {"AAPL", "MSFT", "GOOGL"}
+    assert all(thread.startswith("shared-cache-read") for _, thread in store.reads)
+    assert len(store.updates) == 1 and set(store.updates[0]) == {"quote:" + symbol for symbol in symbols}
+
+    assert provider.fetch_many(symbols) == first
+    assert provider.upstream_calls == 1
+    assert len(store.updates) == 1
+
+
+class RecordingProvider(DemoQuoteProvider):
+    """Demo quotes that record the groups of each upstream request"""
+
+    def __init__(self):
+        super().__init__()
+        self.requests = []
+
+    def fetch(self, symbol, groups=ALL_GROUPS):
+        self.requests.append((symbol, tuple(groups)))
+        return super().fetch(symbol, groups)
+
+
+def test_replicas_share_what_any_of_them_fetched():
+    store = {}
+    now = [NOW]
+    first = SharedCacheProvider(RecordingProvider(), store, clock=lambda: now[0])
+    second = SharedCacheProvider(RecordingProvider(), store, clock=lambda: now[0])
+
+    assert first.fetch("AAPL") == second.fetch("AAPL")
+    assert second.provider.requests == []
+    assert second.stats()["shared_hits"] == 1
+
+
+def test_only_expired_groups_go_upstream():
+    store = {}
+    now = [NOW]
+    provider = SharedCacheProvider(RecordingProvider(), store, clock=lambda: now[0],
+                                   ttls={"price": 10, "market_cap": 100, "fundamentals": 1000})
+    provider.fetch("AAPL")
+
+    now[0] += 50
+    fields = provider.fetch("AAPL")
+
+    assert provider.provider.requests == [("AAPL", ALL_GROUPS), ("AAPL", ("price",))]
+    assert set(fields) >= {"name", "price", "market_cap", "pe_ratio"}
+
+
+def test_unknown_symbols_are_remembered_for_the_negative_ttl():
+    store = {}
+    now = [NOW]
+    provider = SharedCacheProvider(RecordingProvider(), store, negative_ttl=60, clock=lambda: now[0])
+
+    assert provider.fetch("NOSUCH") is None
+    now[0] += 30
+    assert provider.fetch("NOSUCH") is None
+    assert provider.fetch_many(["NOSUCH"]) == {}
+    assert provider.upstream_calls == 1
+
+    now[0] += 31
+    assert provider.fetch("NOSUCH") is None
+    assert provider.upstream_calls == 2
+
+
+class RecordingVolume:
+    def __init__(self, store):
+        self.store = store
+        self.mapped_at_reload = []
+
+    def commit(self):
+        pass
+
+    def reload(self):
+        self.mapped_at_reload.append(len(self.store._maps))
+
+
+def test_volume_sync_drops_memory_maps_before_reloading(tmp_path):
+    store = HistoryStore(str(tmp_path), DemoQuoteProvider(), clock=lambda: NOW)
+    store.history("AAPL", "1d", NOW - 30 * 86400, NOW)
+    assert store._maps
+    volume = RecordingVolume(store)
+
+    VolumeSync(volume, store).sync()
+    assert volume.mapped_at_reload == [0]
+    assert len(store.read("AAPL", "1d")) > 0
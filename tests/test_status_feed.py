@@ -0,0 +1,95 @@
+import threading
+import time
+
+from stock_tracker.status_feed import StatusBroadcaster, changed_outputs
+
+SKIP = object()
+
+
+class Outputs:
+    """compute() that returns the current values and counts its calls"""
+
+    def __init__(self, *values):
+        self.values = list(values)
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return tuple(self.values)
+
+
+def test_versions_change_only_for_outputs_whose_value_changed():
+    outputs = Outputs("open", "healthy", "12:00")
+    broadcaster = StatusBroadcaster(outputs, interval=3600)
+    broadcaster.refresh()
+    first = broadcaster.snapshot()
+
+    outputs.values[2] = "12:01"
+    broadcaster.refresh()
+    second = broadcaster.snapshot()
+
+    assert first[0] == (1, 1, 1)
+    assert second == ((1, 1, 2), ("open", "healthy", "12:01"))
+    broadcaster.stop()
+
+
+def test_sessions_share_one_computation():
+    outputs = Outputs("open")
+    broadcaster = StatusBroadcaster(outputs, interval=3600)
+
+    snapshots = [broadcaster.snapshot() for _ in range(50)]
+
+    assert outputs.calls == 1
+    assert all(snapshot == snapshots[0] for snapshot in snapshots)
+    broadcaster.stop()
+
+
+def test_background_feed_recomputes_and_survives_failures():
+    outputs = Outputs("open")
+    broadcaster = StatusBroadcaster(outputs, interval=0.01)
+    broadcaster.snapshot()
+    compute = broadcaster.compute
+    broadcaster.compute = lambda: 1 / 0
+    time.sleep(0.05)
+    broadcaster.compute = compute
+    outputs.values[0] = "closed"
+
+    deadline = time.monotonic() + 5
+    while (snapshot := broadcaster.snapshot())[1] != ("closed",):
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    broadcaster.stop()
+    assert snapshot[0] == (2,)
+
+
+def test_changed_outputs_skips_what_a_session_has_already_seen():
+    snapshot = ((1, 3, 2), ("a", "b", "c"))
+
+    assert changed_outputs(snapshot, None, lambda: SKIP) == ["a", "b", "c"]
+    assert changed_outputs(snapshot, (1, 2, 2), lambda: SKIP) == [SKIP, "b", SKIP]
+
+
+def test_sessions_arriving_together_wait_for_one_first_computation():
+    started = threading.Event()
+    release = threading.Event()
+    outputs = Outputs("open")
+
+    def slow_compute():
+        started.set()
+        release.wait(5)
+        return outputs()
+
+    broadcaster = StatusBroadcaster(slow_compute, interval=3600)
+    snapshots = []
+    sessions = [threading.Thread(target=lambda: snapshots.append(broadcaster.snapshot())) for _ in range(8)]
+    for session in sessions:
+        session.start()
+    started.wait(5)
+    time.sleep(0.05)
+    release.set()
+    for session in sessions:
+        session.join(5)
+    broadcaster.stop()
+
+    assert outputs.calls == 1
+    assert snapshots == [((1,), ("open",))] * len(sessions)
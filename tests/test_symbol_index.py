@@ -0,0 +1,87 @@
+import pytest
+
+from stock_tracker.symbol_index import Listing, SymbolIndex, load_listings
+
+LISTINGS = [
+    Listing("AAPL", "Apple Inc."),
+    Listing("A", "Agilent Technologies Inc."),
+    Listing("AMAT", "Applied Materials Inc."),
+    Listing("AMD", "Advanced Micro Devices Inc."),
+    Listing("AMZN", "Amazon.com Inc."),
+    Listing("BAC", "Bank of America Corporation"),
+    Listing("MSFT", "Microsoft Corporation"),
+    Listing("MU", "Micron Technology Inc."),
+    Listing("NVDA", "NVIDIA Corporation"),
+]
+
+
+@pytest.fixture
+def index():
+    return SymbolIndex(LISTINGS)
+
+
+def symbols(listings):
+    return [listing.symbol for listing in listings]
+
+
+def test_prefix_returns_symbols_starting_with_the_text(index):
+    assert symbols(index.prefix("AM")) == ["AMAT", "AMD", "AMZN"]
+    assert symbols(index.prefix("M")) == ["MSFT", "MU"]
+    assert symbols(index.prefix("Q")) == []
+
+
+def test_prefix_limit_keeps_the_shortest_symbols(index):
+    assert symbols(index.prefix("A", limit=2)) == ["A", "AMD"]
+    assert len(index.prefix("A", limit=100)) == 5
+
+
+@pytest.mark.parametrize("query", ["aapl", "AAPL", "Aapl", " aapl "])
+def test_queries_ignore_case_and_surrounding_space(index, query):
+    assert symbols(index.suggest(query))[0] == "AAPL"
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("micro", ["AMD", "MSFT", "MU"]),
+    ("bank of", ["BAC"]),
+    ("APPLIED MAT", ["AMAT"]),
+])
+def test_suggest_matches_company_name_words(index, query, expected):
+    assert sorted(symbols(index.suggest(query))) == expected
+
+
+@pytest.mark.parametrize("typo, expected", [
+    ("Micosoft", "MSFT"),
+    ("NVDIA", "NVDA"),
+    ("APPL", "AAPL"),
+])
+def test_did_you_mean_finds_the_closest_listing_for_a_typo(index, typo, expected):
+    assert symbols(index.did_you_mean(typo))[0] == expected
+    assert symbols(index.suggest(typo))[0] == expected
+
+
+def test_did_you_mean_leaves_out_the_query_itself(index):
+    assert "MSFT" not in symbols(index.did_you_mean("msft"))
+
+
+@pytest.mark.parametrize("query", ["", " ", "\t"])
+def test_empty_queries_suggest_nothing(index, query):
+    assert index.suggest(query) == ()
+
+
+def test_one_character_queries_complete_by_symbol(index):
+    assert symbols(index.suggest("a", limit=3)) == ["A", "AMD", "AAPL"]
+    assert symbols(index.suggest("N")) == ["NVDA"]
+
+
+def test_suggest_respects_the_limit(index):
+    assert len(index.suggest("a", limit=2)) == 2
+    assert len(index.suggest("inc", limit=3)) == 3
+
+
+def test_shipped_listings_load_uppercase_and_unique():
+    index = SymbolIndex(load_listings())
+
+    assert len(index) > 100
+    assert "AAPL" in index
+    assert index.get("AAPL").name.startswith("Apple")
+    assert all(listing.symbol == listing.symbol.upper() for listing in index.listings)
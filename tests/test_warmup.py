@@ -0,0 +1,58 @@
+import os
+import subprocess
+import sys
+import threading
+
+import pytest
+
+from stock_tracker.warmup import WARM_SYMBOLS, Warmup, default_steps, warm_symbols
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.mark.parametrize("module", ["stock_tracker.api", "stock_tracker.mcp_server", "stock_tracker.quote_cache"])
+def test_data_layer_imports_leave_pandas_and_the_screener_for_first_use(module):
+    probe = f"import sys, {module}; print(sorted({{'pandas', 'stock_tracker.screener'}} & set(sys.modules)))"
+    output = subprocess.run([sys.executable, "-c", probe], cwd=ROOT, capture_output=True, text=True, check=True)
+
+    assert output.stdout.strip() == "[]"
+
+
+def test_steps_wait_for_ready_then_run_in_order_past_failures():
+    ready = threading.Event()
+    ran = []
+
+    def failing():
+        ran.append("failing")
+        raise RuntimeError("upstream down")
+
+    warmup = Warmup([("first", lambda: ran.append("first")), ("failing", failing),
+                     ("last", lambda: ran.append("last"))], ready=ready.is_set).start()
+    assert not warmup.done.wait(0.2)
+    assert ran == []
+
+    ready.set()
+    assert warmup.done.wait(5)
+    assert ran == ["first", "failing", "last"]
+    assert set(warmup.timings) == {"first", "failing", "last"}
+    assert list(warmup.errors) == ["failing"]
+
+
+@pytest.mark.parametrize("configured, symbols", [
+    (None, list(WARM_SYMBOLS)),
+    ("aapl, msft ,", ["AAPL", "MSFT"]),
+    ("", []),
+])
+def test_warm_symbols_come_from_the_environment(monkeypatch, configured, symbols):
+    if configured is None:
+        monkeypatch.delenv("STOCK_WARM_SYMBOLS", raising=False)
+    else:
+        monkeypatch.setenv("STOCK_WARM_SYMBOLS", configured)
+
+    assert warm_symbols() == symbols
+
+
+def test_default_steps_warm_quotes_before_what_depends_on_them():
+    names = [name for name, _ in default_steps(["AAPL"])]
+
+    assert names.index("quotes") < names.index("indicators") < names.index("recommendations")